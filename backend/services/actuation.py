@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional, Tuple
+
+from backend.services import latency as latency_stats
+from backend.services.input_injection import InputBackend
+
+
+# ------------------- Input events -------------------
+@dataclass(frozen=True)
+class MoveEvent:
+    x: int
+    y: int
+    origin: Optional[float] = field(default=None, compare=False)  # time.monotonic() of the source frame
+
+    def apply(self, backend: InputBackend) -> None:
+        backend.move_to(self.x, self.y)
+
+
+@dataclass(frozen=True)
+class DragEvent:
+    x: int
+    y: int
+
+    def apply(self, backend: InputBackend) -> None:
+        backend.drag_to(self.x, self.y)
+
+
+@dataclass(frozen=True)
+class ClickEvent:
+    button: str = "left"
+
+    def apply(self, backend: InputBackend) -> None:
+        backend.click(self.button)
+
+
+@dataclass(frozen=True)
+class DoubleClickEvent:
+    button: str = "left"
+    interval: float = 0.0
+    x: Optional[int] = None
+    y: Optional[int] = None
+
+    def apply(self, backend: InputBackend) -> None:
+        backend.double_click(self.button, self.interval, self.x, self.y)
+
+
+@dataclass(frozen=True)
+class ScrollEvent:
+    amount: int
+
+    def apply(self, backend: InputBackend) -> None:
+        backend.scroll(self.amount)
+
+
+@dataclass(frozen=True)
+class ButtonEvent:
+    button: str = "left"
+    pressed: bool = True
+    x: Optional[int] = None
+    y: Optional[int] = None
+
+    def apply(self, backend: InputBackend) -> None:
+        if self.pressed:
+            backend.mouse_down(self.button, self.x, self.y)
+        else:
+            backend.mouse_up(self.button, self.x, self.y)
+
+
+# Events that only carry "where the cursor should be now"; a newer one makes
+# an older, not yet injected one pointless.
+_COALESCED = (MoveEvent, DragEvent)
+
+
+class ActuationWorker(InputBackend):
+    """
+    Dedicated thread that performs OS input injection.
+
+    The worker is itself an InputBackend, so controllers can be handed one
+    instead of a concrete backend: every call becomes a typed event on a
+    bounded queue and returns immediately. The worker thread replays the
+    events in order against the wrapped backend, so double-click intervals
+    and slow injection never stall the vision thread.
+
+    Cursor moves (and drags) are coalesced: a move queued right behind
+    another move replaces it, so only the newest target is injected.
+    When the queue is full a move or drag is dropped, but only one queued
+    after the last click, scroll or button event and followed by another
+    move, so every click still lands where the cursor was sent before it.
+    Clicks, scrolls and button presses/releases are never dropped (a lost
+    mouse_up would leave the button held), even if that grows the queue
+    past max_queue.
+
+    With a LatencyMonitor, the injection time of every event is recorded as
+    "inject", and moves submitted with an origin (the capture time of the
+    frame they came from) also record "frame_to_cursor".
+    """
+
+    name = "actuation"
+
+    def __init__(self, backend: InputBackend, max_queue: int = 64, latency=None):
+        super().__init__()
+        self.backend = backend
+        self.max_queue = max(1, int(max_queue))
+        self.latency = latency if latency is not None else latency_stats.NullLatencyMonitor()
+
+        self._queue: Deque[object] = deque()
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._busy = False
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.injected = 0
+        self.errors = 0
+
+    # ----------------- Lifecycle -----------------
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def flush(self, timeout: float = 1.0) -> bool:
+        """Wait until every queued event has been injected. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def submit(self, event) -> None:
+        with self._cond:
+            self.submitted += 1
+            if self._queue and isinstance(event, _COALESCED) and type(self._queue[-1]) is type(event):
+                self._queue[-1] = event
+                self.coalesced += 1
+            elif len(self._queue) < self.max_queue or self._evict_move(event):
+                self._queue.append(event)
+            elif isinstance(event, _COALESCED):
+                self.dropped += 1       # full of clicks: the next move carries the target
+            else:
+                self._queue.append(event)
+            self._cond.notify_all()
+
+    def _evict_move(self, incoming) -> bool:
+        """Drop the oldest move of the trailing run of moves, if a newer move
+        (queued or incoming) overrides it before any other event."""
+        queue = self._queue
+        start = len(queue)
+        while start and isinstance(queue[start - 1], _COALESCED):
+            start -= 1
+        run = len(queue) - start
+        if run >= 2 or (run == 1 and isinstance(incoming, _COALESCED)):
+            del queue[start]
+            self.dropped += 1
+            return True
+        return False
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+                self._cond.wait_for(lambda: self._queue or self._stop_event.is_set())
+                if self._stop_event.is_set() and not self._queue:
+                    return
+                event = self._queue.popleft()
+                self._busy = True
+
+            try:
+                if self.latency.enabled:
+                    self._apply_timed(event)
+                else:
+                    event.apply(self.backend)
+                self.injected += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"[ACTUATION] {type(event).__name__} failed: {e}")
+
+    def _apply_timed(self, event) -> None:
+        t0 = time.perf_counter()
+        event.apply(self.backend)
+        self.latency.record(latency_stats.INJECT, (time.perf_counter() - t0) * 1000.0)
+        if isinstance(event, MoveEvent) and event.origin is not None:
+            self.latency.record_since(latency_stats.FRAME_TO_CURSOR, event.origin)
+
+    def move_to_from(self, x: int, y: int, origin: float) -> None:
+        """Queue a cursor move that came from the frame captured at `origin` (time.monotonic())."""
+        self.submit(MoveEvent(int(x), int(y), origin))
+
+    def queue_stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "injected": self.injected,
+                "errors": self.errors,
+                "pending": len(self._queue),
+            }
+
+    # ----------------- InputBackend hooks -----------------
+    def _position(self) -> Tuple[int, int]:
+        return self.backend.position()
+
+    def _size(self) -> Tuple[int, int]:
+        return self.backend.size()
+
+    def _move_to(self, x: int, y: int) -> None:
+        self.submit(MoveEvent(x, y))
+
+    def _click(self, button: str) -> None:
+        self.submit(ClickEvent(button))
+
+    def _double_click(self, button: str, interval: float, x: Optional[int], y: Optional[int]) -> None:
+        self.submit(DoubleClickEvent(button, float(interval), x, y))
+
+    def _scroll(self, amount: int) -> None:
+        self.submit(ScrollEvent(amount))
+
+    def _mouse_down(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        self.submit(ButtonEvent(button, True, x, y))
+
+    def _mouse_up(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        self.submit(ButtonEvent(button, False, x, y))
+
+    def _drag_to(self, x: int, y: int) -> None:
+        self.submit(DragEvent(x, y))
@@ -0,0 +1,93 @@
+from collections import deque
+from backend.services import input_injection
+from backend.services.landmark_frame import as_landmark_frame
+
+
+class BlinkClicker:
+    """
+    Per-frame EAR blink click detector.
+
+    - Left eye closed for min_consec_frames, then reopened -> LEFT CLICK
+    - Right eye closed for min_consec_frames, then reopened -> RIGHT CLICK
+
+    The eye aspect ratio is smoothed over the last smooth_window frames and
+    each side has its own click cooldown.
+
+    Use:
+        blinker = BlinkClicker(ear_threshold_left=0.22, ear_threshold_right=0.22)
+        action = blinker.update(frame, now)
+    """
+
+    def __init__(
+        self,
+        ear_threshold_left=0.22,
+        ear_threshold_right=0.22,
+        min_consec_frames=2,
+        cooldown_sec=0.5,
+        smooth_window=5,
+        show_debug=False,
+        injector=None,
+    ):
+        self.ear_threshold_left = ear_threshold_left
+        self.ear_threshold_right = ear_threshold_right
+        self.min_consec_frames = min_consec_frames
+        self.cooldown_sec = cooldown_sec
+        self.show_debug = show_debug
+        self.injector = injector if injector is not None else input_injection.get_backend()
+
+        self._q_left = deque(maxlen=max(1, int(smooth_window)))
+        self._q_right = deque(maxlen=max(1, int(smooth_window)))
+
+        self.reset()
+
+    def reset(self):
+        self.left_counter = 0
+        self.right_counter = 0
+        self.last_left_click = 0.0
+        self.last_right_click = 0.0
+        self._q_left.clear()
+        self._q_right.clear()
+
+    def update(self, landmarks, now=None):
+        """
+        landmarks: LandmarkFrame (a raw mediapipe landmark list is converted)
+        now: optional timestamp (defaults to the frame timestamp)
+
+        returns: "LEFT CLICK" / "RIGHT CLICK" / "BOTH CLICK" / None
+        """
+        frame = as_landmark_frame(landmarks, now)
+        if now is None:
+            now = frame.timestamp
+        features = frame.features
+
+        self._q_left.append(features.ear_left)
+        self._q_right.append(features.ear_right)
+        avg_ear_left = sum(self._q_left) / len(self._q_left)
+        avg_ear_right = sum(self._q_right) / len(self._q_right)
+
+        if self.show_debug:
+            print(f"[Blink] earL={avg_ear_left:.3f} earR={avg_ear_right:.3f}")
+
+        action = None
+
+        # Left blink
+        if avg_ear_left < self.ear_threshold_left:
+            self.left_counter += 1
+        else:
+            if self.left_counter >= self.min_consec_frames and now - self.last_left_click > self.cooldown_sec:
+                self.injector.click("left")
+                self.last_left_click = now
+                action = "LEFT CLICK"
+            self.left_counter = 0
+
+        # Right blink
+        if avg_ear_right < self.ear_threshold_right:
+            self.right_counter += 1
+        else:
+            if self.right_counter >= self.min_consec_frames and now - self.last_right_click > self.cooldown_sec:
+                self.injector.click("right")
+                self.last_right_click = now
+                action = "BOTH CLICK" if action else "RIGHT CLICK"
+            self.right_counter = 0
+
+        return action
@@ -1,6 +1,7 @@
 
 import time
 import cv2
+from backend.services.preprocess import FramePreprocessor
 
 class CursorMovementCalibrator:
     def __init__(self, cap, face_mesh, wait_time=3):
@@ -8,6 +9,7 @@ class CursorMovementCalibrator:
         self.face_mesh = face_mesh
         self.positions = {}
         self.wait_time = wait_time
+        self.preprocessor = FramePreprocessor()
 
     def timed_capture(self, label):
         print(f"Look {label}. Capturing in {self.wait_time} seconds...")
@@ -18,9 +20,9 @@ class CursorMovementCalibrator:
             ret, frame = self.cap.read()
             if not ret:
                 break
+            face = self.preprocessor.process(self.face_mesh, frame)
+            # The preview is mirrored for the user; landmarks already are
             frame = cv2.flip(frame, 1)
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.face_mesh.process(rgb)
 
             frame_h, frame_w, _ = frame.shape
             dot_coords = {
@@ -35,11 +37,9 @@ class CursorMovementCalibrator:
             cv2.putText(frame, f"Look at the dot ({label})...", (30, 40),
                         cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
 
-            if results.multi_face_landmarks:
-                landmarks = results.multi_face_landmarks[0].landmark
-                eye_x = (landmarks[473].x + landmarks[468].x) / 2
-                eye_y = (landmarks[473].y + landmarks[468].y) / 2
-                collected.append((eye_x, eye_y))
+            if face is not None:
+                eye_x, eye_y = face.points[[473, 468], :2].mean(axis=0)
+                collected.append((float(eye_x), float(eye_y)))
 
             cv2.imshow("Calibration", frame)
             if cv2.waitKey(1) & 0xFF == 27:
@@ -0,0 +1,21 @@
+# Iris midpoint window (normalized image coords) that maps onto the whole screen
+X_RANGE = (0.375, 0.625)
+Y_RANGE = (0.375, 0.625)
+
+
+def gaze_to_screen(gaze_x, gaze_y, screen_width, screen_height, gain=1.0, x_range=X_RANGE, y_range=Y_RANGE):
+    """
+    Map the iris midpoint (FaceFeatures.gaze_x / gaze_y) to a cursor target.
+
+    The gaze is clamped to the x/y window, normalized to 0..1 and scaled to
+    the screen; gain is clamped to 0.1..2.0.
+
+    returns: (target_x, target_y) in pixels
+    """
+    eye_x = max(min(gaze_x, x_range[1]), x_range[0])
+    eye_y = max(min(gaze_y, y_range[1]), y_range[0])
+    norm_x = (eye_x - x_range[0]) / (x_range[1] - x_range[0])
+    norm_y = (eye_y - y_range[0]) / (y_range[1] - y_range[0])
+
+    gain = max(0.1, min(2.0, gain))
+    return int(norm_x * screen_width * gain), int(norm_y * screen_height * gain)
@@ -1,7 +1,8 @@
 
 import time
-import math
 import cv2
+from backend.services.landmark_frame import as_landmark_frame, eye_aspect_ratio
+from backend.services.preprocess import FramePreprocessor
 
 class EyeBlinkCalibrator:
     def __init__(self, cap, face_mesh, duration=5):
@@ -10,16 +11,10 @@ class EyeBlinkCalibrator:
         self.duration = duration
         self.left_ears = []
         self.right_ears = []
-
-    def euclidean(self, p1, p2):
-        return math.hypot(p1.x - p2.x, p1.y - p2.y)
+        self.preprocessor = FramePreprocessor()
 
     def get_ear(self, landmarks, indices):
-        p = [landmarks[i] for i in indices]
-        vertical1 = self.euclidean(p[1], p[5])
-        vertical2 = self.euclidean(p[2], p[4])
-        horizontal = self.euclidean(p[0], p[3])
-        return (vertical1 + vertical2) / (2.0 * horizontal)
+        return eye_aspect_ratio(as_landmark_frame(landmarks).points, indices)
 
     def calibrate(self, LEFT_EYE, RIGHT_EYE, save_fn):
         print("Blink Calibration: Please keep your eyes open and face the screen.")
@@ -29,13 +24,11 @@ class EyeBlinkCalibrator:
             ret, frame = self.cap.read()
             if not ret:
                 break
-            rgb = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
-            results = self.face_mesh.process(rgb)
+            face = self.preprocessor.process(self.face_mesh, frame)
 
-            if results.multi_face_landmarks:
-                landmarks = results.multi_face_landmarks[0].landmark
-                self.left_ears.append(self.get_ear(landmarks, LEFT_EYE))
-                self.right_ears.append(self.get_ear(landmarks, RIGHT_EYE))
+            if face is not None:
+                self.left_ears.append(self.get_ear(face, LEFT_EYE))
+                self.right_ears.append(self.get_ear(face, RIGHT_EYE))
 
             cv2.putText(frame, "Calibrating EAR... Keep eyes open", (30, 50),
                         cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
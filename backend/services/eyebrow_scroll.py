@@ -1,7 +1,7 @@
-import time
-import pyautogui
 import numpy as np
 from collections import deque
+from backend.services import input_injection
+from backend.services.landmark_frame import as_landmark_frame
 
 
 class EyebrowScroller:
@@ -24,6 +24,7 @@ class EyebrowScroller:
         baseline_alpha=0.02,
         smooth_window=5,
         show_debug=False,
+        injector=None,
     ):
         self.up_threshold = up_threshold
         self.down_threshold = down_threshold
@@ -31,6 +32,7 @@ class EyebrowScroller:
         self.repeat_interval = repeat_interval
         self.baseline_alpha = baseline_alpha
         self.show_debug = show_debug
+        self.injector = injector if injector is not None else input_injection.get_backend()
 
         self._q = deque(maxlen=max(1, int(smooth_window)))
         self._neutral = None
@@ -45,68 +47,12 @@ class EyebrowScroller:
         self._neutral = None
         self._last_scroll = 0.0
 
-    @staticmethod
-    def _pt(lm):
-        return np.array([lm.x, lm.y], dtype=np.float32)
-
-    def _make_similarity(self, L, R):
-        """
-        Returns 2x2 matrix A and translation t such that:
-            p_aligned = A @ p + t
-        mapping eye corners to canonical positions.
-        """
-        mid = (L + R) * 0.5
-        v = R - L
-        dist = float(np.linalg.norm(v)) + 1e-9
-
-        # rotate so eye-line is horizontal
-        c = v[0] / dist
-        s = v[1] / dist
-        Rmat = np.array([[c, s], [-s, c]], dtype=np.float32)  # rotation to horizontal
-
-        # scale so inter-eye distance becomes 1.0 (from canonical -0.5..+0.5)
-        Smat = (1.0 / dist) * np.eye(2, dtype=np.float32)
-
-        A = Smat @ Rmat
-        # translate so mid maps to (0,0)
-        t = -A @ mid
-        return A, t
-
-    def _aligned_y(self, A, t, p):
-        return float((A @ p + t)[1])
-
-    def _metric(self, landmarks):
-        # Eye corners
-        L_eye_outer = self._pt(landmarks[33])
-        L_eye_inner = self._pt(landmarks[133])
-        R_eye_outer = self._pt(landmarks[362])
-        R_eye_inner = self._pt(landmarks[263])
-
-        # Pick a stable left/right corner pair for alignment (outer corners work well)
-        L = L_eye_outer
-        R = R_eye_outer
-
-        A, t = self._make_similarity(L, R)
-
-        # Eyebrows + upper eyelids
-        L_brow = self._pt(landmarks[105])
-        R_brow = self._pt(landmarks[334])
-        L_lid  = self._pt(landmarks[159])
-        R_lid  = self._pt(landmarks[386])
-
-        # In aligned space, measure vertical distance (brow - lid)
-        # Bigger distance => brow is higher relative to eye (raised eyebrow)
-        L_val = self._aligned_y(A, t, L_lid) - self._aligned_y(A, t, L_brow)
-        R_val = self._aligned_y(A, t, R_lid) - self._aligned_y(A, t, R_brow)
-
-
-        return (L_val + R_val) * 0.5
-
     def update(self, landmarks, now=None):
+        frame = as_landmark_frame(landmarks, now)
         if now is None:
-            now = time.time()
+            now = frame.timestamp
 
-        val = self._metric(landmarks)
+        val = frame.features.brow_lid
 
         self._q.append(val)
         smoothed = sum(self._q) / len(self._q)
@@ -122,12 +68,12 @@ class EyebrowScroller:
             return None
 
         if delta > self.up_threshold:
-            pyautogui.scroll(self.scroll_amount)
+            self.injector.scroll(self.scroll_amount)
             self._last_scroll = now
             return "SCROLL_UP"
 
         if delta < -self.down_threshold:
-            pyautogui.scroll(-self.scroll_amount)
+            self.injector.scroll(-self.scroll_amount)
             self._last_scroll = now
             return "SCROLL_DOWN"
 
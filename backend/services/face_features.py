@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class FaceFeatures:
+    """Per-frame gesture features shared by every controller."""
+
+    mouth_open_ratio: float     # inner-lip gap / mouth width
+    pucker: float               # mouth width / eye width
+    ear_left: float             # eye aspect ratio, LEFT_EYE indices
+    ear_right: float            # eye aspect ratio, RIGHT_EYE indices
+    gaze_x: float               # iris midpoint, normalized image x
+    gaze_y: float               # iris midpoint, normalized image y
+    gaze_vertical: float        # iris position between upper (0) and lower (1) lid
+    brow_lid: float             # lid_y - brow_y in eye-corner aligned space
+
+
+# Eye indices (EAR p1..p6)
+LEFT_EYE = [33, 160, 158, 133, 153, 144]
+RIGHT_EYE = [362, 385, 387, 263, 373, 380]
+
+# Every landmark any feature needs, gathered with a single fancy-index per frame
+_IDX = np.array([
+    61, 291, 13, 14,                        # 0-3   mouth corners, inner lips
+    33, 263,                                # 4-5   eye outer corners (pucker width)
+    *LEFT_EYE,                              # 6-11
+    *RIGHT_EYE,                             # 12-17
+    473, 468,                               # 18-19 iris centers
+    159, 386,                               # 20-21 upper lids
+    145, 374,                               # 22-23 lower lids
+    105, 334,                               # 24-25 brows
+])
+
+# EAR distance pairs (p2-p6, p3-p5, p1-p4) for both eyes, as rows of _IDX
+_EAR_A = np.array([7, 8, 6, 13, 14, 12])
+_EAR_B = np.array([11, 10, 9, 17, 16, 15])
+
+
+def extract_features(points, pose):
+    """
+    Compute every gesture feature in one vectorized pass.
+
+    points: (478, 3) landmark array (LandmarkFrame.points)
+    pose: HeadPose of the same frame (LandmarkFrame.pose)
+    returns: FaceFeatures
+    """
+    p = points[_IDX, :2]
+    x = p[:, 0]
+    y = p[:, 1]
+
+    # Mouth
+    mouth_w = abs(x[1] - x[0])
+    mouth_open = abs(y[3] - y[2])
+    mouth_open_ratio = mouth_open / (mouth_w + 1e-6)
+    pucker = mouth_w / (abs(x[5] - x[4]) + 1e-6)
+
+    # EAR, both eyes at once
+    d = p[_EAR_A] - p[_EAR_B]
+    lengths = np.sqrt((d * d).sum(axis=1))
+    horizontal = np.maximum(lengths[[2, 5]], 1e-9)
+    ear_left = (lengths[0] + lengths[1]) / (2.0 * horizontal[0])
+    ear_right = (lengths[3] + lengths[4]) / (2.0 * horizontal[1])
+
+    # Iris midpoint and vertical position between the lids
+    iris_y = y[18:20]
+    up_y = y[20:22]
+    denom = y[22:24] - up_y
+    ok = np.abs(denom) >= 1e-6
+    pos = np.where(ok, (iris_y - up_y) / np.where(ok, denom, 1.0), 0.5)
+    gaze_vertical = 0.5 * np.clip(pos, 0.0, 1.0).sum()
+
+    # Brow height: lid_y - brow_y in the head pose's eye-corner aligned space
+    aligned_y = pose.to_eye_space(p[20:26])[:, 1]
+    # aligned_y rows: upper lids (L, R), lower lids, brows (L, R)
+    brow_lid = 0.5 * ((aligned_y[0] - aligned_y[4]) + (aligned_y[1] - aligned_y[5]))
+
+    return FaceFeatures(
+        mouth_open_ratio=float(mouth_open_ratio),
+        pucker=float(pucker),
+        ear_left=float(ear_left),
+        ear_right=float(ear_right),
+        gaze_x=float(x[18] + x[19]) * 0.5,
+        gaze_y=float(y[18] + y[19]) * 0.5,
+        gaze_vertical=float(gaze_vertical),
+        brow_lid=float(brow_lid),
+    )
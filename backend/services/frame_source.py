@@ -0,0 +1,151 @@
+import threading
+import time
+
+import cv2
+
+
+class LatestFrameSource:
+    """
+    Threaded camera reader with a one-slot "latest frame wins" buffer.
+
+    A background thread pulls frames from the camera as fast as the driver
+    delivers them and only keeps the newest one. Frames that were overwritten
+    before anybody read them are counted as dropped, so the consumer always
+    processes the freshest image instead of whatever the driver buffered.
+
+    Drop-in for cv2.VideoCapture in the tracking loop:
+        cap = LatestFrameSource(camera_index)
+        ret, frame = cap.read()
+        captured_at = cap.frame_time   # time.monotonic() of that frame
+    """
+
+    def __init__(self, source=0, capture_factory=None, read_timeout=1.0):
+        self.source = source
+        self.read_timeout = read_timeout
+        self._capture_factory = capture_factory or cv2.VideoCapture
+
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._cap = None
+
+        self._frame = None
+        self._captured_at = 0.0
+        self._seq = 0           # sequence number of the newest captured frame
+        self._read_seq = 0      # sequence number of the last frame handed out
+        self._ended = False
+
+        self.frame_time = 0.0
+        self.frames_captured = 0
+        self.frames_delivered = 0
+        self.dropped_frames = 0
+
+        self.start()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._cap = self._capture_factory(self.source)
+        if self._cap is None or not self._cap.isOpened():
+            return
+
+        # Ask the driver not to queue stale frames (ignored by some backends)
+        try:
+            self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        except Exception:
+            pass
+
+        self._stop_event.clear()
+        self._ended = False
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            ret, frame = self._cap.read()
+            now = time.monotonic()
+
+            with self._cond:
+                if not ret:
+                    self._ended = True
+                    self._cond.notify_all()
+                    return
+
+                if self._seq > self._read_seq:
+                    self.dropped_frames += 1
+
+                self._frame = frame
+                self._captured_at = now
+                self._seq += 1
+                self.frames_captured += 1
+                self._cond.notify_all()
+
+    @property
+    def ended(self):
+        """True once the camera stopped delivering frames."""
+        return self._ended
+
+    def isOpened(self):
+        """True if the camera was opened (see ended for the end of the stream)."""
+        return self._cap is not None and self._cap.isOpened()
+
+    def read(self, timeout=None):
+        """
+        Block until a frame newer than the last one returned is available.
+
+        returns: (True, frame) or (False, None) on timeout / end of stream
+        """
+        if timeout is None:
+            timeout = self.read_timeout
+
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._seq > self._read_seq or self._ended or self._stop_event.is_set(),
+                timeout,
+            )
+            if self._seq <= self._read_seq:
+                return False, None
+
+            self._read_seq = self._seq
+            self.frame_time = self._captured_at
+            self.frames_delivered += 1
+            return True, self._frame
+
+    def stats(self):
+        with self._cond:
+            return {
+                "captured": self.frames_captured,
+                "delivered": self.frames_delivered,
+                "dropped": self.dropped_frames,
+            }
+
+    def release(self):
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._cap is not None:
+            self._cap.release()
+
+
+def next_frame(cap, idle=0.05):
+    """
+    One read of a tracking loop over a LatestFrameSource (or an
+    InferenceProcess, which returns landmarks instead of frames).
+
+    returns: (True, frame), or (False, None) when there is no new frame yet;
+    a source that is not open (e.g. a camera index that failed) sleeps idle
+    seconds first so the loop does not spin while waiting for another one
+    raises: EOFError once the source has ended
+    """
+    if cap is not None and cap.ended:
+        raise EOFError("frame source ended")
+    if cap is None or not cap.isOpened():
+        time.sleep(idle)
+        return False, None
+    ret, frame = cap.read()
+    if not ret and cap.ended:
+        raise EOFError("frame source ended")
+    return ret, frame
@@ -6,7 +6,6 @@ import sys
 from dataclasses import dataclass
 from typing import Optional, Tuple
 
-import pyautogui
 import tkinter as tk
 
 try:
@@ -23,16 +22,6 @@ except Exception:
 
 try:
     from Quartz import (
-        CGEventCreateMouseEvent,
-        CGEventPost,
-        CGEventSetIntegerValueField,
-        CGPoint,
-        kCGHIDEventTap,
-        kCGEventLeftMouseDown,
-        kCGEventLeftMouseDragged,
-        kCGEventLeftMouseUp,
-        kCGMouseButtonLeft,
-        kCGMouseEventClickState,
         CGGetActiveDisplayList,
         CGDisplayBounds,
     )
@@ -40,7 +29,8 @@ try:
 except Exception:
     _HAS_QUARTZ = False
 
-pyautogui.FAILSAFE = False
+from backend.services import input_injection
+from backend.services.input_injection import InputBackend
 
 
 @dataclass
@@ -86,9 +76,10 @@ class OverlayConfig:
 class DwellBarOverlay:
     """Tiny always-on-top dwell progress bar that follows the cursor."""
 
-    def __init__(self, root: tk.Misc, cfg: OverlayConfig):
+    def __init__(self, root: tk.Misc, cfg: OverlayConfig, injector: Optional[InputBackend] = None):
         self.root = root
         self.cfg = cfg
+        self._input = injector if injector is not None else input_injection.get_backend()
 
         self._progress = 0.0
         self._active = False
@@ -258,7 +249,7 @@ class DwellBarOverlay:
             return
 
         try:
-            cx, cy = pyautogui.position()
+            cx, cy = self._input.position()
             x = int(cx - (self.cfg.w // 2) + self.cfg.offset_x)
             y = int(cy + self.cfg.offset_y)
             self._win.geometry(f"{self.cfg.w}x{self.cfg.h}+{x}+{y}")
@@ -305,15 +296,17 @@ class GazeClickService:
         cfg: Optional[DwellConfig] = None,
         overlay: Optional[OverlayConfig] = None,
         zones: Optional[ZoneConfig] = None,
+        injector: Optional[InputBackend] = None,
     ):
         self.cfg = cfg or DwellConfig()
+        self._input = injector if injector is not None else input_injection.get_backend()
         self.zone_cfg = zones or ZoneConfig()
 
         self._next_action: Optional[str] = None
 
         self._clicking_enabled: bool = True
 
-        self._screen_w, self._screen_h = pyautogui.size()
+        self._screen_w, self._screen_h = self._input.size()
 
         self._in_tr_zone_prev = False
         self._tr_enter_time: float = 0.0
@@ -357,137 +350,6 @@ class GazeClickService:
 
         self.on_progress = None
 
-    def _macos_double_click(self, x: int, y: int, interval_sec: float) -> bool:
-        """Return True if we successfully emitted a macOS double-click via Quartz."""
-        if not (_HAS_QUARTZ and sys.platform == "darwin"):
-            return False
-
-        try:
-            pt = CGPoint(int(x), int(y))
-
-            ev_down1 = CGEventCreateMouseEvent(None, kCGEventLeftMouseDown, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev_down1, kCGMouseEventClickState, 1)
-            CGEventPost(kCGHIDEventTap, ev_down1)
-
-            ev_up1 = CGEventCreateMouseEvent(None, kCGEventLeftMouseUp, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev_up1, kCGMouseEventClickState, 1)
-            CGEventPost(kCGHIDEventTap, ev_up1)
-
-            time.sleep(max(0.02, float(interval_sec)))
-
-            ev_down2 = CGEventCreateMouseEvent(None, kCGEventLeftMouseDown, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev_down2, kCGMouseEventClickState, 2)
-            CGEventPost(kCGHIDEventTap, ev_down2)
-
-            ev_up2 = CGEventCreateMouseEvent(None, kCGEventLeftMouseUp, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev_up2, kCGMouseEventClickState, 2)
-            CGEventPost(kCGHIDEventTap, ev_up2)
-
-            return True
-        except Exception:
-            return False
-
-    def _macos_mouse_down(self, x: int, y: int) -> bool:
-        if not (_HAS_QUARTZ and sys.platform == "darwin"):
-            return False
-        try:
-            pt = CGPoint(int(x), int(y))
-            ev = CGEventCreateMouseEvent(None, kCGEventLeftMouseDown, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev, kCGMouseEventClickState, 1)
-            CGEventPost(kCGHIDEventTap, ev)
-            return True
-        except Exception:
-            return False
-
-    def _macos_mouse_drag(self, x: int, y: int) -> bool:
-        """Emit a left-mouse-dragged event at (x,y)."""
-        if not (_HAS_QUARTZ and sys.platform == "darwin"):
-            return False
-        try:
-            pt = CGPoint(int(x), int(y))
-            ev = CGEventCreateMouseEvent(None, kCGEventLeftMouseDragged, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev, kCGMouseEventClickState, 1)
-            CGEventPost(kCGHIDEventTap, ev)
-            return True
-        except Exception:
-            return False
-
-    def _macos_mouse_up(self, x: int, y: int) -> bool:
-        if not (_HAS_QUARTZ and sys.platform == "darwin"):
-            return False
-        try:
-            pt = CGPoint(int(x), int(y))
-            ev = CGEventCreateMouseEvent(None, kCGEventLeftMouseUp, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev, kCGMouseEventClickState, 1)
-            CGEventPost(kCGHIDEventTap, ev)
-            return True
-        except Exception:
-            return False
-    def _macos_mouse_down(self, x: int, y: int) -> bool:
-        if not (_HAS_QUARTZ and sys.platform == "darwin"):
-            return False
-        try:
-            pt = CGPoint(int(x), int(y))
-            ev = CGEventCreateMouseEvent(None, kCGEventLeftMouseDown, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev, kCGMouseEventClickState, 1)
-            CGEventPost(kCGHIDEventTap, ev)
-            return True
-        except Exception:
-            return False
-
-    def _macos_mouse_drag(self, x: int, y: int) -> bool:
-        """Emit a left-mouse-dragged event at (x,y)."""
-        if not (_HAS_QUARTZ and sys.platform == "darwin"):
-            return False
-        try:
-            pt = CGPoint(int(x), int(y))
-            ev = CGEventCreateMouseEvent(None, kCGEventLeftMouseDragged, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev, kCGMouseEventClickState, 1)
-            CGEventPost(kCGHIDEventTap, ev)
-            return True
-        except Exception:
-            return False
-
-    def _macos_mouse_up(self, x: int, y: int) -> bool:
-        if not (_HAS_QUARTZ and sys.platform == "darwin"):
-            return False
-        try:
-            pt = CGPoint(int(x), int(y))
-            ev = CGEventCreateMouseEvent(None, kCGEventLeftMouseUp, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev, kCGMouseEventClickState, 1)
-            CGEventPost(kCGHIDEventTap, ev)
-            return True
-        except Exception:
-            return False
-        """Return True if we successfully emitted a macOS double-click via Quartz."""
-        if not (_HAS_QUARTZ and sys.platform == "darwin"):
-            return False
-
-        try:
-            pt = CGPoint(x, y)
-
-            ev_down1 = CGEventCreateMouseEvent(None, kCGEventLeftMouseDown, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev_down1, kCGMouseEventClickState, 1)
-            CGEventPost(kCGHIDEventTap, ev_down1)
-
-            ev_up1 = CGEventCreateMouseEvent(None, kCGEventLeftMouseUp, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev_up1, kCGMouseEventClickState, 1)
-            CGEventPost(kCGHIDEventTap, ev_up1)
-
-            time.sleep(max(0.02, float(interval_sec)))
-
-            ev_down2 = CGEventCreateMouseEvent(None, kCGEventLeftMouseDown, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev_down2, kCGMouseEventClickState, 2)
-            CGEventPost(kCGHIDEventTap, ev_down2)
-
-            ev_up2 = CGEventCreateMouseEvent(None, kCGEventLeftMouseUp, pt, kCGMouseButtonLeft)
-            CGEventSetIntegerValueField(ev_up2, kCGMouseEventClickState, 2)
-            CGEventPost(kCGHIDEventTap, ev_up2)
-
-            return True
-        except Exception:
-            return False
-
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
             return
@@ -519,7 +381,7 @@ class GazeClickService:
         if not self.overlay_cfg.show:
             return
         if self._overlay is None:
-            self._overlay = DwellBarOverlay(root, self.overlay_cfg)
+            self._overlay = DwellBarOverlay(root, self.overlay_cfg, self._input)
             self._overlay.start()
 
     def arm_right_click_next(self) -> None:
@@ -541,12 +403,7 @@ class GazeClickService:
         """Release an active hold (mouseUp)."""
         if not self._holding_active:
             return
-        cfg = self.cfg
-        if not self._macos_mouse_up(*pyautogui.position()):
-            try:
-                pyautogui.mouseUp(button=cfg.hold_button)
-            except Exception:
-                pyautogui.mouseUp()
+        self._input.mouse_up(self.cfg.hold_button)
         self._holding_active = False
         self._hold_armed = False
         self._next_action = None
@@ -784,11 +641,7 @@ class GazeClickService:
         self._hold_release_progress = max(0.0, min(1.0, elapsed / cfg.hold_release_dwell_sec))
 
         if elapsed >= cfg.hold_release_dwell_sec:
-            if not self._macos_mouse_up(int(x), int(y)):
-                try:
-                    pyautogui.mouseUp(button=cfg.hold_button)
-                except Exception:
-                    pyautogui.mouseUp()
+            self._input.mouse_up(cfg.hold_button, int(x), int(y))
 
             self._holding_active = False
             self._cooldown_until = now + cfg.cooldown_sec
@@ -833,11 +686,7 @@ class GazeClickService:
 
         if elapsed >= cfg.dwell_time_sec:
             if self._hold_armed:
-                if not self._macos_mouse_down(int(x), int(y)):
-                    try:
-                        pyautogui.mouseDown(button=cfg.hold_button)
-                    except Exception:
-                        pyautogui.mouseDown()
+                self._input.mouse_down(cfg.hold_button, int(x), int(y))
                 self._holding_active = True
                 self._reset_hold_release()
                 self._hold_armed = False
@@ -847,19 +696,18 @@ class GazeClickService:
                 self.reset()
                 return 0.0
             if self._next_action == "right":
-                pyautogui.click(button="right")
+                self._input.click("right")
                 print("Dwell → RIGHT CLICK")
             elif self._next_action == "double":
-                ok = self._macos_double_click(int(x), int(y), cfg.double_click_interval_sec)
-                if not ok:
-                    pyautogui.click(
-                        button=cfg.button,
-                        clicks=2,
-                        interval=max(0.02, float(cfg.double_click_interval_sec)),
-                    )
+                self._input.double_click(
+                    cfg.button,
+                    max(0.02, float(cfg.double_click_interval_sec)),
+                    int(x),
+                    int(y),
+                )
                 print(f"Dwell → DOUBLE CLICK (interval={cfg.double_click_interval_sec:.2f}s)")
             else:
-                pyautogui.click(button=cfg.button)
+                self._input.click(cfg.button)
 
             self._next_action = None
 
@@ -880,7 +728,7 @@ class GazeClickService:
                 continue
 
             now = time.time()
-            x, y = pyautogui.position()
+            x, y = self._input.position()
             xi, yi = int(x), int(y)
 
             if self._holding_active:
@@ -889,7 +737,7 @@ class GazeClickService:
                 _ = self._handle_bottom_left_zone(xi, yi, now)
                 _ = self._handle_bottom_right_zone(xi, yi, now)
 
-                self._macos_mouse_drag(xi, yi)
+                self._input.drag_to(xi, yi)
 
                 p = self._update_hold_release(x, y, now)
                 if self._overlay is not None:
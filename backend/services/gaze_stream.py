@@ -0,0 +1,449 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+import tempfile
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from backend.services.landmark_backends import SCHEME_DLIB_68, SCHEME_MEDIAPIPE_478
+
+# ------------------- Wire format -------------------
+#
+#   message header (32 bytes, little endian)
+#     kind        u8   KIND_HELLO, KIND_FRAME or KIND_EVENT
+#     flags       u8   frames: FLAG_FACE | FLAG_GAZE | FLAG_SCREEN | FLAG_POINTS
+#     count       u16  frames: landmarks in the payload; events: bytes of the source name
+#     length      u32  payload bytes after the header, without the padding
+#     seq         u32  frame number (events: the frame they were detected on)
+#     dropped     u32  messages this client lost to backpressure since the previous one
+#     captured_at f64  time.monotonic() when the camera frame was read
+#     timestamp   f64  time.time() of the landmarks
+#
+#   hello payload   utf-8 JSON {"protocol", "screen", "schemes"}, sent once on connect
+#   frame payload   gaze x, y f32 (normalized) | screen x, y i32 | scheme u8 | 7x
+#                   then count x 3 f32 landmarks (normalized x, y, z) with FLAG_POINTS
+#   event payload   utf-8 source (count bytes) followed by utf-8 action
+#
+# Fields a frame does not have (no face, no iris) are zero and their flag is
+# clear. Every payload is followed by zero bytes up to a multiple of 8 (not
+# counted in length), so every header starts 8-byte aligned and a reader can
+# view the landmarks straight out of its receive buffer.
+
+PROTOCOL = 1
+_HEADER = struct.Struct("<BBHIIIdd")
+_FRAME = struct.Struct("<ffiiB7x")
+
+
+def _padding(length: int) -> int:
+    """Zero bytes sent after a payload of length bytes."""
+    return -length % 8
+
+KIND_HELLO = 0
+KIND_FRAME = 1
+KIND_EVENT = 2
+
+FLAG_FACE = 1
+FLAG_GAZE = 2
+FLAG_SCREEN = 4
+FLAG_POINTS = 8
+
+SCHEME_IDS = {SCHEME_MEDIAPIPE_478: 1, SCHEME_DLIB_68: 2}
+_SCHEME_NAMES = {v: k for k, v in SCHEME_IDS.items()}
+
+
+def default_socket_path() -> str:
+    return os.path.join(tempfile.gettempdir(), "eyeos-gaze.sock")
+
+
+@dataclass(frozen=True)
+class GazeFrame:
+    seq: int
+    captured_at: float
+    timestamp: float
+    dropped: int
+    face: bool
+    gaze: Optional[Tuple[float, float]]         # iris midpoint, normalized
+    screen: Optional[Tuple[int, int]]           # cursor target in screen pixels
+    scheme: Optional[str]
+    points: Optional[np.ndarray]                # (count, 3) float32, read-only
+
+
+@dataclass(frozen=True)
+class GestureEvent:
+    seq: int
+    captured_at: float
+    timestamp: float
+    dropped: int
+    source: str     # "mouth", "eyebrow", "lip", "lip_brow", "blink"
+    action: str     # what the controller returned, e.g. "LEFT CLICK"
+
+
+Message = Union[dict, GazeFrame, GestureEvent]
+
+
+# ------------------- Encoding -------------------
+# Queued messages keep their header fields apart from the payload, so the
+# per-client "dropped" count is filled in when the message is sent.
+@dataclass
+class _Pending:
+    kind: int
+    flags: int
+    count: int
+    seq: int
+    captured_at: float
+    timestamp: float
+    payload: bytes
+
+    def pack(self, dropped: int) -> bytes:
+        length = len(self.payload)
+        header = _HEADER.pack(self.kind, self.flags, self.count, length, self.seq,
+                              dropped, self.captured_at, self.timestamp)
+        return b"".join((header, self.payload, bytes(_padding(length))))
+
+
+def _encode_frame(seq, captured_at, landmarks, screen, include_points) -> _Pending:
+    flags = 0
+    gaze = None
+    count = 0
+    scheme = 0
+    points = b""
+    timestamp = 0.0
+    if landmarks is not None:
+        flags |= FLAG_FACE
+        timestamp = landmarks.timestamp
+        gaze = landmarks.gaze
+        scheme = SCHEME_IDS.get(landmarks.scheme, 0)
+        if include_points:
+            flags |= FLAG_POINTS
+            count = len(landmarks.points)
+            points = np.ascontiguousarray(landmarks.points, dtype=np.float32).tobytes()
+    if gaze is not None:
+        flags |= FLAG_GAZE
+    if screen is not None:
+        flags |= FLAG_SCREEN
+    gx, gy = gaze if gaze is not None else (0.0, 0.0)
+    sx, sy = screen if screen is not None else (0, 0)
+    payload = _FRAME.pack(gx, gy, int(sx), int(sy), scheme) + points
+    return _Pending(KIND_FRAME, flags, count, seq, captured_at, timestamp, payload)
+
+
+def decode(header: bytes, payload: bytes) -> Message:
+    """
+    One received message (header + payload bytes, with or without the
+    padding) -> hello dict, GazeFrame or GestureEvent.
+    """
+    kind, flags, count, length, seq, dropped, captured_at, timestamp = _HEADER.unpack(header)
+    if kind == KIND_HELLO:
+        return json.loads(payload[:length].decode("utf-8"))
+    if kind == KIND_EVENT:
+        return GestureEvent(seq, captured_at, timestamp, dropped,
+                            payload[:count].decode("utf-8"), payload[count:length].decode("utf-8"))
+    if kind != KIND_FRAME:
+        raise ValueError(f"Unknown message kind {kind}")
+
+    gx, gy, sx, sy, scheme = _FRAME.unpack_from(payload)
+    points = None
+    if flags & FLAG_POINTS:
+        points = np.frombuffer(payload, np.float32, count * 3, _FRAME.size).reshape(count, 3)
+    return GazeFrame(
+        seq, captured_at, timestamp, dropped,
+        face=bool(flags & FLAG_FACE),
+        gaze=(gx, gy) if flags & FLAG_GAZE else None,
+        screen=(sx, sy) if flags & FLAG_SCREEN else None,
+        scheme=_SCHEME_NAMES.get(scheme),
+        points=points,
+    )
+
+
+# ------------------- Server -------------------
+class _Client:
+    """One connected reader: a bounded queue drained by its own sender thread."""
+
+    def __init__(self, server: "GazeStreamServer", sock: socket.socket):
+        self.server = server
+        self.sock = sock
+        self.queue: Deque[_Pending] = deque()
+        self.cond = threading.Condition()
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self._unreported = 0
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+
+    def push(self, message: _Pending) -> None:
+        with self.cond:
+            if self.closed:
+                return
+            if len(self.queue) >= self.server.max_queue:
+                self._drop_oldest()
+            self.queue.append(message)
+            self.cond.notify()
+
+    def _drop_oldest(self) -> None:
+        # Gesture events are rare and not superseded by the next message, so
+        # the oldest frame goes first
+        for i, queued in enumerate(self.queue):
+            if queued.kind == KIND_FRAME:
+                del self.queue[i]
+                break
+        else:
+            self.queue.popleft()
+        self.dropped += 1
+        self._unreported += 1
+
+    def close(self) -> None:
+        # Reached from both the sender thread (_remove) and stop(): only the
+        # first call shuts the socket down
+        with self.cond:
+            if self.closed:
+                return
+            self.closed = True
+            self.queue.clear()
+            self.cond.notify()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _loop(self) -> None:
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.queue or self.closed)
+                if self.closed:
+                    return
+                message = self.queue.popleft()
+                dropped, self._unreported = self._unreported, 0
+            try:
+                self.sock.sendall(message.pack(dropped))
+                self.sent += 1
+            except OSError:     # reader gone, or stalled past send_timeout
+                self.server._remove(self)
+                return
+
+
+class GazeStreamServer:
+    """
+    Publishes tracking results to local processes over a Unix-domain socket.
+
+    publish_frame() and publish_event() never block the tracking loop: each
+    message is encoded once and appended to a bounded queue per connected
+    client, drained by that client's sender thread. A client that reads
+    slower than the camera loses its oldest queued frames (drop-oldest), and
+    the next message it receives says how many it missed. The kernel send
+    buffer is kept small so stale frames wait in that queue, where they can
+    be dropped, rather than in the socket. A client that stops reading for
+    send_timeout seconds is disconnected.
+
+    Use:
+        stream = GazeStreamServer(default_socket_path(), screen=(1920, 1080))
+        stream.start()
+        stream.publish_frame(captured_at, landmarks, (x, y))
+        stream.publish_event("mouth", "LEFT CLICK", now)
+        stream.stop()
+    """
+
+    def __init__(
+        self,
+        path: str,
+        screen: Tuple[int, int] = (0, 0),
+        max_queue: int = 8,
+        include_points: bool = True,
+        send_buffer: int = 32 * 1024,
+        send_timeout: float = 2.0,
+    ):
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Unix-domain sockets are not available on this platform")
+        self.path = path
+        self.screen = screen
+        self.max_queue = max(1, int(max_queue))
+        self.include_points = include_points
+        self.send_buffer = send_buffer
+        self.send_timeout = send_timeout
+
+        self._clients: List[_Client] = []
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._seq = 0
+        self._last_captured = 0.0
+
+    # ----------------- Lifecycle -----------------
+    def start(self) -> None:
+        if self._sock is not None:
+            return
+        self._remove_stale_socket()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.path)
+        os.chmod(self.path, 0o600)      # same user only
+        sock.listen()
+        self._sock = sock
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        sock, self._sock = self._sock, None
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            client.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _remove_stale_socket(self) -> None:
+        """Take over the path left by a crashed daemon, but not a live one."""
+        if not os.path.exists(self.path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.unlink(self.path)
+        else:
+            raise RuntimeError(f"Another gaze stream is already serving {self.path}")
+        finally:
+            probe.close()
+
+    def _accept_loop(self) -> None:
+        while True:
+            sock = self._sock
+            if sock is None:
+                return
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                return
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer)
+            conn.settimeout(self.send_timeout)
+            client = _Client(self, conn)
+            hello = json.dumps({
+                "protocol": PROTOCOL,
+                "screen": list(self.screen),
+                "schemes": SCHEME_IDS,
+            }).encode("utf-8")
+            client.push(_Pending(KIND_HELLO, 0, 0, self._seq, 0.0, 0.0, hello))
+            with self._lock:
+                self._clients.append(client)
+            client.thread.start()
+
+    def _remove(self, client: _Client) -> None:
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+        client.close()
+
+    # ----------------- Publishing -----------------
+    @property
+    def clients(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def _broadcast(self, message: _Pending) -> None:
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            client.push(message)
+
+    def publish_frame(self, captured_at: float, landmarks=None, screen: Optional[Tuple[int, int]] = None) -> None:
+        """One processed camera frame: its FaceLandmarks (None without a face)
+        and the screen point the cursor was sent to, if any."""
+        self._seq += 1
+        self._last_captured = captured_at
+        if not self.clients:
+            return
+        self._broadcast(_encode_frame(self._seq, captured_at, landmarks, screen, self.include_points))
+
+    def publish_event(self, source: str, action: str, timestamp: float) -> None:
+        """A gesture fired on the last published frame."""
+        if not self.clients:
+            return
+        name = source.encode("utf-8")
+        self._broadcast(_Pending(KIND_EVENT, 0, len(name), self._seq, self._last_captured, timestamp,
+                                 name + action.encode("utf-8")))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            clients = list(self._clients)
+        return {
+            "frames": self._seq,
+            "clients": len(clients),
+            "sent": sum(c.sent for c in clients),
+            "dropped": sum(c.dropped for c in clients),
+        }
+
+
+# ------------------- Client -------------------
+class GazeStreamClient:
+    """
+    Reads a GazeStreamServer socket.
+
+    Use:
+        with GazeStreamClient(default_socket_path()) as stream:
+            print(stream.hello["screen"])
+            for message in stream:
+                if isinstance(message, GazeFrame) and message.gaze:
+                    ...
+    """
+
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(path)
+        self._file = self._sock.makefile("rb")
+        self.hello = self.read()
+
+    def _read_exact(self, n: int) -> bytes:
+        data = self._file.read(n)
+        if data is None or len(data) < n:
+            raise EOFError("gaze stream closed")
+        return data
+
+    def read(self) -> Message:
+        """Next message; raises EOFError when the server goes away."""
+        header = self._read_exact(_HEADER.size)
+        length = _HEADER.unpack(header)[3]
+        size = length + _padding(length)
+        return decode(header, self._read_exact(size) if size else b"")
+
+    def __iter__(self) -> Iterator[Message]:
+        while True:
+            try:
+                yield self.read()
+            except EOFError:
+                return
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
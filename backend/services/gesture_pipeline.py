@@ -0,0 +1,132 @@
+from backend.services import input_injection
+from backend.services.blink_click import BlinkClicker
+from backend.services.eyebrow_scroll import EyebrowScroller
+from backend.services.lip_eyebrow_scroll import LipEyebrowScrollController
+from backend.services.lip_scroll import LipScrollController
+from backend.services.mouth_click import MouthClicker
+
+# Controller sources, in the order they run each frame
+MOUTH = "mouth"
+EYEBROW = "eyebrow"
+LIP = "lip"
+LIP_BROW = "lip_brow"
+BLINK = "blink"
+SOURCES = (MOUTH, EYEBROW, LIP, LIP_BROW, BLINK)
+
+# Log prefix per source (what main prints before the action)
+LABELS = {
+    MOUTH: "Mouth",
+    EYEBROW: "Eyebrow",
+    LIP: "LipScroll",
+    LIP_BROW: "LipBrowScroll",
+    BLINK: "Blink",
+}
+
+
+class GesturePipeline:
+    """
+    Every per-frame gesture controller, built with the app's tuned settings.
+
+    The live tracking loop and the offline replay engine both drive the
+    controllers through this class, so a replay exercises exactly what the
+    app runs.
+
+    Use:
+        gestures = GesturePipeline(injector=actuator)
+        for source, action in gestures.update(face, now, enabled={"mouth", "blink"}):
+            print(f"{LABELS[source]} → {action}")
+    """
+
+    def __init__(self, injector=None, ear_threshold_left=0.22, ear_threshold_right=0.22):
+        injector = injector if injector is not None else input_injection.get_backend()
+
+        # Mouth clicker state machine (per-frame)
+        self.mouth_clicker = MouthClicker(
+            arm_mouth_open_ratio=0.25,
+            close_ratio=0.015,
+            cooldown_sec=0.35,
+            double_click_window=1.8,
+            right_click_hold_sec=0.7,
+            show_debug=False,
+            injector=injector,
+        )
+        # Eyebrow scroller state machine (per-frame)
+        self.eyebrow_scroller = EyebrowScroller(
+            up_threshold=0.03,
+            down_threshold=0.012,
+            scroll_amount=90,
+            repeat_interval=0.14,
+            smooth_window=9,
+            baseline_alpha=0.005,
+            show_debug=False,
+            injector=injector,
+        )
+        # Lip scroll controller state machine (per-frame)
+        self.lip_scroll = LipScrollController(
+            pucker_threshold=0.62,
+            lips_closed_ratio=0.020,
+            toggle_hold_sec=0.55,
+            scroll_amount=90,
+            repeat_interval=0.10,
+            gaze_up_thresh=0.45,
+            gaze_down_thresh=0.55,
+            gaze_deadband=(0.47, 0.52),
+            show_debug=False,
+            injector=injector,
+        )
+        # Lip + Eyebrow combined scroll controller (per-frame)
+        self.lip_brow_scroll = LipEyebrowScrollController(
+            pucker_threshold=0.62,
+            lips_closed_ratio=0.020,
+            toggle_hold_sec=0.55,
+
+            brow_down_threshold=0.002,   # easier
+            brow_hold_frames=1,          # easier
+
+            scroll_amount=90,
+            repeat_interval=0.12,
+
+            smooth_window=5,
+            baseline_alpha=0.003,
+            baseline_update_band=0.001,
+
+            show_debug=False,
+            injector=injector,
+        )
+        # EAR blink clicks (per-frame)
+        self.blink_clicker = BlinkClicker(
+            ear_threshold_left=ear_threshold_left,
+            ear_threshold_right=ear_threshold_right,
+            min_consec_frames=2,
+            cooldown_sec=0.5,
+            smooth_window=5,
+            injector=injector,
+        )
+
+        self.controllers = {
+            MOUTH: self.mouth_clicker,
+            EYEBROW: self.eyebrow_scroller,
+            LIP: self.lip_scroll,
+            LIP_BROW: self.lip_brow_scroll,
+            BLINK: self.blink_clicker,
+        }
+
+    def reset(self):
+        for controller in self.controllers.values():
+            controller.reset()
+
+    def update(self, frame, now, enabled=SOURCES):
+        """
+        frame: LandmarkFrame
+        now: frame timestamp
+        enabled: sources to run this frame
+
+        returns: list of (source, action) for every controller that fired
+        """
+        actions = []
+        for source, controller in self.controllers.items():
+            if source in enabled:
+                action = controller.update(frame, now)
+                if action:
+                    actions.append((source, action))
+        return actions
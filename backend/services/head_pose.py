@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class HeadPose:
+    """
+    Head alignment for one frame.
+
+    rotation/translation: rigid transform (row vectors) taking this frame's
+        landmarks onto the reference pose: aligned = p @ rotation + translation
+    eye_*: 2D similarity that puts the eye-corner line (33 -> 362) on the
+        x axis with unit length, centered on its midpoint
+    """
+
+    rotation: np.ndarray
+    translation: np.ndarray
+    eye_mid: np.ndarray
+    eye_cos: float
+    eye_sin: float
+    eye_dist: float
+
+    def align(self, points):
+        """(N, 3) landmarks -> reference head frame."""
+        return points @ self.rotation + self.translation
+
+    def to_eye_space(self, xy):
+        """(N, 2) landmarks -> eye-corner aligned, inter-ocular normalized space."""
+        d = xy - self.eye_mid
+        c, s = self.eye_cos, self.eye_sin
+        x = (c * d[:, 0] + s * d[:, 1]) / self.eye_dist
+        y = (-s * d[:, 0] + c * d[:, 1]) / self.eye_dist
+        return np.stack([x, y], axis=1)
+
+
+class HeadPoseEstimator:
+    """
+    Estimates the head pose once per frame for every consumer.
+
+    The rigid part is a Kabsch alignment of a few stable anchors (eye outer
+    corners, nose tip, mouth corners) onto a reference captured from the first
+    frame after reset(). The reference is stored pre-centered so each frame
+    only centers its own anchors and runs one 3x3 SVD.
+    """
+
+    ANCHOR_IDX = np.array([33, 263, 1, 61, 291])  # left eye outer, right eye outer, nose tip, mouth corners
+    EYE_IDX = np.array([33, 362])
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._ref_mean = None
+        self._ref_centered = None
+
+    def set_reference(self, points):
+        anchors = points[self.ANCHOR_IDX].astype(np.float32)
+        self._ref_mean = anchors.mean(axis=0)
+        self._ref_centered = anchors - self._ref_mean
+
+    def estimate(self, points):
+        """points: (478, 3) landmark array -> HeadPose"""
+        if self._ref_centered is None:
+            self.set_reference(points)
+
+        # Rigid: Kabsch of anchors onto the cached reference
+        anchors = points[self.ANCHOR_IDX]
+        mean = anchors.mean(axis=0)
+        H = (anchors - mean).T @ self._ref_centered
+        U, S, Vt = np.linalg.svd(H)
+        R = U @ Vt  # row-vector form: (anchors - mean) @ R ~ reference
+        if np.linalg.det(R) < 0:
+            Vt[-1, :] *= -1
+            R = U @ Vt
+        t = self._ref_mean - mean @ R
+
+        # Similarity: eye-corner line to the unit x axis
+        L, Rc = points[self.EYE_IDX, :2]
+        v = Rc - L
+        dist = float(np.hypot(v[0], v[1])) + 1e-9
+
+        return HeadPose(
+            rotation=R,
+            translation=t,
+            eye_mid=(L + Rc) * 0.5,
+            eye_cos=float(v[0] / dist),
+            eye_sin=float(v[1] / dist),
+            eye_dist=dist,
+        )
+
+
+_default_estimator = None
+
+
+def get_estimator():
+    """Process-wide estimator used by LandmarkFrame unless one is passed in."""
+    global _default_estimator
+    if _default_estimator is None:
+        _default_estimator = HeadPoseEstimator()
+    return _default_estimator
@@ -0,0 +1,454 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from Quartz import (
+        CGEventCreateMouseEvent,
+        CGEventPost,
+        CGEventSetIntegerValueField,
+        CGPoint,
+        kCGHIDEventTap,
+        kCGEventLeftMouseDown,
+        kCGEventLeftMouseDragged,
+        kCGEventLeftMouseUp,
+        kCGMouseButtonLeft,
+        kCGMouseEventClickState,
+    )
+    _HAS_QUARTZ = True
+except Exception:
+    _HAS_QUARTZ = False
+
+
+@dataclass
+class LatencyCounter:
+    count: int = 0
+    total_sec: float = 0.0
+    max_sec: float = 0.0
+
+    def add(self, dt: float) -> None:
+        self.count += 1
+        self.total_sec += dt
+        if dt > self.max_sec:
+            self.max_sec = dt
+
+    @property
+    def mean_sec(self) -> float:
+        return self.total_sec / self.count if self.count else 0.0
+
+
+class InputBackend:
+    """
+    Base class for cursor/click injection.
+
+    Public methods time every call into a per-operation LatencyCounter and
+    delegate to the underscore hooks that concrete backends implement.
+    """
+
+    name = "base"
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, LatencyCounter] = {}
+        self._stats_lock = threading.Lock()
+
+    def _record(self, op: str, t0: float) -> None:
+        dt = time.perf_counter() - t0
+        with self._stats_lock:
+            counter = self._stats.get(op)
+            if counter is None:
+                counter = self._stats[op] = LatencyCounter()
+            counter.add(dt)
+
+    # ----------------- Public API -----------------
+    def position(self) -> Tuple[int, int]:
+        t0 = time.perf_counter()
+        try:
+            return self._position()
+        finally:
+            self._record("position", t0)
+
+    def size(self) -> Tuple[int, int]:
+        return self._size()
+
+    def move_to(self, x: int, y: int) -> None:
+        t0 = time.perf_counter()
+        try:
+            self._move_to(int(x), int(y))
+        finally:
+            self._record("move_to", t0)
+
+    def click(self, button: str = "left") -> None:
+        t0 = time.perf_counter()
+        try:
+            self._click(button)
+        finally:
+            self._record("click", t0)
+
+    def double_click(self, button: str = "left", interval: float = 0.0,
+                     x: Optional[int] = None, y: Optional[int] = None) -> None:
+        t0 = time.perf_counter()
+        try:
+            self._double_click(button, interval, x, y)
+        finally:
+            self._record("double_click", t0)
+
+    def scroll(self, amount: int) -> None:
+        t0 = time.perf_counter()
+        try:
+            self._scroll(int(amount))
+        finally:
+            self._record("scroll", t0)
+
+    def mouse_down(self, button: str = "left", x: Optional[int] = None, y: Optional[int] = None) -> None:
+        t0 = time.perf_counter()
+        try:
+            self._mouse_down(button, x, y)
+        finally:
+            self._record("mouse_down", t0)
+
+    def mouse_up(self, button: str = "left", x: Optional[int] = None, y: Optional[int] = None) -> None:
+        t0 = time.perf_counter()
+        try:
+            self._mouse_up(button, x, y)
+        finally:
+            self._record("mouse_up", t0)
+
+    def drag_to(self, x: int, y: int) -> None:
+        """Emit an explicit drag event while a button is held (only needed on macOS)."""
+        t0 = time.perf_counter()
+        try:
+            self._drag_to(int(x), int(y))
+        finally:
+            self._record("drag_to", t0)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-operation call count and latency in milliseconds."""
+        with self._stats_lock:
+            return {
+                op: {
+                    "count": c.count,
+                    "mean_ms": c.mean_sec * 1000.0,
+                    "max_ms": c.max_sec * 1000.0,
+                }
+                for op, c in self._stats.items()
+            }
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats.clear()
+
+    # ----------------- Backend hooks -----------------
+    def _position(self) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    def _size(self) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    def _move_to(self, x: int, y: int) -> None:
+        raise NotImplementedError
+
+    def _click(self, button: str) -> None:
+        raise NotImplementedError
+
+    def _double_click(self, button: str, interval: float, x: Optional[int], y: Optional[int]) -> None:
+        raise NotImplementedError
+
+    def _scroll(self, amount: int) -> None:
+        raise NotImplementedError
+
+    def _mouse_down(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        raise NotImplementedError
+
+    def _mouse_up(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        raise NotImplementedError
+
+    def _drag_to(self, x: int, y: int) -> None:
+        # Most platforms turn move_to into a drag while the button is down
+        pass
+
+
+class PyAutoGUIBackend(InputBackend):
+    """pyautogui without the per-call PAUSE sleep (every call passes _pause=False)."""
+
+    name = "pyautogui"
+
+    def __init__(self) -> None:
+        super().__init__()
+        import pyautogui
+
+        pyautogui.FAILSAFE = False
+        self._pg = pyautogui
+
+    def _position(self) -> Tuple[int, int]:
+        x, y = self._pg.position()
+        return int(x), int(y)
+
+    def _size(self) -> Tuple[int, int]:
+        w, h = self._pg.size()
+        return int(w), int(h)
+
+    def _move_to(self, x: int, y: int) -> None:
+        self._pg.moveTo(x, y, _pause=False)
+
+    def _click(self, button: str) -> None:
+        self._pg.click(button=button, _pause=False)
+
+    def _double_click(self, button: str, interval: float, x: Optional[int], y: Optional[int]) -> None:
+        self._pg.click(button=button, clicks=2, interval=float(interval), _pause=False)
+
+    def _scroll(self, amount: int) -> None:
+        self._pg.scroll(amount, _pause=False)
+
+    def _mouse_down(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        self._pg.mouseDown(button=button, _pause=False)
+
+    def _mouse_up(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        self._pg.mouseUp(button=button, _pause=False)
+
+
+class PynputBackend(InputBackend):
+    """
+    Direct injection through pynput's mouse controller (XTest on X11).
+
+    Scroll amounts are wheel clicks, the same unit pyautogui uses on Linux.
+    """
+
+    name = "pynput"
+
+    def __init__(self) -> None:
+        super().__init__()
+        from pynput.mouse import Button, Controller
+
+        self._mouse = Controller()
+        self._buttons = {"left": Button.left, "right": Button.right, "middle": Button.middle}
+        self._screen_size: Optional[Tuple[int, int]] = None
+
+    def _button(self, button: str):
+        return self._buttons.get(button, self._buttons["left"])
+
+    def _position(self) -> Tuple[int, int]:
+        x, y = self._mouse.position
+        return int(x), int(y)
+
+    def _size(self) -> Tuple[int, int]:
+        if self._screen_size is None:
+            import pyautogui
+
+            w, h = pyautogui.size()
+            self._screen_size = (int(w), int(h))
+        return self._screen_size
+
+    def _move_to(self, x: int, y: int) -> None:
+        self._mouse.position = (x, y)
+
+    def _click(self, button: str) -> None:
+        self._mouse.click(self._button(button))
+
+    def _double_click(self, button: str, interval: float, x: Optional[int], y: Optional[int]) -> None:
+        b = self._button(button)
+        if interval <= 0.0:
+            self._mouse.click(b, 2)
+            return
+        self._mouse.click(b)
+        time.sleep(interval)
+        self._mouse.click(b)
+
+    def _scroll(self, amount: int) -> None:
+        self._mouse.scroll(0, amount)
+
+    def _mouse_down(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        self._mouse.press(self._button(button))
+
+    def _mouse_up(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        self._mouse.release(self._button(button))
+
+
+class QuartzBackend(PyAutoGUIBackend):
+    """
+    macOS: posts left-button events straight to the HID event tap so that
+    double clicks carry the click-state field Finder expects and drags are
+    reported as drags. Everything else goes through pyautogui without PAUSE.
+    """
+
+    name = "quartz"
+
+    def _at(self, x: Optional[int], y: Optional[int]):
+        if x is None or y is None:
+            x, y = self._position()
+        return CGPoint(int(x), int(y))
+
+    @staticmethod
+    def _post(event_type, pt, click_state: int) -> None:
+        ev = CGEventCreateMouseEvent(None, event_type, pt, kCGMouseButtonLeft)
+        CGEventSetIntegerValueField(ev, kCGMouseEventClickState, click_state)
+        CGEventPost(kCGHIDEventTap, ev)
+
+    def _double_click(self, button: str, interval: float, x: Optional[int], y: Optional[int]) -> None:
+        if button != "left":
+            super()._double_click(button, interval, x, y)
+            return
+        try:
+            pt = self._at(x, y)
+            self._post(kCGEventLeftMouseDown, pt, 1)
+            self._post(kCGEventLeftMouseUp, pt, 1)
+
+            time.sleep(max(0.02, float(interval)))
+
+            self._post(kCGEventLeftMouseDown, pt, 2)
+            self._post(kCGEventLeftMouseUp, pt, 2)
+        except Exception:
+            super()._double_click(button, max(0.02, float(interval)), x, y)
+
+    def _mouse_down(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        if button != "left":
+            super()._mouse_down(button, x, y)
+            return
+        try:
+            self._post(kCGEventLeftMouseDown, self._at(x, y), 1)
+        except Exception:
+            super()._mouse_down(button, x, y)
+
+    def _mouse_up(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        if button != "left":
+            super()._mouse_up(button, x, y)
+            return
+        try:
+            self._post(kCGEventLeftMouseUp, self._at(x, y), 1)
+        except Exception:
+            super()._mouse_up(button, x, y)
+
+    def _drag_to(self, x: int, y: int) -> None:
+        try:
+            self._post(kCGEventLeftMouseDragged, CGPoint(x, y), 1)
+        except Exception:
+            pass
+
+
+class RecordingBackend(InputBackend):
+    """In-memory backend for tests and offline replay; nothing reaches the OS."""
+
+    name = "recording"
+
+    def __init__(self, screen_size: Tuple[int, int] = (1920, 1080)) -> None:
+        super().__init__()
+        self.screen_size = screen_size
+        self.cursor = (screen_size[0] // 2, screen_size[1] // 2)
+        self.events: List[tuple] = []
+
+    def clear(self) -> None:
+        self.events.clear()
+
+    def _position(self) -> Tuple[int, int]:
+        return self.cursor
+
+    def _size(self) -> Tuple[int, int]:
+        return self.screen_size
+
+    def _move_to(self, x: int, y: int) -> None:
+        self.cursor = (x, y)
+        self.events.append(("move_to", x, y))
+
+    def _click(self, button: str) -> None:
+        self.events.append(("click", button))
+
+    def _double_click(self, button: str, interval: float, x: Optional[int], y: Optional[int]) -> None:
+        self.events.append(("double_click", button))
+
+    def _scroll(self, amount: int) -> None:
+        self.events.append(("scroll", amount))
+
+    def _mouse_down(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        self.events.append(("mouse_down", button))
+
+    def _mouse_up(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        self.events.append(("mouse_up", button))
+
+    def _drag_to(self, x: int, y: int) -> None:
+        self.cursor = (x, y)
+        self.events.append(("drag_to", x, y))
+
+
+class NullBackend(InputBackend):
+    """Discards every event: tracking without cursor control (headless streaming)."""
+
+    name = "null"
+
+    def __init__(self, screen_size: Tuple[int, int] = (1920, 1080)) -> None:
+        super().__init__()
+        self.screen_size = screen_size
+        self.cursor = (screen_size[0] // 2, screen_size[1] // 2)
+
+    def _position(self) -> Tuple[int, int]:
+        return self.cursor
+
+    def _size(self) -> Tuple[int, int]:
+        return self.screen_size
+
+    def _move_to(self, x: int, y: int) -> None:
+        self.cursor = (x, y)
+
+    def _click(self, button: str) -> None:
+        pass
+
+    def _double_click(self, button: str, interval: float, x: Optional[int], y: Optional[int]) -> None:
+        pass
+
+    def _scroll(self, amount: int) -> None:
+        pass
+
+    def _mouse_down(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        pass
+
+    def _mouse_up(self, button: str, x: Optional[int], y: Optional[int]) -> None:
+        pass
+
+
+# ------------------- Backend selection -------------------
+_BACKENDS = {
+    "pyautogui": PyAutoGUIBackend,
+    "pynput": PynputBackend,
+    "quartz": QuartzBackend,
+    "recording": RecordingBackend,
+}
+
+_default_backend: Optional[InputBackend] = None
+_default_lock = threading.Lock()
+
+
+def create_backend(name: str = "auto") -> InputBackend:
+    """
+    Build an injection backend by name. "auto" picks Quartz on macOS,
+    pynput on Linux and pyautogui (without PAUSE) everywhere else.
+    """
+    if name != "auto":
+        if name not in _BACKENDS:
+            raise ValueError(f"Unknown input backend: {name}")
+        return _BACKENDS[name]()
+
+    if sys.platform == "darwin" and _HAS_QUARTZ:
+        return QuartzBackend()
+    if sys.platform.startswith("linux"):
+        try:
+            return PynputBackend()
+        except Exception:
+            pass
+    return PyAutoGUIBackend()
+
+
+def get_backend() -> InputBackend:
+    """Process-wide default backend, created on first use."""
+    global _default_backend
+    with _default_lock:
+        if _default_backend is None:
+            _default_backend = create_backend()
+        return _default_backend
+
+
+def set_backend(backend: InputBackend) -> None:
+    global _default_backend
+    with _default_lock:
+        _default_backend = backend
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from backend.services import latency
+from backend.services.landmark_frame import LandmarkFrame
+from backend.services.preprocess import DLIB_68_MIRROR_INDEX, FaceROI, FramePreprocessor, mirror_points
+
+# Landmark layouts of FaceLandmarks.points
+SCHEME_MEDIAPIPE_478 = "mediapipe_478"    # FaceMesh with refine_landmarks (468 mesh + 10 iris)
+SCHEME_DLIB_68 = "dlib_68"                # iBUG 68 points (shape_predictor_68_face_landmarks)
+
+
+@dataclass(frozen=True)
+class FaceLandmarks:
+    """
+    One face found by a LandmarkBackend, in the same form whatever the engine.
+
+    points are normalized to the frame (x, y in 0..1, z relative depth or 0
+    when the engine has none) in the layout named by `scheme`. iris holds the
+    two iris/pupil centres, normalized and ordered left to right in the
+    image, or None when the engine found the face but not the pupils.
+    """
+
+    points: np.ndarray                  # (N, 3) float32
+    scheme: str
+    iris: Optional[np.ndarray]          # (2, 2) float32
+    timestamp: float
+
+    @property
+    def gaze(self) -> Optional[tuple]:
+        """Iris midpoint (normalized x, y), what the cursor follows."""
+        if self.iris is None:
+            return None
+        x, y = self.iris.mean(axis=0)
+        return float(x), float(y)
+
+    def landmark_frame(self, pose_estimator=None) -> Optional[LandmarkFrame]:
+        """LandmarkFrame for the gesture controllers, which need the FaceMesh
+        layout; None for other schemes."""
+        if self.scheme != SCHEME_MEDIAPIPE_478:
+            return None
+        return LandmarkFrame(self.points, self.timestamp, pose_estimator)
+
+
+class LandmarkBackend:
+    """
+    Base class for face landmark engines.
+
+    process() takes a BGR frame and returns the first face as FaceLandmarks,
+    or None when there is no face. With mirror=True the landmarks are those
+    of the horizontally flipped (selfie view) frame, without flipping any
+    pixels. Engines load their models in __init__ and raise ImportError
+    there when their library is missing. roi (a FaceROI) crops the frame
+    around the previous face for engines that support it.
+    """
+
+    name = "base"
+    scheme: Optional[str] = None
+
+    @classmethod
+    def preload(cls) -> None:
+        """Start loading the engine's models in the background, if it can."""
+
+    def process(self, frame, timestamp: Optional[float] = None) -> Optional[FaceLandmarks]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MediapipeBackend(LandmarkBackend):
+    """
+    mediapipe FaceMesh, configured as main.py always used it, fed through
+    FramePreprocessor (one colour conversion, read-only reused buffer).
+
+    With a FaceROI, frames after the first face are cropped around it. The
+    crops go to a second FaceMesh so its tracking state never mixes crop and
+    whole-frame coordinates; when the crop loses the face, the same frame is
+    searched whole.
+    """
+
+    name = "mediapipe"
+    scheme = SCHEME_MEDIAPIPE_478
+
+    IRIS_IDX = [468, 473]
+
+    def __init__(self, mirror: bool = False, refine_landmarks: bool = True, max_num_faces: int = 1,
+                 roi: Optional[FaceROI] = None, **face_mesh_kwargs):
+        import mediapipe as mp
+
+        def face_mesh():
+            return mp.solutions.face_mesh.FaceMesh(  # pyright: ignore
+                refine_landmarks=refine_landmarks, max_num_faces=max_num_faces, **face_mesh_kwargs
+            )
+
+        self._face_mesh = face_mesh()
+        self._roi_mesh = face_mesh() if roi is not None else None
+        if roi is not None:
+            roi.reset()
+        self._has_iris = refine_landmarks
+        self._prep = FramePreprocessor(mirror, roi)
+
+    def process(self, frame, timestamp=None):
+        prep = self._prep
+        rgb = prep.rgb(frame)
+        latency.get_monitor().lap(latency.PREPROCESS)
+        if prep.box is None:
+            results = self._face_mesh.process(rgb)
+        else:
+            results = self._roi_mesh.process(rgb)
+            if not results.multi_face_landmarks:
+                prep.lost()
+                results = self._face_mesh.process(prep.rgb(frame))
+        if not results.multi_face_landmarks:
+            prep.lost()
+            return None
+
+        timestamp = time.time() if timestamp is None else timestamp
+        points = self._prep.landmarks(results.multi_face_landmarks[0], timestamp).points
+        iris = None
+        if self._has_iris:
+            iris = points[self.IRIS_IDX, :2]
+            if iris[0, 0] > iris[1, 0]:
+                iris = iris[::-1]
+            iris = np.ascontiguousarray(iris)
+        return FaceLandmarks(points, self.scheme, iris, timestamp)
+
+    def close(self):
+        self._face_mesh.close()
+        if self._roi_mesh is not None:
+            self._roi_mesh.close()
+
+
+class DlibBackend(LandmarkBackend):
+    """
+    The gaze_tracking package: dlib face detector + 68 points predictor, with
+    its own pupil detection for the iris centres. Has no FaceMesh layout, so
+    only the cursor can follow it, not the mesh based gestures.
+    """
+
+    name = "dlib"
+    scheme = SCHEME_DLIB_68
+
+    def __init__(self, mirror: bool = False, detect_interval: int = 10, roi: Optional[FaceROI] = None,
+                 **gaze_kwargs):
+        # roi is ignored: between detections GazeTracking already works on
+        # the tracked face box (detect_interval)
+        from gaze_tracking import GazeTracking
+
+        self._gaze = GazeTracking(detect_interval=detect_interval, **gaze_kwargs)
+        self._mirror = mirror
+
+    @classmethod
+    def preload(cls):
+        # The 68 points model takes about a second to read; a GazeTracking
+        # built meanwhile waits for this load instead of starting another
+        try:
+            from gaze_tracking import models
+        except ImportError:
+            return
+        models.preload(background=True)
+
+    def process(self, frame, timestamp=None):
+        gaze = self._gaze
+        gaze.refresh(frame)
+        if gaze.landmarks is None:
+            return None
+
+        timestamp = time.time() if timestamp is None else timestamp
+        h, w = frame.shape[:2]
+        scale = np.array([w, h], dtype=np.float32)
+        parts = gaze.landmarks.parts()
+        points = np.zeros((len(parts), 3), dtype=np.float32)
+        points[:, :2] = [(p.x, p.y) for p in parts]
+        points[:, :2] /= scale
+        if self._mirror:
+            points = mirror_points(points, DLIB_68_MIRROR_INDEX)
+
+        iris = None
+        result = gaze.result
+        if result.located:
+            iris = np.array([result.pupil_left, result.pupil_right], dtype=np.float32) / scale
+            if self._mirror:
+                iris[:, 0] = 1.0 - iris[:, 0]
+            iris = iris[np.argsort(iris[:, 0], kind="stable")]
+        return FaceLandmarks(points, self.scheme, iris, timestamp)
+
+
+# ------------------- Backend selection -------------------
+_BACKENDS = {
+    "mediapipe": MediapipeBackend,
+    "dlib": DlibBackend,
+}
+
+# "auto" without sample frames: first one that loads
+PREFERENCE = ("mediapipe", "dlib")
+
+
+@dataclass
+class BackendScore:
+    name: str
+    fps: float = 0.0
+    detect_rate: float = 0.0        # fraction of the sample frames with a face
+    error: Optional[str] = None     # why the engine could not be used
+
+
+def benchmark_backends(
+    frames: Sequence[np.ndarray],
+    names: Iterable[str] = PREFERENCE,
+    warmup: int = 3,
+    factories: Optional[Dict[str, type]] = None,
+    engine_kwargs: Optional[dict] = None,
+) -> List[BackendScore]:
+    """
+    Time every engine on the same sample frames.
+
+    The first `warmup` frames are processed untimed (model initialisation,
+    first detection). Engines that fail to load are reported with their error.
+    """
+    factories = factories or _BACKENDS
+    scores = []
+    for name in names:
+        score = BackendScore(name)
+        try:
+            backend = factories[name](**(engine_kwargs or {}))
+        except Exception as e:
+            score.error = f"{type(e).__name__}: {e}"
+            scores.append(score)
+            continue
+
+        with backend:
+            for frame in frames[:warmup]:
+                backend.process(frame)
+            timed = frames[warmup:] or frames
+            found = 0
+            t0 = time.perf_counter()
+            for frame in timed:
+                if backend.process(frame) is not None:
+                    found += 1
+            elapsed = time.perf_counter() - t0
+        score.fps = len(timed) / elapsed if elapsed > 0 else float("inf")
+        score.detect_rate = found / len(timed) if timed else 0.0
+        scores.append(score)
+    return scores
+
+
+def pick_fastest(scores: Sequence[BackendScore], min_detect_rate: float = 0.5) -> Optional[str]:
+    """
+    Fastest engine among those that found a face in at least
+    min_detect_rate of the frames (an engine that finds nothing is fast for
+    the wrong reason). With no face in the samples, the first engine that
+    loaded wins.
+    """
+    usable = [s for s in scores if s.error is None]
+    if not usable:
+        return None
+    good = [s for s in usable if s.detect_rate >= min_detect_rate]
+    if not good:
+        return usable[0].name
+    return max(good, key=lambda s: s.fps).name
+
+
+def backend_scheme(name: str) -> Optional[str]:
+    """Landmark layout an engine produces (None for unknown names)."""
+    factory = _BACKENDS.get(name)
+    return factory.scheme if factory is not None else None
+
+
+def preload_backends(name: str = "auto", schemes: Optional[Sequence[str]] = None) -> None:
+    """
+    Start loading the models of the engines create_backend(name, ..., schemes)
+    may build, so the loading overlaps opening the camera. Engines whose
+    library is missing are skipped.
+    """
+    if name != "auto":
+        names = [name] if name in _BACKENDS else []
+    else:
+        names = [n for n in PREFERENCE if not schemes or _BACKENDS[n].scheme in schemes]
+    for n in names:
+        _BACKENDS[n].preload()
+
+
+def create_backend(
+    name: str = "auto",
+    sample_frames: Optional[Sequence[np.ndarray]] = None,
+    schemes: Optional[Sequence[str]] = None,
+    **engine_kwargs,
+) -> LandmarkBackend:
+    """
+    Build a landmark engine by name (engine_kwargs go to its constructor).
+    "auto" benchmarks the installed engines on sample_frames and returns the
+    fastest, or, without samples, the first that loads in PREFERENCE order.
+    With schemes, "auto" only considers engines producing one of those
+    layouts (e.g. the FaceMesh layout the gestures need), and falls back to
+    the others only when none of them loads.
+    """
+    if name != "auto":
+        if name not in _BACKENDS:
+            raise ValueError(f"Unknown landmark backend: {name}")
+        return _BACKENDS[name](**engine_kwargs)
+
+    names = list(PREFERENCE)
+    if schemes:
+        names = [n for n in PREFERENCE if _BACKENDS[n].scheme in schemes]
+    # Engines with a wanted layout first, the others only as a last resort
+    preference = names + [n for n in PREFERENCE if n not in names]
+
+    if sample_frames and names:
+        scores = benchmark_backends(sample_frames, names, engine_kwargs=engine_kwargs)
+        for s in scores:
+            if s.error:
+                print(f"[LANDMARKS] {s.name}: unavailable ({s.error})")
+            else:
+                print(f"[LANDMARKS] {s.name}: {s.fps:.1f} fps, face in {s.detect_rate:.0%} of samples")
+        best = pick_fastest(scores)
+        if best is not None:
+            return _BACKENDS[best](**engine_kwargs)
+
+    errors = []
+    for candidate in preference:
+        try:
+            return _BACKENDS[candidate](**engine_kwargs)
+        except Exception as e:
+            errors.append(f"{candidate}: {e}")
+    raise RuntimeError("No landmark backend available (" + "; ".join(errors) + ")")
@@ -0,0 +1,98 @@
+import time
+import numpy as np
+from backend.services.face_features import extract_features
+from backend.services.head_pose import get_estimator
+
+# refine_landmarks=True gives 468 face points + 2 x 5 iris points
+NUM_LANDMARKS = 478
+
+
+class LandmarkFrame:
+    """
+    One face's mediapipe landmarks for one frame.
+
+    The protobuf landmark list is converted once into a contiguous
+    (N, 3) float32 array of normalized (x, y, z), so the gesture controllers
+    can index and slice it with NumPy instead of touching protobuf objects
+    point by point.
+
+    Gesture features (frame.features) and the head pose (frame.pose) are
+    computed on first access and shared by every controller that sees the
+    same frame.
+
+    Use:
+        frame = LandmarkFrame.from_mediapipe(results.multi_face_landmarks[0], now)
+        action = mouth_clicker.update(frame, now)
+    """
+
+    __slots__ = ("points", "timestamp", "_features", "_pose", "_pose_estimator")
+
+    def __init__(self, points, timestamp=None, pose_estimator=None):
+        self.points = points
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self._features = None
+        self._pose = None
+        self._pose_estimator = pose_estimator
+
+    @property
+    def pose(self):
+        """HeadPose for this frame, estimated once (process-wide estimator by default)."""
+        if self._pose is None:
+            estimator = self._pose_estimator or get_estimator()
+            self._pose = estimator.estimate(self.points)
+        return self._pose
+
+    @property
+    def features(self):
+        """FaceFeatures for this frame, computed once."""
+        return self.compute_features()
+
+    def compute_features(self):
+        """Computes the FaceFeatures now if not done yet, and returns them.
+        Lets the caller choose where that cost is paid (and timed) instead of
+        in whichever controller reads frame.features first."""
+        if self._features is None:
+            self._features = extract_features(self.points, self.pose)
+        return self._features
+
+    @classmethod
+    def from_mediapipe(cls, face_landmarks, timestamp=None, pose_estimator=None):
+        """
+        face_landmarks: results.multi_face_landmarks[0] (or its .landmark list)
+        timestamp: optional capture time (time.time())
+        pose_estimator: optional HeadPoseEstimator (defaults to the shared one)
+        """
+        lms = getattr(face_landmarks, "landmark", face_landmarks)
+        n = len(lms)
+        flat = np.fromiter(
+            (v for p in lms for v in (p.x, p.y, p.z)),
+            dtype=np.float32,
+            count=n * 3,
+        )
+        return cls(flat.reshape(n, 3), timestamp, pose_estimator)
+
+    def __len__(self):
+        return len(self.points)
+
+    def __getitem__(self, index):
+        return self.points[index]
+
+
+def as_landmark_frame(landmarks, timestamp=None):
+    """Accept a LandmarkFrame, an (N, 3) array or a raw mediapipe landmark list."""
+    if isinstance(landmarks, LandmarkFrame):
+        return landmarks
+    if isinstance(landmarks, np.ndarray):
+        return LandmarkFrame(landmarks, timestamp)
+    return LandmarkFrame.from_mediapipe(landmarks, timestamp)
+
+
+def eye_aspect_ratio(points, indices):
+    """
+    EAR of one eye from six landmark indices ordered p1..p6
+    (p1/p4 corners, p2/p6 and p3/p5 vertical pairs).
+    """
+    p = points[indices, :2]
+    d = p[[1, 2, 0]] - p[[5, 4, 3]]
+    vertical1, vertical2, horizontal = np.sqrt((d * d).sum(axis=1))
+    return float((vertical1 + vertical2) / (2.0 * horizontal))
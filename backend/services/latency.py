@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import numpy as np
+
+# Stage names used by main.tracking_loop, in pipeline order
+CAPTURE_AGE = "capture_age"          # frame grabbed -> picked up by the loop
+PREPROCESS = "preprocess"            # BGR -> RGB into the reused buffer (mediapipe engine)
+FACE_MESH = "face_mesh"              # landmark engine inference
+LANDMARKS = "landmarks"              # LandmarkFrame + features + head pose
+CURSOR = "cursor"                    # cursor mapping + move queued
+CONTROLLERS = "controllers"          # gesture controllers
+FRAME = "frame"                      # whole loop iteration
+INJECT = "inject"                    # OS injection on the actuation thread
+FRAME_TO_CURSOR = "frame_to_cursor"  # frame grabbed -> cursor moved (end to end)
+
+STAGES = (CAPTURE_AGE, PREPROCESS, FACE_MESH, LANDMARKS, CURSOR, CONTROLLERS, FRAME, INJECT, FRAME_TO_CURSOR)
+
+
+class LatencyMonitor:
+    """
+    Rolling per-stage latency histograms for the tracking pipeline.
+
+    The loop calls frame_start() once per frame and lap(stage) after each
+    stage; every lap stores the milliseconds since the previous one in a
+    bounded window per stage. Other threads report absolute measurements
+    with record(). Percentiles are only computed when someone asks
+    (snapshot(), dump()), so the per-frame cost is a perf_counter call and
+    a deque append per stage.
+
+    All times are time.monotonic()/perf_counter based.
+
+    Use:
+        lat = LatencyMonitor()
+        lat.frame_start()
+        ...
+        lat.lap("face_mesh")
+        print(lat.snapshot()["face_mesh"]["p95"])
+    """
+
+    enabled = True
+
+    def __init__(self, window: int = 1024):
+        self.window = max(1, int(window))
+        self._samples: Dict[str, Deque[float]] = {}
+        self._t_frame = 0.0
+        self._t_lap = 0.0
+        self._dump_thread: Optional[threading.Thread] = None
+        self._dump_stop = threading.Event()
+
+    # ----------------- Recording (hot path) -----------------
+    def frame_start(self) -> None:
+        self._t_frame = self._t_lap = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """Record the time since the previous lap (or frame_start) under `stage`."""
+        now = time.perf_counter()
+        self.record(stage, (now - self._t_lap) * 1000.0)
+        self._t_lap = now
+
+    def frame_end(self) -> None:
+        self.record(FRAME, (time.perf_counter() - self._t_frame) * 1000.0)
+
+    def record(self, stage: str, ms: float) -> None:
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples.setdefault(stage, deque(maxlen=self.window))
+        samples.append(ms)
+
+    def record_since(self, stage: str, t_monotonic: float) -> None:
+        """Record time.monotonic() - t_monotonic (e.g. since a frame was captured)."""
+        self.record(stage, (time.monotonic() - t_monotonic) * 1000.0)
+
+    def reset(self) -> None:
+        self._samples = {}
+
+    # ----------------- Reading -----------------
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """{stage: {count, mean, p50, p95, p99, max}} in milliseconds, pipeline order first."""
+        order = {name: i for i, name in enumerate(STAGES)}
+        out = {}
+        for stage in sorted(self._samples, key=lambda s: (order.get(s, len(order)), s)):
+            data = np.array(self._samples[stage], dtype=np.float64)  # copy: deque may grow meanwhile
+            if data.size == 0:
+                continue
+            p50, p95, p99 = np.percentile(data, (50, 95, 99))
+            out[stage] = {
+                "count": int(data.size),
+                "mean": round(float(data.mean()), 3),
+                "p50": round(float(p50), 3),
+                "p95": round(float(p95), 3),
+                "p99": round(float(p99), 3),
+                "max": round(float(data.max()), 3),
+            }
+        return out
+
+    def dump(self, path: str) -> None:
+        """Write snapshot() to `path`: CSV for *.csv, JSON otherwise."""
+        snap = self.snapshot()
+        tmp = path + ".tmp"
+        with open(tmp, "w", newline="") as f:
+            if path.endswith(".csv"):
+                writer = csv.writer(f)
+                writer.writerow(["time", "stage", "count", "mean", "p50", "p95", "p99", "max"])
+                stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+                for stage, s in snap.items():
+                    writer.writerow([stamp, stage, s["count"], s["mean"], s["p50"], s["p95"], s["p99"], s["max"]])
+            else:
+                json.dump({"time": time.time(), "window": self.window, "stages": snap}, f, indent=4)
+        os.replace(tmp, path)
+
+    # ----------------- Periodic dump -----------------
+    def start_dumping(self, path: str, interval: float = 10.0) -> None:
+        if self._dump_thread and self._dump_thread.is_alive():
+            return
+        self._dump_stop.clear()
+
+        def loop():
+            while not self._dump_stop.wait(interval):
+                try:
+                    self.dump(path)
+                except OSError as e:
+                    print(f"[LATENCY] dump to {path} failed: {e}")
+
+        self._dump_thread = threading.Thread(target=loop, daemon=True)
+        self._dump_thread.start()
+
+    def stop_dumping(self, timeout: float = 1.0) -> None:
+        self._dump_stop.set()
+        if self._dump_thread:
+            self._dump_thread.join(timeout=timeout)
+            self._dump_thread = None
+
+
+class NullLatencyMonitor(LatencyMonitor):
+    """Disabled monitor: same interface, every call returns immediately."""
+
+    enabled = False
+
+    def frame_start(self) -> None:
+        pass
+
+    def lap(self, stage: str) -> None:
+        pass
+
+    def frame_end(self) -> None:
+        pass
+
+    def record(self, stage: str, ms: float) -> None:
+        pass
+
+    def record_since(self, stage: str, t_monotonic: float) -> None:
+        pass
+
+    def start_dumping(self, path: str, interval: float = 10.0) -> None:
+        pass
+
+
+_monitor: LatencyMonitor = NullLatencyMonitor()
+
+
+def get_monitor() -> LatencyMonitor:
+    """Process-wide monitor (disabled unless set_monitor() installed a real one)."""
+    return _monitor
+
+
+def set_monitor(monitor: Optional[LatencyMonitor]) -> None:
+    global _monitor
+    _monitor = monitor if monitor is not None else NullLatencyMonitor()
@@ -1,7 +1,7 @@
-import time
 import numpy as np
-import pyautogui
 from collections import deque
+from backend.services import input_injection
+from backend.services.landmark_frame import as_landmark_frame
 
 
 class LipEyebrowScrollController:
@@ -15,7 +15,8 @@ class LipEyebrowScrollController:
       Eyebrows DOWN (relative to eyelids) triggers scroll tick in current mode direction.
 
     Head resistance:
-      Uses 3D rigid alignment (Kabsch) on stable face anchors to reduce head motion effects.
+      Measures brows and lids in the frame's shared head pose (frame.pose), a 3D
+      rigid alignment on stable face anchors, to reduce head motion effects.
     """
 
     MODE_OFF = 0
@@ -43,6 +44,7 @@ class LipEyebrowScrollController:
         baseline_update_band=0.003,   # only update baseline if |delta| below this (prevents adapting during gestures)
 
         show_debug=False,
+        injector=None,
     ):
         self.pucker_threshold = pucker_threshold
         self.lips_closed_ratio = lips_closed_ratio
@@ -57,17 +59,16 @@ class LipEyebrowScrollController:
         self.baseline_alpha = baseline_alpha
         self.baseline_update_band = baseline_update_band
         self.show_debug = show_debug
+        self.injector = injector if injector is not None else input_injection.get_backend()
 
         self._q = deque(maxlen=max(1, int(smooth_window)))
 
         self.reset()
 
-        # Face anchors used for 3D head alignment (stable points)
-        self._ANCHOR_IDX = [33, 263, 1, 61, 291]  # left eye outer, right eye outer, nose tip, mouth corners
-
         # Brow + lid points
         self._LBROW, self._RBROW = 105, 334
         self._LLID, self._RLID = 159, 386
+        self._BROW_LID_IDX = np.array([self._LBROW, self._RBROW, self._LLID, self._RLID])
 
     def reset(self):
         self.mode = self.MODE_OFF
@@ -77,43 +78,15 @@ class LipEyebrowScrollController:
         self._lip_latched = False
 
         # eyebrow state
-        self._ref_anchors = None
         self._neutral = None
         self._last_scroll = 0.0
         self._down_count = 0
         self._q.clear()
 
     # ----------------- Lip helpers -----------------
-    @staticmethod
-    def _clamp(v, a, b):
-        return a if v < a else b if v > b else v
-
-    def _pucker_metric(self, landmarks):
-        # mouth corners
-        left_corner = landmarks[61]
-        right_corner = landmarks[291]
-        mouth_w = abs(right_corner.x - left_corner.x)
-
-        # normalize by eye width
-        l_eye_outer = landmarks[33]
-        r_eye_outer = landmarks[263]
-        eye_w = abs(r_eye_outer.x - l_eye_outer.x) + 1e-6
-
-        return mouth_w / eye_w
-
-    def _mouth_open_ratio(self, landmarks):
-        left_corner = landmarks[61]
-        right_corner = landmarks[291]
-        upper_lip = landmarks[13]
-        lower_lip = landmarks[14]
-
-        mouth_open = abs(lower_lip.y - upper_lip.y)
-        mouth_w = abs(right_corner.x - left_corner.x) + 1e-6
-        return mouth_open / mouth_w
-
-    def _lip_activated(self, landmarks):
-        pucker_m = self._pucker_metric(landmarks)
-        open_r = self._mouth_open_ratio(landmarks)
+    def _lip_activated(self, features):
+        pucker_m = features.pucker
+        open_r = features.mouth_open_ratio
         activated = (pucker_m < self.pucker_threshold) and (open_r < self.lips_closed_ratio)
 
         if self.show_debug:
@@ -132,55 +105,18 @@ class LipEyebrowScrollController:
             self.mode = self.MODE_OFF
 
     # ----------------- 3D eyebrow alignment -----------------
-    @staticmethod
-    def _p3(lm):
-        return np.array([lm.x, lm.y, lm.z], dtype=np.float32)
-
-    @staticmethod
-    def _kabsch_align(P, Q):
-        """
-        Find R, t such that P @ R + t best matches Q in least squares.
-        P, Q: (N,3)
-        """
-        Pc = P - P.mean(axis=0, keepdims=True)
-        Qc = Q - Q.mean(axis=0, keepdims=True)
-
-        H = Pc.T @ Qc
-        U, S, Vt = np.linalg.svd(H)
-        R = Vt.T @ U.T
-
-        if np.linalg.det(R) < 0:
-            Vt[-1, :] *= -1
-            R = Vt.T @ U.T
-
-        t = Q.mean(axis=0) - (P.mean(axis=0) @ R)
-        return R, t
-
-    def _aligned_point(self, lm, R, t):
-        p = self._p3(lm)
-        return p @ R + t
-
-    def _brow_metric(self, landmarks):
+    def _brow_metric(self, frame):
         """
         Returns average (lid_y - brow_y) in an aligned head frame.
         Eyebrow DOWN => this value decreases.
         """
-        anchors = np.stack([self._p3(landmarks[i]) for i in self._ANCHOR_IDX], axis=0)
-
-        if self._ref_anchors is None:
-            self._ref_anchors = anchors.copy()
-
-        R, t = self._kabsch_align(anchors, self._ref_anchors)
-
-        L_brow = self._aligned_point(landmarks[self._LBROW], R, t)
-        R_brow = self._aligned_point(landmarks[self._RBROW], R, t)
-        L_lid = self._aligned_point(landmarks[self._LLID], R, t)
-        R_lid = self._aligned_point(landmarks[self._RLID], R, t)
+        # brows + lids in one (4,3) block: L_brow, R_brow, L_lid, R_lid
+        L_brow, R_brow, L_lid, R_lid = frame.pose.align(frame.points[self._BROW_LID_IDX])
 
         # y increases downward. lid_y - brow_y is "brow height distance".
         L_val = (L_lid[1] - L_brow[1])
         R_val = (R_lid[1] - R_brow[1])
-        return 0.5 * (L_val + R_val)
+        return float(0.5 * (L_val + R_val))
 
     # ----------------- Main update -----------------
     def update(self, landmarks, now=None):
@@ -190,11 +126,12 @@ class LipEyebrowScrollController:
         Returns:
           "MODE_UP" / "MODE_DOWN" / "MODE_OFF" / "SCROLL_UP" / "SCROLL_DOWN" / None
         """
+        frame = as_landmark_frame(landmarks, now)
         if now is None:
-            now = time.time()
+            now = frame.timestamp
 
         # 1) Lip hold toggles mode
-        lip_on = self._lip_activated(landmarks)
+        lip_on = self._lip_activated(frame.features)
         if lip_on:
             if self._lip_start is None:
                 self._lip_start = now
@@ -219,7 +156,7 @@ class LipEyebrowScrollController:
             return None
 
         # 2) Eyebrow DOWN gesture triggers scrolling
-        val = self._brow_metric(landmarks)
+        val = self._brow_metric(frame)
         self._q.append(val)
         smoothed = float(sum(self._q) / len(self._q))
 
@@ -251,10 +188,10 @@ class LipEyebrowScrollController:
             self._last_scroll = now
 
             if self.mode == self.MODE_UP:
-                pyautogui.scroll(self.scroll_amount)
+                self.injector.scroll(self.scroll_amount)
                 return "SCROLL_UP"
             else:
-                pyautogui.scroll(-self.scroll_amount)
+                self.injector.scroll(-self.scroll_amount)
                 return "SCROLL_DOWN"
 
         return None
@@ -1,5 +1,5 @@
-import time
-import pyautogui
+from backend.services import input_injection
+from backend.services.landmark_frame import as_landmark_frame
 
 
 class LipScrollController:
@@ -14,6 +14,7 @@ class LipScrollController:
         gaze_down_thresh=0.60,
         gaze_deadband=(0.45, 0.55),
         show_debug=False,
+        injector=None,
     ):
         self.pucker_threshold = pucker_threshold
         self.lips_closed_ratio = lips_closed_ratio
@@ -24,6 +25,7 @@ class LipScrollController:
         self.gaze_down_thresh = gaze_down_thresh
         self.gaze_deadband = gaze_deadband
         self.show_debug = show_debug
+        self.injector = injector if injector is not None else input_injection.get_backend()
 
         self.mode_on = False
         self._start = None
@@ -36,55 +38,14 @@ class LipScrollController:
         self._latched = False
         self._last_scroll = 0.0
 
-    @staticmethod
-    def _clamp(v, a, b):
-        return a if v < a else b if v > b else v
-
-    def _pucker_metric(self, landmarks):
-        left_corner = landmarks[61]
-        right_corner = landmarks[291]
-        mouth_w = abs(right_corner.x - left_corner.x)
-
-        l_eye_outer = landmarks[33]
-        r_eye_outer = landmarks[263]
-        eye_w = abs(r_eye_outer.x - l_eye_outer.x) + 1e-6
-
-        return mouth_w / eye_w
-
-    def _mouth_open_ratio(self, landmarks):
-        left_corner = landmarks[61]
-        right_corner = landmarks[291]
-        upper_lip = landmarks[13]
-        lower_lip = landmarks[14]
-
-        mouth_open = abs(lower_lip.y - upper_lip.y)
-        mouth_w = abs(right_corner.x - left_corner.x) + 1e-6
-        return mouth_open / mouth_w
-
-    def _gaze_vertical_pos(self, landmarks):
-        iris_r = landmarks[468]
-        iris_l = landmarks[473]
-
-        up_l = landmarks[159]
-        lo_l = landmarks[145]
-        up_r = landmarks[386]
-        lo_r = landmarks[374]
-
-        def eye_pos(iris, up, lo):
-            denom = (lo.y - up.y)
-            if abs(denom) < 1e-6:
-                return 0.5
-            p = (iris.y - up.y) / denom
-            return self._clamp(p, 0.0, 1.0)
-
-        return 0.5 * (eye_pos(iris_l, up_l, lo_l) + eye_pos(iris_r, up_r, lo_r))
-
     def update(self, landmarks, now=None):
+        frame = as_landmark_frame(landmarks, now)
         if now is None:
-            now = time.time()
+            now = frame.timestamp
+        features = frame.features
 
-        pucker_m = self._pucker_metric(landmarks)
-        open_r = self._mouth_open_ratio(landmarks)
+        pucker_m = features.pucker
+        open_r = features.mouth_open_ratio
 
         # Activation = puckered AND lips closed-ish
         activated = (pucker_m < self.pucker_threshold) and (open_r < self.lips_closed_ratio)
@@ -114,18 +75,18 @@ class LipScrollController:
         if (now - self._last_scroll) < self.repeat_interval:
             return None
 
-        gaze = self._gaze_vertical_pos(landmarks)
+        gaze = features.gaze_vertical
 
         if self.gaze_deadband[0] <= gaze <= self.gaze_deadband[1]:
             return None
 
         if gaze < self.gaze_up_thresh:
-            pyautogui.scroll(self.scroll_amount)
+            self.injector.scroll(self.scroll_amount)
             self._last_scroll = now
             return "SCROLL_UP"
 
         if gaze > self.gaze_down_thresh:
-            pyautogui.scroll(-self.scroll_amount)
+            self.injector.scroll(-self.scroll_amount)
             self._last_scroll = now
             return "SCROLL_DOWN"
 
@@ -1,5 +1,6 @@
 import time
-import pyautogui
+from backend.services import input_injection
+from backend.services.landmark_frame import as_landmark_frame
 
 
 class MouthClicker:
@@ -13,7 +14,7 @@ class MouthClicker:
 
     Use:
         clicker = MouthClicker(...)
-        action = clicker.update(landmarks, now=time.time())
+        action = clicker.update(frame, now=time.time())
         if action: print(action)
     """
 
@@ -25,6 +26,7 @@ class MouthClicker:
         double_click_window=1.8,
         right_click_hold_sec=0.7,
         show_debug=False,
+        injector=None,
     ):
         self.arm_mouth_open_ratio = arm_mouth_open_ratio
         self.close_ratio = close_ratio
@@ -32,6 +34,7 @@ class MouthClicker:
         self.double_click_window = double_click_window
         self.right_click_hold_sec = right_click_hold_sec
         self.show_debug = show_debug
+        self.injector = injector if injector is not None else input_injection.get_backend()
 
         self.reset()
 
@@ -45,23 +48,16 @@ class MouthClicker:
 
     def update(self, landmarks, now=None):
         """
-        landmarks: mediapipe face landmarks list (results.multi_face_landmarks[0].landmark)
-        now: optional timestamp (time.time())
+        landmarks: LandmarkFrame (a raw mediapipe landmark list is converted)
+        now: optional timestamp (defaults to the frame timestamp)
 
         returns: "LEFT CLICK" / "RIGHT CLICK" / "DOUBLE CLICK" / None
         """
+        frame = as_landmark_frame(landmarks, now)
         if now is None:
-            now = time.time()
+            now = frame.timestamp
 
-        # Mediapipe mouth landmarks
-        left_corner = landmarks[61]
-        right_corner = landmarks[291]
-        upper_lip = landmarks[13]
-        lower_lip = landmarks[14]
-
-        mouth_open = abs(lower_lip.y - upper_lip.y)
-        mouth_width = abs(right_corner.x - left_corner.x) + 1e-6
-        open_ratio = mouth_open / mouth_width
+        open_ratio = frame.features.mouth_open_ratio
 
         action = None
 
@@ -77,7 +73,7 @@ class MouthClicker:
                     self.last_open_event_time != 0.0
                     and (now - self.last_open_event_time) <= self.double_click_window
                 ):
-                    pyautogui.doubleClick()
+                    self.injector.double_click("left")
                     self.last_action_time = now
                     self.last_open_event_time = 0.0
                     action = "DOUBLE CLICK"
@@ -92,7 +88,7 @@ class MouthClicker:
                 and (now - self.open_start_time) >= self.right_click_hold_sec
                 and (now - self.last_action_time) > self.cooldown_sec
             ):
-                pyautogui.rightClick()
+                self.injector.click("right")
                 self.last_action_time = now
                 self.right_click_fired = True
                 action = "RIGHT CLICK"
@@ -107,7 +103,7 @@ class MouthClicker:
                     and (now - self.last_action_time) > self.cooldown_sec
                     and self.last_open_event_time != 0.0
                 ):
-                    pyautogui.leftClick()
+                    self.injector.click("left")
                     self.last_action_time = now
                     action = "LEFT CLICK"
 
@@ -126,6 +122,7 @@ def mouth_gesture_clicker(
 ):
     import cv2
     import mediapipe as mp
+    from backend.services.preprocess import FramePreprocessor
 
     mp_face = mp.solutions.face_mesh
     face_mesh = mp_face.FaceMesh(
@@ -136,6 +133,7 @@ def mouth_gesture_clicker(
     )
 
     cap = cv2.VideoCapture(camera_index)
+    preprocessor = FramePreprocessor()
     clicker = MouthClicker(
         arm_mouth_open_ratio=arm_mouth_open_ratio,
         close_ratio=close_ratio,
@@ -150,18 +148,16 @@ def mouth_gesture_clicker(
         if not ret:
             break
 
-        frame = cv2.flip(frame, 1)
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        res = face_mesh.process(rgb)
+        face = preprocessor.process(face_mesh, frame)
 
         now = time.time()
         action = None
 
-        if res.multi_face_landmarks:
-            landmarks = res.multi_face_landmarks[0].landmark
-            action = clicker.update(landmarks, now)
+        if face is not None:
+            action = clicker.update(face, now)
 
         if show_debug:
+            frame = cv2.flip(frame, 1)
             cv2.putText(
                 frame,
                 f"Action: {action or 'NONE'}",
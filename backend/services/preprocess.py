@@ -0,0 +1,201 @@
+import cv2
+import numpy as np
+
+from backend.services.landmark_frame import LandmarkFrame
+
+# ------------------- Mirror map -------------------
+# The FaceMesh topology is left/right symmetric: the 28 midline points map to
+# themselves, the other points below 248 map, in order, onto 248..467, and
+# the two iris rings swap. MIRROR_INDEX[i] is the landmark that sits where i
+# would be if the face were mirrored, so mirroring a landmark set is
+# points[MIRROR_INDEX] with x -> 1 - x, and the result matches (up to model
+# noise) what FaceMesh returns for a flipped image: LEFT_EYE still indexes the
+# eye on the left of the mirrored picture.
+_MIDLINE = (
+    0, 1, 2, 4, 5, 6, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19,
+    94, 151, 152, 164, 168, 175, 195, 197, 199, 200,
+)
+_IRIS_PAIRS = ((468, 473), (469, 476), (470, 475), (471, 474), (472, 477))
+
+
+def _mirror_index():
+    index = np.arange(478)
+    side = [i for i in range(248) if i not in _MIDLINE]
+    for a, b in list(zip(side, range(248, 468))) + list(_IRIS_PAIRS):
+        index[a], index[b] = b, a
+    return index
+
+
+MIRROR_INDEX = _mirror_index()
+MIRROR_INDEX.setflags(write=False)
+
+# Same for the dlib 68 points layout (jaw, brows, nose, eyes, lips)
+DLIB_68_MIRROR_INDEX = np.array([
+    16, 15, 14, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1, 0,
+    26, 25, 24, 23, 22, 21, 20, 19, 18, 17,
+    27, 28, 29, 30, 35, 34, 33, 32, 31,
+    45, 44, 43, 42, 47, 46, 39, 38, 37, 36, 41, 40,
+    54, 53, 52, 51, 50, 49, 48, 59, 58, 57, 56, 55,
+    64, 63, 62, 61, 60, 67, 66, 65,
+])
+DLIB_68_MIRROR_INDEX.setflags(write=False)
+
+
+def mirror_points(points, index=MIRROR_INDEX):
+    """
+    (N, 3) normalized landmarks of a frame -> the landmarks of the same frame
+    mirrored horizontally (FaceMesh layout, N = 478 or 468 without
+    refine_landmarks; pass index=DLIB_68_MIRROR_INDEX for dlib points).
+    """
+    mirrored = points[index[:len(points)]]
+    mirrored[:, 0] = 1.0 - mirrored[:, 0]
+    return mirrored
+
+
+class FaceROI:
+    """
+    Square crop around the face found in the previous frame.
+
+    The box is the landmarks' bounding square grown by `padding` of its side
+    on every edge, shifted (not shrunk) to stay inside the frame. It keeps
+    its size while the face scale changes by less than resize_tolerance, so
+    the model and the colour buffer see the same input size frame after
+    frame. Crops larger than max_size pixels are downscaled by an integer
+    factor (INTER_AREA; the side is rounded to a multiple of it, OpenCV's
+    fast path). FaceMesh resizes the face to 192 px internally, so max_size
+    around 384 costs little accuracy, but the iris points get coarser below
+    that.
+
+    Landmarks found in the crop are mapped back to full-frame normalized
+    coordinates with to_frame(). After a frame without a face, or when the
+    face fills most of the frame, crop() returns the whole frame.
+    """
+
+    def __init__(self, padding=0.6, max_size=None, resize_tolerance=0.15):
+        self.padding = padding
+        self.max_size = max_size
+        self.resize_tolerance = resize_tolerance
+        self.box = None         # (x0, y0, side) in pixels for the next frame, None = whole frame
+        self._small = None
+
+    def reset(self):
+        self.box = None
+
+    def crop(self, frame):
+        """returns: (image to run the model on, box or None for the whole frame)"""
+        box = self.box
+        if box is None:
+            return frame, None
+        x0, y0, side = box
+        view = frame[y0:y0 + side, x0:x0 + side]
+        if self.max_size and side > self.max_size:
+            size = side // -(-side // self.max_size)
+            shape = (size, size) + frame.shape[2:]
+            if self._small is None or self._small.shape != shape:
+                self._small = np.empty(shape, frame.dtype)
+            cv2.resize(view, (size, size), dst=self._small, interpolation=cv2.INTER_AREA)
+            view = self._small
+        return view, box
+
+    @staticmethod
+    def to_frame(points, box, frame_shape):
+        """Crop-normalized (N, 3) landmarks -> full-frame normalized, in place."""
+        h, w = frame_shape[:2]
+        x0, y0, side = box
+        points[:, 0] = (points[:, 0] * side + x0) / w
+        points[:, 1] = (points[:, 1] * side + y0) / h
+        points[:, 2] *= side / w        # FaceMesh z is in units of the image width
+        return points
+
+    def update(self, points, frame_shape):
+        """Box for the next frame from this frame's full-frame landmarks (None: face lost)."""
+        if points is None:
+            self.box = None
+            return
+        h, w = frame_shape[:2]
+        x_min, y_min = points[:, :2].min(axis=0) * (w, h)
+        x_max, y_max = points[:, :2].max(axis=0) * (w, h)
+        side = int(max(x_max - x_min, y_max - y_min) * (1.0 + 2.0 * self.padding))
+        if self.box is not None and abs(side - self.box[2]) <= self.resize_tolerance * self.box[2]:
+            side = self.box[2]
+        elif self.max_size and side > self.max_size:
+            factor = -(-side // self.max_size)
+            side = factor * -(-side // factor)
+        if side >= min(w, h):
+            self.box = None     # nothing to save
+            return
+        x0 = int(np.clip(round((x_min + x_max - side) / 2.0), 0, w - side))
+        y0 = int(np.clip(round((y_min + y_max - side) / 2.0), 0, h - side))
+        self.box = (x0, y0, side)
+
+
+class FramePreprocessor:
+    """
+    Camera frame -> mediapipe input with a single pixel pass.
+
+    The BGR frame is converted to RGB into a destination array reused from
+    frame to frame and handed over read-only, so mediapipe uses it by
+    reference instead of copying it. Frames are not flipped: the selfie
+    mirror is applied to the normalized landmarks afterwards
+    (mirror_points), which costs a 478 point gather instead of a full-frame
+    copy.
+
+    With a FaceROI only the crop around the previous face is converted (and
+    given to the model), and landmarks() maps the points back to the whole
+    frame. box tells which one the last rgb() returned.
+
+    Use:
+        prep = FramePreprocessor()
+        results = face_mesh.process(prep.rgb(frame))
+        face = prep.landmarks(results.multi_face_landmarks[0], now)
+    """
+
+    def __init__(self, mirror=True, roi=None):
+        self.mirror = mirror
+        self.roi = roi
+        self.box = None         # FaceROI box of the last rgb() input, None = whole frame
+        self._shape = None
+        self._rgb = None
+
+    def rgb(self, frame):
+        """Read-only RGB copy of a BGR frame (or of its face crop), in the
+        reused buffer (valid until the next call)."""
+        self._shape = frame.shape
+        if self.roi is not None:
+            frame, self.box = self.roi.crop(frame)
+        buf = self._rgb
+        if buf is None or buf.shape != frame.shape:
+            buf = self._rgb = np.empty(frame.shape, np.uint8)
+        buf.flags.writeable = True
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=buf)
+        buf.flags.writeable = False
+        return buf
+
+    def landmarks(self, face_landmarks, timestamp=None, pose_estimator=None):
+        """LandmarkFrame from mediapipe landmarks of the last rgb() input, in
+        whole-frame coordinates and mirrored if enabled."""
+        frame = LandmarkFrame.from_mediapipe(face_landmarks, timestamp, pose_estimator)
+        if self.roi is not None:
+            if self.box is not None:
+                self.roi.to_frame(frame.points, self.box, self._shape)
+            self.roi.update(frame.points, self._shape)
+        if self.mirror:
+            frame.points = mirror_points(frame.points)
+        return frame
+
+    def process(self, face_mesh, frame, timestamp=None):
+        """
+        Run face_mesh on a BGR frame.
+
+        returns: LandmarkFrame of the first face, or None
+        """
+        results = face_mesh.process(self.rgb(frame))
+        if not results.multi_face_landmarks:
+            self.lost()
+            return None
+        return self.landmarks(results.multi_face_landmarks[0], timestamp)
+
+    def lost(self):
+        """No face in the last rgb() input: the next frame is searched whole."""
+        if self.roi is not None:
+            self.roi.reset()
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from backend.services import gesture_pipeline
+from backend.services.gesture_pipeline import GesturePipeline
+from backend.services.head_pose import HeadPoseEstimator
+from backend.services.input_injection import RecordingBackend
+from backend.services.landmark_frame import LandmarkFrame
+from backend.services.session_recording import ActionRecord, SessionReader
+
+
+@dataclass
+class ReplayResult:
+    actions: List[ActionRecord] = field(default_factory=list)
+    events: list = field(default_factory=list)      # injected input, RecordingBackend tuples
+    frames: int = 0
+    session_seconds: float = 0.0                    # recorded time span
+    wall_seconds: float = 0.0                       # time the replay took
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def speedup(self) -> float:
+        """How many times faster than real time the replay ran."""
+        return self.session_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+class ReplayEngine:
+    """
+    Headless replay of a recorded landmark stream through the real controllers.
+
+    Each recorded frame becomes a LandmarkFrame stamped with its recorded
+    time, so every controller sees injected timestamps instead of
+    time.time(), and input goes to a RecordingBackend instead of the OS.
+    Frames are fed back to back, as fast as the CPU allows.
+
+    Use:
+        result = ReplayEngine(enabled={"mouth"}).run("recordings/session.eyl")
+        print(result.actions, f"{result.speedup:.0f}x real time")
+    """
+
+    def __init__(
+        self,
+        enabled: Iterable[str] = gesture_pipeline.SOURCES,
+        ear_threshold_left: float = 0.22,
+        ear_threshold_right: float = 0.22,
+        injector=None,
+    ):
+        self.enabled = frozenset(enabled)
+        unknown = self.enabled - set(gesture_pipeline.SOURCES)
+        if unknown:
+            raise ValueError(f"Unknown gesture source(s): {', '.join(sorted(unknown))}")
+
+        self.injector = injector if injector is not None else RecordingBackend()
+        self.pipeline = GesturePipeline(
+            injector=self.injector,
+            ear_threshold_left=ear_threshold_left,
+            ear_threshold_right=ear_threshold_right,
+        )
+        # Own reference pose, so a replay never disturbs the live tracker's
+        self.pose_estimator = HeadPoseEstimator()
+
+    def reset(self) -> None:
+        self.pipeline.reset()
+        self.pose_estimator.reset()
+        if isinstance(self.injector, RecordingBackend):
+            self.injector.clear()
+
+    def run(self, session) -> ReplayResult:
+        """
+        session: recording path, SessionReader, or any iterable of
+            (timestamp, (478, 3) points)
+        """
+        if isinstance(session, (str, bytes)) or hasattr(session, "__fspath__"):
+            with SessionReader(session) as reader:
+                return self.run(reader)
+
+        self.reset()
+        result = ReplayResult()
+        first: Optional[float] = None
+        last = 0.0
+
+        t0 = time.perf_counter()
+        for timestamp, points in session:
+            frame = LandmarkFrame(points, timestamp, pose_estimator=self.pose_estimator)
+            for source, action in self.pipeline.update(frame, timestamp, self.enabled):
+                result.actions.append(ActionRecord(timestamp, source, action))
+            if first is None:
+                first = timestamp
+            last = timestamp
+            result.frames += 1
+        result.wall_seconds = time.perf_counter() - t0
+
+        result.session_seconds = (last - first) if first is not None else 0.0
+        if isinstance(self.injector, RecordingBackend):
+            result.events = list(self.injector.events)
+        return result
+
+
+def compare_actions(
+    recorded: Iterable[ActionRecord], replayed: Iterable[ActionRecord]
+) -> Tuple[List[ActionRecord], List[ActionRecord]]:
+    """Returns (missing, extra): recorded actions the replay did not emit, and vice versa."""
+    def key(a):
+        return (round(a.timestamp, 6), a.source, a.action)
+
+    rec = {key(a): a for a in recorded}
+    rep = {key(a): a for a in replayed}
+    missing = [a for k, a in rec.items() if k not in rep]
+    extra = [a for k, a in rep.items() if k not in rec]
+    return missing, extra
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a landmark recording through the gesture controllers.")
+    parser.add_argument("recording")
+    parser.add_argument("--only", nargs="+", choices=gesture_pipeline.SOURCES,
+                        help="controllers to run (default: the ones that fired in the recording, else all)")
+    parser.add_argument("--ear-left", type=float, default=0.22)
+    parser.add_argument("--ear-right", type=float, default=0.22)
+    args = parser.parse_args(argv)
+
+    with SessionReader(args.recording) as reader:
+        recorded = list(reader.actions())
+        enabled = args.only or sorted({a.source for a in recorded}) or gesture_pipeline.SOURCES
+        engine = ReplayEngine(enabled, args.ear_left, args.ear_right)
+        result = engine.run(reader)
+
+    for a in result.actions:
+        print(f"{a.timestamp:.3f}  {gesture_pipeline.LABELS[a.source]} → {a.action}")
+
+    missing, extra = compare_actions(
+        (a for a in recorded if a.source in engine.enabled), result.actions
+    )
+    print(
+        f"{result.frames} frames, {result.session_seconds:.1f}s recorded, "
+        f"replayed in {result.wall_seconds:.3f}s ({result.fps:.0f} fps, {result.speedup:.0f}x real time)"
+    )
+    print(f"{len(result.actions)} actions replayed, {len(recorded)} recorded, "
+          f"{len(missing)} missing, {len(extra)} extra")
+
+
+if __name__ == "__main__":
+    main()
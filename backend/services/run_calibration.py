@@ -1,8 +1,8 @@
 import cv2
 import mediapipe as mp
-from calibration_utils import save_calibration
-from cursor_calibrator import CursorMovementCalibrator
-from eye_blink_calibrator import EyeBlinkCalibrator
+from backend.services.calibration_utils import save_calibration
+from backend.services.cursor_calibrator import CursorMovementCalibrator
+from backend.services.eye_blink_calibrator import EyeBlinkCalibrator
 
 # Setup
 cap = cv2.VideoCapture(0)
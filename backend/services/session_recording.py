@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from backend.services.landmark_frame import NUM_LANDMARKS
+
+# ------------------- File format -------------------
+#
+#   file header (32 bytes)
+#     magic       8s   b"EYEOSLM1"
+#     version     u32
+#     landmarks   u32  points per frame (478 with refined iris)
+#     created     f64  time.time() when recording started
+#     reserved    8x
+#
+#   chunk (repeated until EOF)
+#     magic       4s   b"CHNK"
+#     frames      u32  n
+#     action_len  u32  bytes of the JSON action block (before padding)
+#     reserved    4x
+#     t_first     f64
+#     t_last      f64
+#     timestamps  f64[n]
+#     points      f32[n, landmarks, 3]
+#     actions     utf-8 JSON list of [timestamp, source, action], zero-padded to 8 bytes
+#
+# Every block is 8-byte aligned, so a reader can view timestamps and points
+# straight out of an mmap without copying. Chunks are self-delimiting, so a
+# recording cut short by a crash is still readable up to its last whole chunk.
+
+MAGIC = b"EYEOSLM1"
+VERSION = 1
+_FILE_HEADER = struct.Struct("<8sII d 8x")
+_CHUNK_MAGIC = b"CHNK"
+_CHUNK_HEADER = struct.Struct("<4sII 4x dd")
+
+
+def _pad8(n):
+    return (n + 7) & ~7
+
+
+@dataclass(frozen=True)
+class ActionRecord:
+    timestamp: float
+    source: str     # "mouth", "eyebrow", "lip", "lip_brow", "blink", ...
+    action: str     # what the controller returned, e.g. "LEFT CLICK", "SCROLL_UP"
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """One chunk of a recording; arrays are read-only views into the mmap."""
+
+    timestamps: np.ndarray      # (n,) float64
+    points: np.ndarray          # (n, landmarks, 3) float32
+    actions: List[ActionRecord]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+
+class SessionRecorder:
+    """
+    Appends timestamped landmark arrays and emitted actions to a chunked file.
+
+    Frames are buffered in a preallocated array and written one chunk at a
+    time, so the tracking loop only copies 478 x 3 floats per frame.
+
+    Use:
+        recorder = SessionRecorder("recordings/session.eyl")
+        recorder.add_frame(face.points, now)
+        recorder.add_action("mouth", "LEFT CLICK", now)
+        recorder.close()
+    """
+
+    def __init__(self, path, chunk_frames: int = 256, num_landmarks: int = NUM_LANDMARKS):
+        self.path = str(path)
+        self.chunk_frames = max(1, int(chunk_frames))
+        self.num_landmarks = int(num_landmarks)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._file = open(self.path, "wb")
+        self._file.write(_FILE_HEADER.pack(MAGIC, VERSION, self.num_landmarks, time.time()))
+
+        self._timestamps = np.empty(self.chunk_frames, dtype=np.float64)
+        self._points = np.empty((self.chunk_frames, self.num_landmarks, 3), dtype=np.float32)
+        self._actions: List[list] = []
+        self._count = 0
+
+        self.frames_written = 0
+        self.chunks_written = 0
+
+    def add_frame(self, points, timestamp: float) -> None:
+        if self._file is None:
+            raise ValueError("recorder is closed")
+        if len(points) != self.num_landmarks:
+            raise ValueError(f"expected {self.num_landmarks} landmarks, got {len(points)}")
+
+        self._timestamps[self._count] = timestamp
+        self._points[self._count] = points
+        self._count += 1
+        if self._count == self.chunk_frames:
+            self.flush()
+
+    def add_action(self, source: str, action: str, timestamp: float) -> None:
+        if self._file is None:
+            raise ValueError("recorder is closed")
+        self._actions.append([float(timestamp), str(source), str(action)])
+
+    def flush(self) -> None:
+        """Write buffered frames and actions as one chunk."""
+        if self._file is None or (self._count == 0 and not self._actions):
+            return
+
+        n = self._count
+        actions = json.dumps(self._actions, separators=(",", ":")).encode("utf-8")
+        t_first = float(self._timestamps[0]) if n else self._actions[0][0]
+        t_last = float(self._timestamps[n - 1]) if n else self._actions[-1][0]
+
+        self._file.write(_CHUNK_HEADER.pack(_CHUNK_MAGIC, n, len(actions), t_first, t_last))
+        self._file.write(self._timestamps[:n].tobytes())
+        self._file.write(self._points[:n].tobytes())
+        self._file.write(actions + b"\0" * (_pad8(len(actions)) - len(actions)))
+        self._file.flush()
+
+        self.frames_written += n
+        self.chunks_written += 1
+        self._count = 0
+        self._actions = []
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SessionReader:
+    """
+    Streams a recording through a read-only mmap.
+
+    Only the chunk headers are parsed up front; frame data is paged in by the
+    OS as it is touched, so hours of landmarks can be iterated in constant
+    memory.
+
+    Use:
+        with SessionReader(path) as rec:
+            for timestamp, points in rec:
+                ...
+            clicks = [a for a in rec.actions() if a.source == "mouth"]
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _FILE_HEADER.size:
+            self._file.close()
+            raise ValueError(f"{self.path}: not a landmark recording")
+
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.num_landmarks, self.created = _FILE_HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path}: not a landmark recording")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path}: unsupported recording version {version}")
+
+        # (offset, frames, action_len, t_first, t_last) per complete chunk
+        self._index: List[Tuple[int, int, int, float, float]] = []
+        frame_bytes = self.num_landmarks * 3 * 4 + 8
+        offset = _FILE_HEADER.size
+        while offset + _CHUNK_HEADER.size <= size:
+            magic, n, action_len, t_first, t_last = _CHUNK_HEADER.unpack_from(self._mm, offset)
+            end = offset + _CHUNK_HEADER.size + n * frame_bytes + _pad8(action_len)
+            if magic != _CHUNK_MAGIC or end > size:
+                break  # truncated tail (e.g. the app was killed mid-write)
+            self._index.append((offset, n, action_len, t_first, t_last))
+            offset = end
+
+    # ----------------- Metadata -----------------
+    def __len__(self):
+        return sum(entry[1] for entry in self._index)
+
+    @property
+    def num_chunks(self) -> int:
+        return len(self._index)
+
+    @property
+    def duration(self) -> float:
+        if not self._index:
+            return 0.0
+        return self._index[-1][4] - self._index[0][3]
+
+    # ----------------- Iteration -----------------
+    def chunk(self, i: int) -> Chunk:
+        offset, n, action_len, _, _ = self._index[i]
+        pos = offset + _CHUNK_HEADER.size
+        timestamps = np.frombuffer(self._mm, dtype=np.float64, count=n, offset=pos)
+        pos += n * 8
+        points = np.frombuffer(
+            self._mm, dtype=np.float32, count=n * self.num_landmarks * 3, offset=pos
+        ).reshape(n, self.num_landmarks, 3)
+        pos += points.nbytes
+
+        actions = []
+        if action_len:
+            raw = json.loads(bytes(self._mm[pos:pos + action_len]).decode("utf-8"))
+            actions = [ActionRecord(float(t), src, act) for t, src, act in raw]
+        return Chunk(timestamps, points, actions)
+
+    def chunks(self) -> Iterator[Chunk]:
+        for i in range(len(self._index)):
+            yield self.chunk(i)
+
+    def __iter__(self) -> Iterator[Tuple[float, np.ndarray]]:
+        """Yield (timestamp, (landmarks, 3) points view) per frame."""
+        for chunk in self.chunks():
+            for t, pts in zip(chunk.timestamps, chunk.points):
+                yield float(t), pts
+
+    def actions(self, source: Optional[str] = None) -> Iterator[ActionRecord]:
+        for i, entry in enumerate(self._index):
+            if entry[2] == 0:
+                continue
+            for action in self.chunk(i).actions:
+                if source is None or action.source == source:
+                    yield action
+
+    # ----------------- Lifecycle -----------------
+    def close(self) -> None:
+        mm, self._mm = getattr(self, "_mm", None), None
+        if mm is not None:
+            try:
+                mm.close()
+            except BufferError:
+                # numpy views handed out by chunk() still reference the map;
+                # it is released once they are garbage collected
+                pass
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def default_recording_path(directory: str = "recordings") -> str:
+    return os.path.join(directory, time.strftime("session-%Y%m%d-%H%M%S.eyl"))
@@ -0,0 +1,133 @@
+import threading
+import time
+import unittest
+
+from backend.services.actuation import ActuationWorker
+from backend.services.input_injection import RecordingBackend
+
+
+class SlowBackend(RecordingBackend):
+    def _double_click(self, button, interval, x, y):
+        time.sleep(interval)
+        super()._double_click(button, interval, x, y)
+
+
+class GatedBackend(RecordingBackend):
+    """Blocks every injection until the gate is opened."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def _move_to(self, x, y):
+        self.gate.wait()
+        super()._move_to(x, y)
+
+
+def run(worker):
+    worker.start()
+    flushed = worker.flush(timeout=1.0)
+    worker.stop()
+    return flushed
+
+
+class TestActuationWorker(unittest.TestCase):
+    def test_moves_are_coalesced_and_order_is_kept(self):
+        backend = RecordingBackend()
+        worker = ActuationWorker(backend)
+
+        # queue up before the thread runs so nothing is consumed yet
+        worker.move_to(1, 1)
+        worker.move_to(2, 2)
+        worker.move_to(3, 3)
+        worker.click("left")
+        worker.move_to(4, 4)
+        worker.move_to(5, 5)
+        worker.scroll(90)
+        self.assertTrue(run(worker))
+
+        self.assertEqual(backend.events, [
+            ("move_to", 3, 3),
+            ("click", "left"),
+            ("move_to", 5, 5),
+            ("scroll", 90),
+        ])
+        stats = worker.queue_stats()
+        self.assertEqual(stats["submitted"], 7)
+        self.assertEqual(stats["coalesced"], 3)
+        self.assertEqual(stats["injected"], 4)
+
+    def test_full_queue_keeps_the_move_before_a_click(self):
+        backend = RecordingBackend()
+        worker = ActuationWorker(backend, max_queue=3)
+        worker.move_to(1, 1)
+        worker.click("left")         # must land at (1, 1)
+        worker.drag_to(2, 2)
+        worker.move_to(3, 3)         # full: the drag after the click makes way
+        worker.click("right")        # full, only the move before it left: queued anyway
+        self.assertTrue(run(worker))
+
+        self.assertEqual(backend.events, [
+            ("move_to", 1, 1),
+            ("click", "left"),
+            ("move_to", 3, 3),
+            ("click", "right"),
+        ])
+        self.assertEqual(worker.queue_stats()["dropped"], 1)
+
+    def test_full_queue_drops_moves_never_clicks_or_buttons(self):
+        backend = RecordingBackend()
+        worker = ActuationWorker(backend, max_queue=3)
+        worker.mouse_down("left")
+        worker.move_to(1, 1)
+        worker.click("right")
+        worker.mouse_up("left")      # full, the move is needed by the click: still queued
+        worker.scroll(-1)
+        worker.move_to(2, 2)         # full of clicks: dropped, the next move carries the target
+        self.assertTrue(run(worker))
+
+        self.assertEqual(backend.events, [
+            ("mouse_down", "left"),
+            ("move_to", 1, 1),
+            ("click", "right"),
+            ("mouse_up", "left"),
+            ("scroll", -1),
+        ])
+        self.assertEqual(worker.queue_stats()["dropped"], 1)
+
+    def test_double_click_does_not_block_caller(self):
+        backend = SlowBackend()
+        worker = ActuationWorker(backend)
+        worker.start()
+
+        t0 = time.perf_counter()
+        worker.double_click("left", 0.2)
+        self.assertLess(time.perf_counter() - t0, 0.1)
+
+        self.assertTrue(worker.flush(timeout=1.0))
+        worker.stop()
+        self.assertEqual(backend.events, [("double_click", "left")])
+
+    def test_flush_waits_for_the_event_in_flight_and_stop_drains(self):
+        backend = GatedBackend()
+        worker = ActuationWorker(backend)
+        worker.start()
+        worker.move_to(1, 1)
+        worker.click()
+        self.assertFalse(worker.flush(timeout=0.05))    # the move is still being injected
+
+        backend.gate.set()
+        self.assertTrue(worker.flush(timeout=1.0))
+        self.assertEqual(worker.queue_stats()["pending"], 0)
+
+        backend.gate.clear()
+        worker.move_to(2, 2)
+        worker.scroll(1)
+        threading.Timer(0.05, backend.gate.set).start()
+        worker.stop(timeout=1.0)                        # injects what is queued, then exits
+        self.assertEqual(backend.events[-2:], [("move_to", 2, 2), ("scroll", 1)])
+        self.assertIsNone(worker._thread)
+
+
+if __name__ == '__main__':
+    unittest.main()
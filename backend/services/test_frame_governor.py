@@ -0,0 +1,81 @@
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from backend.services.frame_governor import ABSENT, ACTIVE, STILL, FrameRateGovernor
+
+
+def face(offset=0.0):
+    points = np.full((478, 3), 0.5, np.float32)
+    points[:, 0] += offset
+    return SimpleNamespace(points=points)
+
+
+class TestFrameRateGovernor(unittest.TestCase):
+    def setUp(self):
+        self.governor = FrameRateGovernor(absent_fps=2.0, still_fps=10.0, absent_after=1.0, still_after=1.0,
+                                          verbose=False)
+        self.empty = np.zeros((48, 64, 3), np.uint8)
+
+    def run_frames(self, start, count, landmarks=None, frame=None, fps=30.0):
+        """Feed count frames; returns the capture times that were processed."""
+        processed = []
+        for i in range(count):
+            now = start + i / fps
+            if self.governor.should_process(self.empty if frame is None else frame, now):
+                processed.append(now)
+                self.governor.update(landmarks, now, inference_ms=20.0)
+        return processed
+
+    def test_absent_face_probes_then_snaps_back(self):
+        self.assertEqual(len(self.run_frames(0.0, 30)), 30)     # 1 s grace at full rate
+        self.assertEqual(self.governor.mode, ACTIVE)
+
+        probes = self.run_frames(1.0, 90)                       # 3 s more of an empty room
+        self.assertEqual(probes, [1.0, 1.5, 2.0, 2.5, 3.0, 3.5])  # 2 fps probes
+        self.assertEqual(self.governor.mode, ABSENT)
+        self.assertGreaterEqual(self.governor.skipped, 80)
+
+        person = self.empty.copy()
+        person[8:40, 16:48] = 200
+        self.assertTrue(self.governor.should_process(person, 3.7))    # first changed frame, not a probe
+        self.assertEqual(self.governor.update(face(), 3.7), ACTIVE)
+        self.assertEqual(self.governor.wakeups, 1)
+
+    def test_stationary_face_steps_down_and_motion_restores(self):
+        self.run_frames(0.0, 60, landmarks=face())
+        self.assertEqual(self.governor.mode, STILL)
+        self.assertEqual(len(self.run_frames(2.0, 30, landmarks=face())), 10)
+
+        self.run_frames(3.0, 3, landmarks=face(0.01))           # the next processed frame moved
+        self.assertEqual(self.governor.mode, ACTIVE)
+        self.assertEqual(len(self.run_frames(3.1, 10, landmarks=face(0.02))), 10)
+
+    def test_keep_active_sees_every_frame_of_a_blink(self):
+        self.governor.keep_active = True
+        self.assertEqual(len(self.run_frames(0.0, 90, landmarks=face())), 90)
+        self.assertEqual(self.governor.mode, ACTIVE)
+
+        self.governor.keep_active = False
+        self.run_frames(3.0, 60, landmarks=face())
+        self.assertEqual(self.governor.mode, STILL)
+
+        # Gesture switched on while STILL: a 100 ms blink (3 frames) is not skipped
+        self.governor.keep_active = True
+        self.assertEqual(len(self.run_frames(5.0, 3, landmarks=face())), 3)
+        self.assertEqual(self.governor.mode, ACTIVE)
+
+    def test_report_estimates_savings(self):
+        self.run_frames(0.0, 120)
+        report = self.governor.report(now=4.0)
+        self.assertEqual(report["frames"], 120)
+        self.assertEqual(report["processed"] + report["skipped"], 120)
+        self.assertAlmostEqual(report["mean_inference_ms"], 20.0)
+        self.assertAlmostEqual(report["cpu_saved_sec"], report["skipped"] * 0.02)
+        self.assertAlmostEqual(report["time_sec"][ACTIVE] + report["time_sec"][ABSENT], 4.0)
+        self.assertIn("frames skipped", self.governor.summary(now=4.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import threading
+import time
+import unittest
+
+from backend.services.frame_source import LatestFrameSource, next_frame
+
+
+class FakeCapture:
+    """Stands in for cv2.VideoCapture, producing numbered frames."""
+
+    def __init__(self, n_frames=5, delay=0.0):
+        self.n_frames = n_frames
+        self.delay = delay
+        self.count = 0
+        self.released = False
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def isOpened(self):
+        return not self.released
+
+    def set(self, prop, value):
+        return True
+
+    def read(self):
+        self.gate.wait()
+        if self.delay:
+            time.sleep(self.delay)
+        if self.count >= self.n_frames:
+            return False, None
+        self.count += 1
+        return True, self.count
+
+    def release(self):
+        self.released = True
+
+
+class TestLatestFrameSource(unittest.TestCase):
+    def test_reads_frames_in_order_when_consumer_keeps_up(self):
+        fake = FakeCapture(n_frames=3, delay=0.02)
+        source = LatestFrameSource(0, capture_factory=lambda _: fake)
+
+        frames = []
+        while True:
+            ret, frame = source.read(timeout=1.0)
+            if not ret:
+                break
+            frames.append(frame)
+
+        self.assertEqual(frames, [1, 2, 3])
+        self.assertTrue(source.ended)
+        self.assertEqual(source.dropped_frames, 0)
+        source.release()
+        self.assertTrue(fake.released)
+
+    def test_slow_consumer_gets_latest_frame_and_drops_are_counted(self):
+        fake = FakeCapture(n_frames=10)
+        source = LatestFrameSource(0, capture_factory=lambda _: fake)
+
+        # let the capture thread run to the end without reading anything
+        deadline = time.time() + 2.0
+        while not source.ended and time.time() < deadline:
+            time.sleep(0.01)
+
+        ret, frame = source.read(timeout=0.1)
+        self.assertTrue(ret)
+        self.assertEqual(frame, 10)
+        self.assertEqual(source.dropped_frames, 9)
+        self.assertEqual(source.stats(), {"captured": 10, "delivered": 1, "dropped": 9})
+
+        ret, frame = source.read(timeout=0.1)
+        self.assertFalse(ret)
+        source.release()
+
+    def test_read_times_out_without_new_frame(self):
+        fake = FakeCapture(n_frames=10)
+        fake.gate.clear()
+        source = LatestFrameSource(0, capture_factory=lambda _: fake)
+
+        ret, frame = source.read(timeout=0.05)
+        self.assertFalse(ret)
+        self.assertIsNone(frame)
+        self.assertFalse(source.ended)
+
+        fake.gate.set()
+        source.release()
+
+    def test_unopened_camera_does_not_start(self):
+        fake = FakeCapture()
+        fake.released = True
+        source = LatestFrameSource(0, capture_factory=lambda _: fake)
+        self.assertFalse(source.isOpened())
+
+        t0 = time.monotonic()
+        self.assertEqual(next_frame(source, idle=0.02), (False, None))
+        self.assertGreaterEqual(time.monotonic() - t0, 0.02)     # waits instead of spinning
+
+    def test_tracking_loop_exits_when_the_source_ends(self):
+        fake = FakeCapture(n_frames=3, delay=0.01)
+        source = LatestFrameSource(0, capture_factory=lambda _: fake)
+
+        frames, reads = [], 0
+        while reads < 1000:
+            reads += 1
+            try:
+                ret, frame = next_frame(source)
+            except EOFError:
+                break
+            if ret:
+                frames.append(frame)
+
+        self.assertLess(reads, 1000)
+        self.assertEqual(frames, [1, 2, 3])
+        self.assertTrue(source.isOpened())      # opened, and ended
+        source.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
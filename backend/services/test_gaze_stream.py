@@ -0,0 +1,116 @@
+import os
+import struct
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from backend.services.gaze_stream import GazeFrame, GazeStreamClient, GazeStreamServer, GestureEvent
+from backend.services.landmark_backends import SCHEME_MEDIAPIPE_478, FaceLandmarks
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.005)
+
+
+class TestGazeStream(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "gaze.sock")
+        self.server = GazeStreamServer(self.path, screen=(1920, 1080), max_queue=4)
+        self.server.start()
+        points = np.random.default_rng(0).random((478, 3)).astype(np.float32)
+        iris = np.array([[0.4, 0.3], [0.6, 0.5]], np.float32)
+        self.face = FaceLandmarks(points, SCHEME_MEDIAPIPE_478, iris, 50.0)
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def test_frames_and_events_round_trip(self):
+        with GazeStreamClient(self.path, timeout=2.0) as client:
+            self.assertEqual(client.hello["screen"], [1920, 1080])
+            wait_for(lambda: self.server.clients == 1)
+
+            self.server.publish_frame(10.0, self.face, (960, 432))
+            self.server.publish_event("mouth", "LEFT CLICK", 50.0)
+            self.server.publish_frame(10.1)
+
+            frame = client.read()
+            self.assertIsInstance(frame, GazeFrame)
+            self.assertEqual((frame.seq, frame.captured_at, frame.timestamp), (1, 10.0, 50.0))
+            self.assertEqual(frame.scheme, SCHEME_MEDIAPIPE_478)
+            np.testing.assert_allclose(frame.gaze, (0.5, 0.4))
+            self.assertEqual(frame.screen, (960, 432))
+            np.testing.assert_array_equal(frame.points, self.face.points)
+
+            event = client.read()
+            self.assertEqual(event, GestureEvent(1, 10.0, 50.0, 0, "mouth", "LEFT CLICK"))
+
+            empty = client.read()
+            self.assertEqual((empty.seq, empty.face, empty.gaze, empty.points), (2, False, None, None))
+
+        self.server.stop()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_messages_are_padded_to_8_bytes(self):
+        with GazeStreamClient(self.path, timeout=2.0) as client:
+            wait_for(lambda: self.server.clients == 1)
+            self.server.publish_event("mouth", "LEFT CLICK", 50.0)
+            self.server.publish_frame(10.0, self.face, (960, 432))
+            raw = client._file.read(32)
+            self.assertEqual(struct.unpack_from("<I", raw, 4)[0], len("mouthLEFT CLICK"))
+            self.assertEqual(client._file.read(16), b"mouthLEFT CLICK\0")
+            self.assertEqual(client.read().captured_at, 10.0)   # next header right after the padding
+
+    def test_slow_reader_drops_oldest_frames_but_keeps_events(self):
+        client = GazeStreamClient(self.path, timeout=2.0)
+        wait_for(lambda: self.server.clients == 1)
+        sender = self.server._clients[0]
+        sender.cond.acquire()       # stall the sender thread so the queue fills up
+        try:
+            self.server.publish_event("blink", "LEFT CLICK", 1.0)
+            for i in range(10):
+                self.server.publish_frame(float(i), self.face)
+        finally:
+            sender.cond.release()
+
+        received = [client.read() for _ in range(4)]
+        self.assertIsInstance(received[0], GestureEvent)
+        self.assertEqual(received[0].dropped, 7)
+        self.assertEqual([m.captured_at for m in received[1:]], [7.0, 8.0, 9.0])
+        self.assertEqual(self.server.stats()["dropped"], 7)
+        client.close()
+
+    def test_live_socket_is_not_taken_over(self):
+        with self.assertRaises(RuntimeError):
+            GazeStreamServer(self.path).start()
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_disconnected_reader_is_removed(self):
+        client = GazeStreamClient(self.path)
+        wait_for(lambda: self.server.clients == 1)
+        client.close()
+        for _ in range(200):
+            self.server.publish_frame(0.0, self.face)
+        wait_for(lambda: self.server.clients == 0)
+
+    def test_client_close_is_idempotent(self):
+        with GazeStreamClient(self.path, timeout=2.0):
+            wait_for(lambda: self.server.clients == 1)
+            client = self.server._clients[0]
+            client.sock = mock.Mock(wraps=client.sock)
+            client.close()
+            self.server.stop()      # closes every client again
+            client.sock.shutdown.assert_called_once()
+            client.sock.close.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import math
+import unittest
+
+import numpy as np
+
+from backend.services.head_pose import HeadPoseEstimator
+from backend.services.landmark_frame import LandmarkFrame
+
+
+def rotation(yaw, pitch, roll):
+    """Column-vector Z-Y-X rotation matrix from degrees."""
+    y, p, r = (math.radians(a) for a in (yaw, pitch, roll))
+    Rz = np.array([[math.cos(r), -math.sin(r), 0], [math.sin(r), math.cos(r), 0], [0, 0, 1]])
+    Ry = np.array([[math.cos(y), 0, math.sin(y)], [0, 1, 0], [-math.sin(y), 0, math.cos(y)]])
+    Rx = np.array([[1, 0, 0], [0, math.cos(p), -math.sin(p)], [0, math.sin(p), math.cos(p)]])
+    return Rz @ Ry @ Rx
+
+
+class TestHeadPoseEstimator(unittest.TestCase):
+    def setUp(self):
+        self.ref = np.random.default_rng(0).uniform(0.2, 0.8, size=(478, 3)).astype(np.float32)
+
+    def test_first_frame_is_the_reference(self):
+        pose = HeadPoseEstimator().estimate(self.ref)
+        np.testing.assert_allclose(pose.rotation, np.eye(3), atol=1e-5)
+        np.testing.assert_allclose(pose.align(self.ref), self.ref, atol=1e-5)
+
+    def test_recovers_rigid_head_motion(self):
+        est = HeadPoseEstimator()
+        est.estimate(self.ref)
+
+        moved = (self.ref @ rotation(12, -4, 6).T + [0.05, -0.02, 0.1]).astype(np.float32)
+        pose = est.estimate(moved)
+
+        # `rotation` undoes the head motion for row vectors, so as a
+        # column-vector matrix it is the head motion itself
+        np.testing.assert_allclose(pose.rotation, rotation(12, -4, 6), atol=1e-5)
+        np.testing.assert_allclose(pose.align(moved), self.ref, atol=1e-5)
+
+    def test_frames_share_one_estimate(self):
+        est = HeadPoseEstimator()
+        frame = LandmarkFrame(self.ref, 1.0, pose_estimator=est)
+        pose = frame.pose
+        self.assertIs(frame.pose, pose)
+        self.assertIsNotNone(frame.features)
+        self.assertIs(frame.pose, pose)
+
+
+if __name__ == '__main__':
+    unittest.main()
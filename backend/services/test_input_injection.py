@@ -0,0 +1,71 @@
+import unittest
+from types import SimpleNamespace
+
+from backend.services import input_injection
+from backend.services.input_injection import RecordingBackend
+from backend.services.mouth_click import MouthClicker
+
+
+def mouth_landmarks(open_amount):
+    """478 dummy points with the mouth opened by open_amount (mouth width 0.1)."""
+    lms = [SimpleNamespace(x=0.5, y=0.5, z=0.0) for _ in range(478)]
+    lms[61] = SimpleNamespace(x=0.45, y=0.7, z=0.0)
+    lms[291] = SimpleNamespace(x=0.55, y=0.7, z=0.0)
+    lms[13] = SimpleNamespace(x=0.5, y=0.7, z=0.0)
+    lms[14] = SimpleNamespace(x=0.5, y=0.7 + open_amount, z=0.0)
+    return lms
+
+
+class TestRecordingBackend(unittest.TestCase):
+    def test_records_events_and_tracks_cursor(self):
+        backend = RecordingBackend(screen_size=(800, 600))
+        backend.move_to(10.7, 20)
+        backend.click("right")
+        backend.double_click("left", 0.1)
+        backend.scroll(-90)
+        backend.mouse_down("left", 1, 2)
+        backend.mouse_up("left")
+
+        self.assertEqual(backend.size(), (800, 600))
+        self.assertEqual(backend.position(), (10, 20))
+        self.assertEqual(backend.events, [
+            ("move_to", 10, 20),
+            ("click", "right"),
+            ("double_click", "left"),
+            ("scroll", -90),
+            ("mouse_down", "left"),
+            ("mouse_up", "left"),
+        ])
+
+    def test_latency_counters(self):
+        backend = RecordingBackend()
+        for _ in range(3):
+            backend.move_to(1, 1)
+        backend.click()
+
+        stats = backend.stats()
+        self.assertEqual(stats["move_to"]["count"], 3)
+        self.assertEqual(stats["click"]["count"], 1)
+        self.assertGreaterEqual(stats["move_to"]["max_ms"], stats["move_to"]["mean_ms"])
+
+        backend.reset_stats()
+        self.assertEqual(backend.stats(), {})
+
+    def test_unknown_backend_name(self):
+        with self.assertRaises(ValueError):
+            input_injection.create_backend("carrier-pigeon")
+
+
+class TestControllerInjection(unittest.TestCase):
+    def test_mouth_clicker_clicks_through_injector(self):
+        backend = RecordingBackend()
+        clicker = MouthClicker(injector=backend)
+
+        self.assertIsNone(clicker.update(mouth_landmarks(0.0), now=1.0))
+        self.assertIsNone(clicker.update(mouth_landmarks(0.05), now=1.1))
+        self.assertEqual(clicker.update(mouth_landmarks(0.0), now=1.2), "LEFT CLICK")
+        self.assertEqual(backend.events, [("click", "left")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import io
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import numpy as np
+
+from backend.services import landmark_backends
+from backend.services.landmark_backends import (
+    SCHEME_DLIB_68,
+    SCHEME_MEDIAPIPE_478,
+    FaceLandmarks,
+    LandmarkBackend,
+    benchmark_backends,
+    pick_fastest,
+)
+from backend.services.landmark_frame import NUM_LANDMARKS
+
+
+def fake_backend(delay, found=True, scheme=SCHEME_MEDIAPIPE_478):
+    class Fake(LandmarkBackend):
+        name = "fake"
+
+        def process(self, frame, timestamp=None):
+            time.sleep(delay)
+            if not found:
+                return None
+            points = np.zeros((NUM_LANDMARKS if scheme == SCHEME_MEDIAPIPE_478 else 68, 3), np.float32)
+            iris = np.array([[0.4, 0.5], [0.6, 0.5]], np.float32)
+            return FaceLandmarks(points, scheme, iris, 1.0)
+
+    Fake.scheme = scheme
+    return Fake
+
+
+class Broken(LandmarkBackend):
+    def __init__(self):
+        raise ImportError("engine not installed")
+
+
+class TestLandmarkBackends(unittest.TestCase):
+    def test_face_landmarks_normalized_output(self):
+        face = fake_backend(0)().process(None)
+        self.assertEqual(face.gaze, (0.5, 0.5))
+        frame = face.landmark_frame()
+        self.assertEqual(len(frame), NUM_LANDMARKS)
+        self.assertEqual(frame.timestamp, 1.0)
+
+        dlib_face = fake_backend(0, scheme=SCHEME_DLIB_68)().process(None)
+        self.assertEqual(dlib_face.gaze, (0.5, 0.5))
+        self.assertIsNone(dlib_face.landmark_frame())   # no FaceMesh layout for the gestures
+        self.assertIsNone(FaceLandmarks(dlib_face.points, SCHEME_DLIB_68, None, 0.0).gaze)
+
+    def test_auto_benchmark_picks_fastest_engine_that_finds_faces(self):
+        frames = [np.zeros((4, 4, 3), np.uint8)] * 8
+        factories = {
+            "slow": fake_backend(0.004),
+            "fast": fake_backend(0.0005),
+            "blind": fake_backend(0.0, found=False),    # fastest, but never finds the face
+            "missing": Broken,
+        }
+        scores = benchmark_backends(frames, factories, warmup=2, factories=factories)
+        by_name = {s.name: s for s in scores}
+
+        self.assertIn("ImportError", by_name["missing"].error)
+        self.assertEqual(by_name["blind"].detect_rate, 0.0)
+        self.assertEqual(by_name["fast"].detect_rate, 1.0)
+        self.assertGreater(by_name["fast"].fps, by_name["slow"].fps)
+        self.assertEqual(pick_fastest(scores), "fast")
+
+        # No face anywhere: first engine that loaded
+        self.assertEqual(pick_fastest([s for s in scores if s.name in ("missing", "blind")]), "blind")
+        self.assertIsNone(pick_fastest([by_name["missing"]]))
+
+    def test_auto_keeps_the_facemesh_layout_when_asked(self):
+        frames = [np.zeros((4, 4, 3), np.uint8)] * 4
+        factories = {
+            "mediapipe": fake_backend(0.002),
+            "dlib": fake_backend(0.0, scheme=SCHEME_DLIB_68),   # faster, but no gestures
+        }
+        with mock.patch.dict(landmark_backends._BACKENDS, factories), redirect_stdout(io.StringIO()):
+            self.assertEqual(landmark_backends.create_backend("auto", frames).scheme, SCHEME_DLIB_68)
+            backend = landmark_backends.create_backend("auto", frames, (SCHEME_MEDIAPIPE_478,))
+        self.assertEqual(backend.scheme, SCHEME_MEDIAPIPE_478)
+
+    def test_preload_only_the_engines_that_may_be_built(self):
+        factories = {"mediapipe": fake_backend(0), "dlib": fake_backend(0, scheme=SCHEME_DLIB_68)}
+        with mock.patch.dict(landmark_backends._BACKENDS, factories), \
+                mock.patch.object(factories["dlib"], "preload") as preload_dlib:
+            landmark_backends.preload_backends("auto", (SCHEME_MEDIAPIPE_478,))
+            landmark_backends.preload_backends("mediapipe")
+            preload_dlib.assert_not_called()
+            landmark_backends.preload_backends("auto")
+            landmark_backends.preload_backends("dlib")
+        self.assertEqual(preload_dlib.call_count, 2)
+
+    def test_unknown_backend_name(self):
+        with self.assertRaises(ValueError):
+            landmark_backends.create_backend("openface")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import math
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from backend.services.face_features import LEFT_EYE, RIGHT_EYE
+from backend.services.landmark_frame import LandmarkFrame, as_landmark_frame, eye_aspect_ratio
+
+
+def random_landmarks(seed=0):
+    rng = np.random.default_rng(seed)
+    pts = rng.uniform(0.2, 0.8, size=(478, 3))
+    return [SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in pts]
+
+
+def reference_ear(landmarks, indices):
+    """The attribute-by-attribute EAR main.py used to compute."""
+    def euclidean(p1, p2):
+        return math.hypot(p1.x - p2.x, p1.y - p2.y)
+
+    p1, p2, p3, p4, p5, p6 = [landmarks[i] for i in indices]
+    return (euclidean(p2, p6) + euclidean(p3, p5)) / (2.0 * euclidean(p1, p4))
+
+
+class TestLandmarkFrame(unittest.TestCase):
+    def test_from_mediapipe_builds_contiguous_float32_array(self):
+        lms = random_landmarks()
+        face = LandmarkFrame.from_mediapipe(SimpleNamespace(landmark=lms), timestamp=12.5)
+
+        self.assertEqual(face.points.shape, (478, 3))
+        self.assertEqual(face.points.dtype, np.float32)
+        self.assertTrue(face.points.flags["C_CONTIGUOUS"])
+        self.assertEqual(face.timestamp, 12.5)
+        self.assertAlmostEqual(float(face[100, 1]), lms[100].y, places=6)
+
+    def test_as_landmark_frame_passes_frames_through(self):
+        face = LandmarkFrame(np.zeros((478, 3), np.float32), 1.0)
+        self.assertIs(as_landmark_frame(face), face)
+        self.assertEqual(as_landmark_frame(random_landmarks(), 3.0).timestamp, 3.0)
+
+    def test_eye_aspect_ratio_matches_reference(self):
+        lms = random_landmarks(1)
+        pts = LandmarkFrame.from_mediapipe(lms).points
+        for eye in (LEFT_EYE, RIGHT_EYE):
+            self.assertAlmostEqual(eye_aspect_ratio(pts, eye), reference_ear(lms, eye), places=5)
+
+    def test_features_match_reference_formulas(self):
+        lms = random_landmarks(2)
+        features = LandmarkFrame.from_mediapipe(lms).features
+
+        mouth_w = abs(lms[291].x - lms[61].x)
+        self.assertAlmostEqual(features.mouth_open_ratio, abs(lms[14].y - lms[13].y) / (mouth_w + 1e-6), places=4)
+        self.assertAlmostEqual(features.pucker, mouth_w / (abs(lms[263].x - lms[33].x) + 1e-6), places=4)
+        self.assertAlmostEqual(features.ear_left, reference_ear(lms, LEFT_EYE), places=5)
+        self.assertAlmostEqual(features.ear_right, reference_ear(lms, RIGHT_EYE), places=5)
+        self.assertAlmostEqual(features.gaze_x, (lms[473].x + lms[468].x) / 2, places=6)
+
+        def eye_pos(iris, up, lo):
+            p = (lms[iris].y - lms[up].y) / (lms[lo].y - lms[up].y)
+            return min(max(p, 0.0), 1.0)
+
+        gaze_vertical = 0.5 * (eye_pos(473, 159, 145) + eye_pos(468, 386, 374))
+        self.assertAlmostEqual(features.gaze_vertical, gaze_vertical, places=5)
+
+    def test_brow_feature_matches_similarity_transform(self):
+        lms = random_landmarks(3)
+
+        def pt(i):
+            return np.array([lms[i].x, lms[i].y])
+
+        L, R = pt(33), pt(362)
+        v = R - L
+        dist = np.linalg.norm(v)
+        c, s = v / dist
+        A = np.array([[c, s], [-s, c]]) / dist
+        t = -A @ ((L + R) / 2)
+
+        def y(i):
+            return (A @ pt(i) + t)[1]
+
+        expected = ((y(159) - y(105)) + (y(386) - y(334))) / 2
+        got = LandmarkFrame.from_mediapipe(lms).features.brow_lid
+        self.assertAlmostEqual(got, expected, places=5)
+
+    def test_features_are_computed_once_per_frame(self):
+        face = LandmarkFrame.from_mediapipe(random_landmarks(4))
+        features = face.compute_features()
+        self.assertIs(face.features, features)
+        self.assertIs(face.compute_features(), features)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import csv
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from backend.services import latency
+from backend.services.actuation import ActuationWorker
+from backend.services.input_injection import RecordingBackend
+from backend.services.latency import LatencyMonitor, NullLatencyMonitor
+
+
+class TestLatencyMonitor(unittest.TestCase):
+    def test_percentiles_over_rolling_window(self):
+        mon = LatencyMonitor(window=100)
+        for ms in range(200):
+            mon.record("face_mesh", float(ms))
+
+        s = mon.snapshot()["face_mesh"]
+        self.assertEqual(s["count"], 100)      # only the newest 100 samples
+        self.assertEqual(s["max"], 199.0)
+        self.assertAlmostEqual(s["p50"], 149.5)
+        self.assertAlmostEqual(s["p99"], 198.01)
+
+    def test_laps_split_a_frame_into_stages(self):
+        mon = LatencyMonitor()
+        mon.frame_start()
+        time.sleep(0.01)
+        mon.lap(latency.PREPROCESS)
+        mon.lap(latency.FACE_MESH)
+        mon.frame_end()
+
+        snap = mon.snapshot()
+        self.assertEqual(list(snap), [latency.PREPROCESS, latency.FACE_MESH, latency.FRAME])
+        self.assertGreaterEqual(snap[latency.PREPROCESS]["p50"], 9.0)
+        self.assertLess(snap[latency.FACE_MESH]["p50"], 5.0)
+        self.assertGreaterEqual(snap[latency.FRAME]["p50"], snap[latency.PREPROCESS]["p50"])
+
+    def test_null_monitor_records_nothing(self):
+        mon = NullLatencyMonitor()
+        mon.frame_start()
+        mon.lap(latency.FACE_MESH)
+        mon.record(latency.INJECT, 1.0)
+        mon.frame_end()
+        self.assertEqual(mon.snapshot(), {})
+        self.assertIsInstance(latency.get_monitor(), NullLatencyMonitor)
+
+    def test_dump_json_and_csv(self):
+        mon = LatencyMonitor()
+        mon.record(latency.FACE_MESH, 12.0)
+        with tempfile.TemporaryDirectory() as tmp:
+            mon.dump(os.path.join(tmp, "lat.json"))
+            mon.dump(os.path.join(tmp, "lat.csv"))
+            with open(os.path.join(tmp, "lat.json")) as f:
+                self.assertEqual(json.load(f)["stages"]["face_mesh"]["p95"], 12.0)
+            with open(os.path.join(tmp, "lat.csv")) as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(rows[0]["stage"], "face_mesh")
+
+    def test_actuation_records_frame_to_cursor(self):
+        mon = LatencyMonitor()
+        worker = ActuationWorker(RecordingBackend(), latency=mon)
+        worker.start()
+        worker.move_to_from(5, 6, time.monotonic() - 0.02)
+        worker.click("left")
+        self.assertTrue(worker.flush(timeout=1.0))
+        worker.stop()
+
+        snap = mon.snapshot()
+        self.assertEqual(snap[latency.INJECT]["count"], 2)
+        self.assertEqual(snap[latency.FRAME_TO_CURSOR]["count"], 1)
+        self.assertGreaterEqual(snap[latency.FRAME_TO_CURSOR]["p50"], 20.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
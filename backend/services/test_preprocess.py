@@ -0,0 +1,127 @@
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from backend.services.face_features import LEFT_EYE, RIGHT_EYE
+from backend.services.landmark_frame import eye_aspect_ratio
+from backend.services.preprocess import (
+    DLIB_68_MIRROR_INDEX,
+    MIRROR_INDEX,
+    FaceROI,
+    FramePreprocessor,
+    mirror_points,
+)
+
+
+class FakeFaceMesh:
+    def __init__(self, points):
+        self.points = points
+        self.inputs = []
+
+    def process(self, rgb):
+        self.inputs.append(rgb)
+        lms = [SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in self.points]
+        return SimpleNamespace(multi_face_landmarks=[SimpleNamespace(landmark=lms)])
+
+
+class TestMirror(unittest.TestCase):
+    def test_mirror_maps_are_symmetric(self):
+        for index in (MIRROR_INDEX, DLIB_68_MIRROR_INDEX):
+            np.testing.assert_array_equal(index[index], np.arange(len(index)))
+        self.assertEqual(int((MIRROR_INDEX == np.arange(478)).sum()), 28)    # midline
+        for a, b in ((33, 263), (133, 362), (61, 291), (105, 334), (159, 386), (145, 374), (468, 473)):
+            self.assertEqual(MIRROR_INDEX[a], b)
+        self.assertEqual(MIRROR_INDEX[1], 1)        # nose tip
+        self.assertLess(MIRROR_INDEX[:468].max(), 468)
+
+    def test_mirrored_eyes_swap_sides(self):
+        rng = np.random.default_rng(0)
+        points = rng.random((478, 3)).astype(np.float32)
+        mirrored = mirror_points(points)
+
+        np.testing.assert_allclose(mirrored[263, 0], 1.0 - points[33, 0])
+        self.assertAlmostEqual(eye_aspect_ratio(mirrored, LEFT_EYE), eye_aspect_ratio(points, RIGHT_EYE), places=5)
+        np.testing.assert_allclose(mirror_points(mirrored), points, atol=1e-6)
+        self.assertEqual(mirror_points(points[:468]).shape, (468, 3))
+
+
+class TestFramePreprocessor(unittest.TestCase):
+    def test_rgb_buffer_is_reused_and_read_only(self):
+        prep = FramePreprocessor()
+        frame = np.zeros((4, 6, 3), np.uint8)
+        frame[..., 0] = 255     # blue
+
+        rgb = prep.rgb(frame)
+        self.assertFalse(rgb.flags.writeable)
+        self.assertEqual(rgb[0, 0].tolist(), [0, 0, 255])
+        self.assertIs(prep.rgb(frame), rgb)
+        self.assertEqual(frame[0, 0].tolist(), [255, 0, 0])     # input untouched, never flipped
+
+    def test_process_mirrors_landmarks_not_pixels(self):
+        points = np.full((478, 3), 0.5, np.float32)
+        points[33, :2] = [0.2, 0.4]
+        mesh = FakeFaceMesh(points)
+
+        face = FramePreprocessor().process(mesh, np.zeros((4, 6, 3), np.uint8), timestamp=3.0)
+        self.assertEqual(face.timestamp, 3.0)
+        np.testing.assert_allclose(face.points[263, :2], [0.8, 0.4])
+
+        plain = FramePreprocessor(mirror=False).process(mesh, np.zeros((4, 6, 3), np.uint8))
+        np.testing.assert_allclose(plain.points[33, :2], [0.2, 0.4])
+
+
+class TestFaceROI(unittest.TestCase):
+    def face_points(self, x0, y0, x1, y1, shape=(1080, 1920)):
+        """Landmarks spanning the pixel box (x0, y0)-(x1, y1), normalized."""
+        points = np.zeros((478, 3), np.float32)
+        points[0, :2] = [x0 / shape[1], y0 / shape[0]]
+        points[1:, :2] = [x1 / shape[1], y1 / shape[0]]
+        return points
+
+    def test_box_follows_the_face_and_falls_back(self):
+        roi = FaceROI(padding=0.5)
+        frame = np.zeros((1080, 1920, 3), np.uint8)
+        self.assertIs(roi.crop(frame)[0], frame)
+
+        roi.update(self.face_points(800, 400, 1000, 600), frame.shape)
+        self.assertEqual(roi.box, (700, 300, 400))
+        roi.update(self.face_points(810, 400, 1020, 610), frame.shape)     # same scale: size kept
+        self.assertEqual(roi.box[2], 400)
+        roi.update(self.face_points(0, 0, 200, 200), frame.shape)           # shifted inside
+        self.assertEqual(roi.box[:2], (0, 0))
+
+        roi.update(None, frame.shape)
+        self.assertIsNone(roi.box)
+        roi.update(self.face_points(500, 100, 1300, 900), frame.shape)      # fills the frame
+        self.assertIsNone(roi.box)
+
+    def test_crop_landmarks_map_back_to_the_frame(self):
+        roi = FaceROI(max_size=128)
+        frame = np.zeros((1080, 1920, 3), np.uint8)
+        roi.box = (700, 300, 400)
+        crop, box = roi.crop(frame)
+        self.assertEqual(crop.shape, (100, 100, 3))          # 400 / 4
+
+        points = np.array([[0.5, 0.25, 0.1]], np.float32)
+        FaceROI.to_frame(points, box, frame.shape)
+        np.testing.assert_allclose(points, [[900 / 1920, 400 / 1080, 0.1 * 400 / 1920]])
+
+    def test_preprocessor_crops_after_the_first_face(self):
+        points = self.face_points(800, 400, 1000, 600)
+        mesh = FakeFaceMesh(points)
+        prep = FramePreprocessor(mirror=False, roi=FaceROI(padding=0.5))
+        frame = np.zeros((1080, 1920, 3), np.uint8)
+
+        prep.process(mesh, frame)
+        self.assertIsNone(prep.box)
+        self.assertEqual(mesh.inputs[-1].shape, (1080, 1920, 3))
+
+        mesh.points = np.array([[0.25, 0.25, 0.0]] * 478, np.float32)     # in crop coordinates
+        face = prep.process(mesh, frame)
+        self.assertEqual(mesh.inputs[-1].shape, (400, 400, 3))
+        np.testing.assert_allclose(face.points[0, :2], [800 / 1920, 400 / 1080])
+
+
+if __name__ == '__main__':
+    unittest.main()
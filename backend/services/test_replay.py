@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from backend.services.blink_click import BlinkClicker
+from backend.services.face_features import LEFT_EYE
+from backend.services.input_injection import RecordingBackend
+from backend.services.replay import ReplayEngine, compare_actions
+from backend.services.session_recording import ActionRecord, SessionRecorder
+
+
+def face_points(mouth_open=0.0, left_eye_open=0.03):
+    """A neutral synthetic face: eyes 0.1 wide, mouth 0.1 wide."""
+    pts = np.full((478, 3), 0.5, dtype=np.float32)
+    pts[[61, 291, 13, 14], :2] = [[0.45, 0.7], [0.55, 0.7], [0.5, 0.7], [0.5, 0.7 + mouth_open]]
+    for eye, x0, h in ((LEFT_EYE, 0.3, left_eye_open), ([362, 385, 387, 263, 373, 380], 0.6, 0.03)):
+        p1, p2, p3, p4, p5, p6 = eye
+        pts[[p1, p4], :2] = [[x0, 0.4], [x0 + 0.1, 0.4]]
+        pts[[p2, p3], :2] = [[x0 + 0.03, 0.4 - h], [x0 + 0.07, 0.4 - h]]
+        pts[[p6, p5], :2] = [[x0 + 0.03, 0.4 + h], [x0 + 0.07, 0.4 + h]]
+    pts[1] = [0.5, 0.55, -0.05]
+    return pts
+
+
+class TestBlinkClicker(unittest.TestCase):
+    def test_left_blink_clicks_on_reopen(self):
+        backend = RecordingBackend()
+        blinker = BlinkClicker(smooth_window=1, injector=backend)
+        actions = [
+            blinker.update(face_points(left_eye_open=h), now=t)
+            for t, h in enumerate([0.03, 0.001, 0.001, 0.03])
+        ]
+        self.assertEqual(actions, [None, None, None, "LEFT CLICK"])
+        self.assertEqual(backend.events, [("click", "left")])
+
+
+class TestReplayEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session.eyl")
+
+        # mouth opens at t=1.0, closes at t=1.2 -> LEFT CLICK
+        self.frames = [(i * 0.1, face_points(0.05 if i in (10, 11) else 0.0)) for i in range(30)]
+        with SessionRecorder(self.path, chunk_frames=8) as rec:
+            for t, pts in self.frames:
+                rec.add_frame(pts, t)
+            rec.add_action("mouth", "LEFT CLICK", 1.2)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replays_recording_with_recorded_timestamps(self):
+        result = ReplayEngine(enabled={"mouth"}).run(self.path)
+
+        self.assertEqual(result.frames, 30)
+        self.assertAlmostEqual(result.session_seconds, 2.9)
+        self.assertEqual(len(result.actions), 1)
+        self.assertEqual((result.actions[0].source, result.actions[0].action), ("mouth", "LEFT CLICK"))
+        self.assertAlmostEqual(result.actions[0].timestamp, 1.2)
+        self.assertEqual(result.events, [("click", "left")])
+
+        missing, extra = compare_actions([ActionRecord(1.2, "mouth", "LEFT CLICK")], result.actions)
+        self.assertEqual((missing, extra), ([], []))
+
+    def test_runs_are_repeatable(self):
+        engine = ReplayEngine()
+        first = engine.run(self.frames)
+        second = engine.run(self.frames)
+        self.assertEqual(first.actions, second.actions)
+        self.assertEqual(first.events, second.events)
+
+    def test_unknown_source(self):
+        with self.assertRaises(ValueError):
+            ReplayEngine(enabled={"nose"})
+
+
+if __name__ == '__main__':
+    unittest.main()
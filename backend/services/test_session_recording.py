@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from backend.services.session_recording import ActionRecord, SessionReader, SessionRecorder
+
+
+class TestSessionRecording(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "rec", "session.eyl")
+        rng = np.random.default_rng(0)
+        self.frames = rng.uniform(0, 1, size=(10, 478, 3)).astype(np.float32)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def record(self, chunk_frames=4):
+        with SessionRecorder(self.path, chunk_frames=chunk_frames) as rec:
+            for i, pts in enumerate(self.frames):
+                rec.add_frame(pts, 100.0 + i * 0.1)
+                if i == 5:
+                    rec.add_action("mouth", "LEFT CLICK", 100.5)
+        return rec
+
+    def test_round_trip_in_chunks(self):
+        rec = self.record()
+        self.assertEqual(rec.frames_written, 10)
+        self.assertEqual(rec.chunks_written, 3)
+
+        with SessionReader(self.path) as reader:
+            self.assertEqual(len(reader), 10)
+            self.assertEqual(reader.num_chunks, 3)
+            self.assertAlmostEqual(reader.duration, 0.9)
+
+            frames = list(reader)
+            self.assertEqual([t for t, _ in frames], [100.0 + i * 0.1 for i in range(10)])
+            np.testing.assert_array_equal(np.stack([p for _, p in frames]), self.frames)
+            self.assertEqual(list(reader.actions()), [ActionRecord(100.5, "mouth", "LEFT CLICK")])
+            self.assertEqual(list(reader.actions("blink")), [])
+
+    def test_chunk_arrays_are_read_only_views(self):
+        self.record()
+        with SessionReader(self.path) as reader:
+            chunk = reader.chunk(0)
+            self.assertEqual(chunk.points.shape, (4, 478, 3))
+            self.assertFalse(chunk.points.flags.writeable)
+            del chunk
+
+    def test_truncated_tail_is_ignored(self):
+        self.record()
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as f:
+            f.truncate(size - 100)
+
+        with SessionReader(self.path) as reader:
+            self.assertEqual(len(reader), 8)
+
+    def test_rejects_other_files(self):
+        with open(self.path.replace("rec" + os.sep, ""), "wb") as f:
+            f.write(b"not a recording at all, definitely" * 2)
+        with self.assertRaises(ValueError):
+            SessionReader(self.path.replace("rec" + os.sep, ""))
+
+
+if __name__ == '__main__':
+    unittest.main()
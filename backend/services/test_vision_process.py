@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from backend.services.landmark_backends import SCHEME_DLIB_68, SCHEME_MEDIAPIPE_478, FaceLandmarks
+from backend.services.vision_process import FrameRing, LandmarkBlock, _RingCapture
+
+
+def write_video(directory, size, frames=3):
+    path = os.path.join(directory, "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, size)
+    for _ in range(frames):
+        writer.write(np.zeros((size[1], size[0], 3), np.uint8))
+    writer.release()
+    return path
+
+
+class TestFrameRing(unittest.TestCase):
+    def setUp(self):
+        self.ring = FrameRing.create(slots=3, max_shape=(8, 10, 3))
+        self.reader = FrameRing.attach(self.ring.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.ring.close()
+
+    def write(self, seq, value, shape=(8, 10, 3)):
+        slot = self.ring.begin_write(seq)
+        self.ring.slot_view(slot, shape)[...] = value
+        self.ring.commit(slot, seq, shape, float(seq))
+
+    def test_reader_sees_newest_frame_through_shared_memory(self):
+        self.assertIsNone(self.reader.latest())
+        for seq in range(1, 6):
+            self.write(seq, seq)
+
+        seq, captured_at, view = self.reader.latest()
+        self.assertEqual((seq, captured_at), (5, 5.0))
+        self.assertTrue((view == 5).all())
+        self.assertEqual(self.reader.copy_frame(4).mean(), 4)
+        self.assertIsNone(self.reader.copy_frame(2))       # overwritten by seq 5
+
+        self.write(6, 6, shape=(4, 5, 3))                   # smaller frames, same segment
+        self.assertEqual(self.reader.latest()[2].shape, (4, 5, 3))
+
+    def test_overwritten_views_are_detected(self):
+        self.write(1, 1)
+        seq, _, view = self.reader.latest()
+        for s in (2, 3, 4):     # laps slot 1
+            self.write(s, s)
+        self.assertFalse(self.reader.is_current(seq))
+        with self.assertRaises(ValueError):
+            self.ring.slot_view(0, (20, 20, 3))
+
+    def test_frames_larger_than_the_ring_end_the_capture_with_an_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            capture = _RingCapture(self.ring, write_video(tmp, (64, 48)))
+            try:
+                self.assertFalse(capture.wait_newer(0, 2.0))
+                self.assertTrue(capture.ended)
+                self.assertIn("max_frame_shape", capture.error)
+            finally:
+                capture.close()
+
+    def test_source_that_fails_to_open_waits_for_another_one(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            capture = _RingCapture(self.ring, os.path.join(tmp, "missing.avi"))
+            try:
+                self.assertFalse(capture.opened)
+                self.assertFalse(capture.ended)
+                self.assertFalse(capture.wait_newer(0, 0.05))
+
+                capture.open(write_video(tmp, (10, 8)))
+                self.assertTrue(capture.opened)
+                self.assertTrue(capture.wait_newer(0, 2.0))
+                self.assertEqual(self.reader.latest()[2].shape, (8, 10, 3))
+            finally:
+                capture.close()
+
+
+class TestLandmarkBlock(unittest.TestCase):
+    def test_fixed_layout_roundtrip(self):
+        block = LandmarkBlock.create()
+        reader = LandmarkBlock.attach(block.name)
+        try:
+            points = np.random.default_rng(0).random((478, 3)).astype(np.float32)
+            iris = np.array([[0.4, 0.5], [0.6, 0.5]], np.float32)
+            block.write(7, 1.5, FaceLandmarks(points, SCHEME_MEDIAPIPE_478, iris, 10.0), 4.0, 3, 1)
+
+            snap = reader.read()
+            self.assertEqual(snap["version"] % 2, 0)
+            self.assertEqual((int(snap["frame_seq"]), float(snap["captured_at"])), (7, 1.5))
+            face = LandmarkBlock.to_face(snap)
+            np.testing.assert_array_equal(face.points, points)
+            self.assertEqual(face.gaze, (0.5, 0.5))
+            self.assertEqual(face.timestamp, 10.0)
+
+            block.write(8, 2.0, FaceLandmarks(points[:68], SCHEME_DLIB_68, None, 11.0), 4.0, 4, 1)
+            face = LandmarkBlock.to_face(reader.read())
+            self.assertEqual((face.scheme, len(face.points), face.iris), (SCHEME_DLIB_68, 68, None))
+
+            block.write(9, 2.5, None, 4.0, 5, 1)
+            self.assertIsNone(LandmarkBlock.to_face(reader.read()))
+        finally:
+            reader.close()
+            block.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,714 @@
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Client, Listener
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from backend.services.landmark_backends import SCHEME_DLIB_68, SCHEME_MEDIAPIPE_478, FaceLandmarks
+from backend.services.landmark_frame import NUM_LANDMARKS
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# ------------------- Shared layouts -------------------
+RING_HEADER_DTYPE = np.dtype([
+    ("latest", np.int64),           # seq of the newest complete frame (0: none yet)
+    ("captured", np.int64),         # frames decoded into the ring
+    ("slots", np.int64),
+    ("slot_bytes", np.int64),
+])
+
+SLOT_DTYPE = np.dtype([
+    ("seq", np.int64),              # -1 while the capture thread writes the slot
+    ("captured_at", np.float64),    # time.monotonic() when the frame was read
+    ("height", np.int32),
+    ("width", np.int32),
+    ("channels", np.int32),
+    ("_pad", np.int32),
+])
+
+_SCHEMES = {0: None, 1: SCHEME_MEDIAPIPE_478, 2: SCHEME_DLIB_68}
+_SCHEME_CODES = {v: k for k, v in _SCHEMES.items()}
+
+# One record, written by the worker and read by the GUI process. `version` is
+# a sequence lock: odd while the worker writes, so a reader that sees the same
+# even value before and after copying the record has a consistent copy.
+LANDMARK_DTYPE = np.dtype([
+    ("version", np.int64),
+    ("frame_seq", np.int64),        # ring seq of the frame these landmarks belong to
+    ("processed", np.int64),        # frames run through the engine
+    ("dropped", np.int64),          # frames overwritten in the ring before inference
+    ("captured_at", np.float64),    # time.monotonic() of the frame (system-wide clock)
+    ("timestamp", np.float64),      # time.time() after inference
+    ("inference_ms", np.float32),
+    ("reader_waiting", np.int32),   # set by the reader before it blocks (see InferenceProcess.read)
+    ("found", np.uint8),
+    ("scheme", np.uint8),
+    ("has_iris", np.uint8),
+    ("_pad", np.uint8),
+    ("n_points", np.int32),
+    ("iris", np.float32, (2, 2)),
+    ("points", np.float32, (NUM_LANDMARKS, 3)),
+])
+
+
+# Segments created by this process: their resource tracker registration
+# belongs to the creator and must survive attaching to them here too
+_created = set()
+
+
+def _create(size):
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    _created.add(shm.name)
+    return shm
+
+
+def _attach(name):
+    """Opens an existing segment without letting this process' resource
+    tracker unlink it at exit (the creator owns it)."""
+    shm = shared_memory.SharedMemory(name=name)
+    if name not in _created:
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")  # pyright: ignore
+        except Exception:
+            pass
+    return shm
+
+
+def _close(shm, unlink):
+    try:
+        shm.close()
+    except BufferError:
+        pass        # a view is still referenced; the mapping goes with the process
+    if unlink:
+        shm.unlink()
+        _created.discard(shm.name)
+
+
+def _aligned(n, to=64):
+    return (n + to - 1) // to * to
+
+
+class FrameRing:
+    """
+    Camera frames in a multiprocessing.shared_memory ring.
+
+    The capture thread decodes every frame straight into the next slot
+    (cv2.VideoCapture.read into a view of shared memory, no extra copy) and
+    publishes it as the newest; readers take views of the newest slot. Slots
+    carry their own shape, up to max_shape, so a camera switch needs no new
+    segment. Each slot header has a sequence number (-1 while being
+    written): a reader checks that it did not change while it used the view.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((), RING_HEADER_DTYPE, shm.buf, 0)
+        self.slots = int(self.header["slots"])
+        self.slot_bytes = int(self.header["slot_bytes"])
+        self.slot_header = np.ndarray((self.slots,), SLOT_DTYPE, shm.buf, RING_HEADER_DTYPE.itemsize)
+        self._data_offset = _aligned(RING_HEADER_DTYPE.itemsize + self.slots * SLOT_DTYPE.itemsize)
+
+    @classmethod
+    def create(cls, slots: int = 4, max_shape: Tuple[int, int, int] = (1080, 1920, 3)) -> "FrameRing":
+        slot_bytes = _aligned(int(np.prod(max_shape)))
+        data_offset = _aligned(RING_HEADER_DTYPE.itemsize + slots * SLOT_DTYPE.itemsize)
+        shm = _create(data_offset + slots * slot_bytes)
+        header = np.ndarray((), RING_HEADER_DTYPE, shm.buf, 0)
+        header[()] = (0, 0, slots, slot_bytes)
+        ring = cls(shm, owner=True)
+        ring.slot_header["seq"] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str) -> "FrameRing":
+        return cls(_attach(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def slot_view(self, slot: int, shape) -> np.ndarray:
+        if int(np.prod(shape)) > self.slot_bytes:
+            raise ValueError(f"Frame {tuple(shape)} does not fit the ring slots ({self.slot_bytes} bytes)")
+        return np.ndarray(shape, np.uint8, self.shm.buf, self._data_offset + slot * self.slot_bytes)
+
+    # ----------------- Writer (capture thread) -----------------
+    def begin_write(self, seq: int) -> int:
+        slot = seq % self.slots
+        self.slot_header["seq"][slot] = -1
+        return slot
+
+    def commit(self, slot: int, seq: int, shape, captured_at: float) -> None:
+        slots = self.slot_header
+        slots["captured_at"][slot] = captured_at
+        slots["height"][slot], slots["width"][slot] = shape[:2]
+        slots["channels"][slot] = shape[2] if len(shape) > 2 else 1
+        slots["seq"][slot] = seq
+        self.header["latest"] = seq
+        self.header["captured"] = seq
+
+    # ----------------- Readers -----------------
+    def latest(self) -> Optional[Tuple[int, float, np.ndarray]]:
+        """(seq, captured_at, view) of the newest frame, or None. The view
+        stays valid while is_current(seq)."""
+        seq = int(self.header["latest"])
+        if seq <= 0:
+            return None
+        rec = self.slot_header[seq % self.slots].copy()
+        if int(rec["seq"]) != seq:
+            return None
+        shape = (int(rec["height"]), int(rec["width"]), int(rec["channels"]))
+        return seq, float(rec["captured_at"]), self.slot_view(seq % self.slots, shape)
+
+    def is_current(self, seq: int) -> bool:
+        """True if frame seq was not overwritten (its views are still valid)."""
+        return int(self.slot_header[seq % self.slots]["seq"]) == seq
+
+    def copy_frame(self, seq: Optional[int] = None) -> Optional[np.ndarray]:
+        """Copy of frame seq (default: newest), or None if it already left the ring."""
+        latest = self.latest()
+        if latest is None:
+            return None
+        if seq is None:
+            seq = latest[0]
+        rec = self.slot_header[seq % self.slots].copy()
+        shape = (int(rec["height"]), int(rec["width"]), int(rec["channels"]))
+        if int(rec["seq"]) != seq:
+            return None
+        frame = self.slot_view(seq % self.slots, shape).copy()
+        return frame if self.is_current(seq) else None
+
+    def close(self) -> None:
+        self.header = self.slot_header = None
+        _close(self.shm, self.owner)
+
+
+class LandmarkBlock:
+    """The LANDMARK_DTYPE record in shared memory (see the seqlock note)."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.record = np.ndarray((), LANDMARK_DTYPE, shm.buf, 0)
+
+    @classmethod
+    def create(cls) -> "LandmarkBlock":
+        shm = _create(LANDMARK_DTYPE.itemsize)
+        block = cls(shm, owner=True)
+        block.record[()] = np.zeros((), LANDMARK_DTYPE)
+        return block
+
+    @classmethod
+    def attach(cls, name: str) -> "LandmarkBlock":
+        return cls(_attach(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def version(self) -> int:
+        return int(self.record["version"])
+
+    def write(self, frame_seq, captured_at, face: Optional[FaceLandmarks], inference_ms, processed, dropped):
+        rec = self.record
+        rec["version"] += 1                 # odd: writing
+        rec["frame_seq"] = frame_seq
+        rec["captured_at"] = captured_at
+        rec["inference_ms"] = inference_ms
+        rec["processed"] = processed
+        rec["dropped"] = dropped
+        if face is None:
+            rec["found"] = 0
+        else:
+            n = min(len(face.points), NUM_LANDMARKS)
+            rec["found"] = 1
+            rec["timestamp"] = face.timestamp
+            rec["scheme"] = _SCHEME_CODES.get(face.scheme, 0)
+            rec["n_points"] = n
+            rec["points"][:n] = face.points[:n]
+            rec["has_iris"] = face.iris is not None
+            if face.iris is not None:
+                rec["iris"] = face.iris
+        rec["version"] += 1                 # even: consistent
+
+    def read(self) -> np.ndarray:
+        """Consistent copy of the record."""
+        rec = self.record
+        while True:
+            before = int(rec["version"])
+            if before % 2 == 0:
+                snapshot = rec.copy()
+                if int(rec["version"]) == before:
+                    return snapshot
+            time.sleep(0)
+
+    @staticmethod
+    def to_face(snapshot) -> Optional[FaceLandmarks]:
+        if not snapshot["found"]:
+            return None
+        n = int(snapshot["n_points"])
+        iris = snapshot["iris"].copy() if snapshot["has_iris"] else None
+        return FaceLandmarks(
+            snapshot["points"][:n].copy(), _SCHEMES[int(snapshot["scheme"])], iris, float(snapshot["timestamp"])
+        )
+
+    def close(self) -> None:
+        self.record = None
+        _close(self.shm, self.owner)
+
+
+# ------------------- GUI process side -------------------
+class InferenceProcess:
+    """
+    Camera capture and landmark inference in a separate Python process, so
+    the vision pipeline does not share a GIL with the UI and its threads.
+
+    The worker (python -m backend.services.vision_process) decodes camera
+    frames into a FrameRing and runs the landmark engine on the newest one;
+    results come back in a LandmarkBlock. Both live in shared memory, so no
+    frame or landmark array is pickled. A local connection carries only
+    control messages and wake-ups.
+
+    Drop-in for LatestFrameSource + engine in the tracking loop:
+        source = InferenceProcess(camera_index, backend="auto")
+        ok, landmarks = source.read()   # FaceLandmarks or None (no face)
+        captured_at = source.frame_time
+    """
+
+    def __init__(
+        self,
+        source=0,
+        backend: str = "auto",
+        mirror: bool = True,
+        slots: int = 4,
+        max_frame_shape: Tuple[int, int, int] = (1080, 1920, 3),
+        read_timeout: float = 1.0,
+        start_timeout: float = 60.0,
+        adaptive_rate: bool = False,
+        face_roi: bool = False,
+        roi_max_size: Optional[int] = None,
+        facemesh_only: bool = False,
+    ):
+        self.source = source
+        self.backend = backend
+        self.mirror = mirror
+        self.adaptive_rate = adaptive_rate
+        self.face_roi = face_roi
+        self.roi_max_size = roi_max_size
+        self.facemesh_only = facemesh_only
+        self.read_timeout = read_timeout
+        self.engine_name = None
+        self.frame_time = 0.0
+        self.frame_seq = 0
+        self.inference_ms = 0.0
+
+        self._ended = False
+        self._source_open = True
+        self._keep_active = False
+        self._version = 0
+        self._proc = None
+        self._conn = None
+
+        self.ring = FrameRing.create(slots, max_frame_shape)
+        self.block = LandmarkBlock.create()
+        try:
+            self._start(start_timeout)
+        except Exception:
+            self.release()
+            raise
+
+    def _start(self, timeout):
+        authkey = os.urandom(16)
+        listener = Listener(authkey=authkey)
+        try:
+            address = listener.address
+            self._proc = subprocess.Popen(
+                [
+                    sys.executable, "-m", "backend.services.vision_process",
+                    "--address", address if isinstance(address, str) else f"{address[0]}:{address[1]}",
+                    "--ring", self.ring.name,
+                    "--block", self.block.name,
+                    "--source", str(self.source),
+                    "--backend", self.backend,
+                ]
+                + ([] if self.mirror else ["--no-mirror"])
+                + (["--adaptive-rate"] if self.adaptive_rate else [])
+                + (["--face-roi", "--roi-max-size", str(self.roi_max_size or 0)] if self.face_roi else [])
+                + (["--facemesh-only"] if self.facemesh_only else []),
+                cwd=PROJECT_ROOT,
+                stdin=subprocess.PIPE,
+            )
+            # The authkey goes through stdin, not the command line
+            self._proc.stdin.write(authkey.hex().encode() + b"\n")
+            self._proc.stdin.close()
+
+            accepted = {}
+            accept = threading.Thread(target=lambda: accepted.setdefault("conn", listener.accept()), daemon=True)
+            accept.start()
+            accept.join(timeout)
+            if "conn" not in accepted:
+                raise TimeoutError("Inference process did not connect")
+            self._conn = accepted["conn"]
+        finally:
+            listener.close()
+
+        # Wait for the engine to load (it may benchmark the engines first)
+        deadline = time.monotonic() + timeout
+        while True:
+            if not self._conn.poll(max(0.0, deadline - time.monotonic())):
+                raise TimeoutError("Inference process did not start its engine")
+            msg = self._conn.recv()
+            if msg[0] == "ready":
+                self.engine_name = msg[1]
+                return
+            if msg[0] == "error":
+                raise RuntimeError(f"Inference process failed: {msg[1]}")
+
+    def _handle(self, msg) -> None:
+        if msg[0] in ("ended", "error"):
+            if msg[0] == "error":
+                print(f"[VISION] worker error: {msg[1]}")
+            self._ended = True
+        elif msg[0] == "source_failed":
+            print(f"[VISION] {msg[1]}")
+            self._source_open = False
+        elif msg[0] == "source_opened":
+            self._source_open = True
+
+    def _drain(self) -> None:
+        """Handle the control messages already waiting on the connection."""
+        try:
+            while self._conn is not None and self._conn.poll(0):
+                msg = self._conn.recv()
+                if msg:
+                    self._handle(msg)
+        except (EOFError, OSError):
+            self._ended = True
+
+    def read(self, timeout: Optional[float] = None) -> Tuple[bool, Optional[FaceLandmarks]]:
+        """
+        Block until the worker has processed a frame newer than the last one
+        returned.
+
+        returns: (True, FaceLandmarks or None when there was no face) or
+        (False, None) on timeout / end of stream
+        """
+        if timeout is None:
+            timeout = self.read_timeout
+        deadline = time.monotonic() + timeout
+        record = self.block.record
+
+        while True:
+            record["reader_waiting"] = 1
+            if self.block.version != self._version:
+                record["reader_waiting"] = 0
+                break
+            remaining = deadline - time.monotonic()
+            if self._ended or remaining <= 0 or self._conn is None:
+                record["reader_waiting"] = 0
+                return False, None
+            try:
+                if self._conn.poll(remaining):
+                    self._drain()
+            except (EOFError, OSError):
+                self._ended = True
+
+        snapshot = self.block.read()
+        self._version = int(snapshot["version"])
+        self.frame_seq = int(snapshot["frame_seq"])
+        self.frame_time = float(snapshot["captured_at"])
+        self.inference_ms = float(snapshot["inference_ms"])
+        return True, LandmarkBlock.to_face(snapshot)
+
+    def latest_frame(self) -> Optional[np.ndarray]:
+        """Copy of the newest camera frame (not mirrored), e.g. for a preview."""
+        return self.ring.copy_frame()
+
+    def set_source(self, source) -> None:
+        """Switch the worker to another camera (index) or video file."""
+        self.source = source
+        if self._conn is not None:
+            self._conn.send(("source", str(source)))
+
+    def set_keep_active(self, keep: bool) -> None:
+        """Hold the worker's adaptive frame rate at full rate while a face is
+        seen (FrameRateGovernor.keep_active). Sent only when it changes."""
+        if keep != self._keep_active and self._conn is not None:
+            self._keep_active = keep
+            self._conn.send(("keep_active", keep))
+
+    @property
+    def ended(self) -> bool:
+        return self._ended or (self._proc is not None and self._proc.poll() is not None)
+
+    def isOpened(self) -> bool:
+        """True while the worker has its camera or video open (see ended for
+        the end of the stream). A source that failed to open leaves the
+        worker running, waiting for set_source."""
+        self._drain()
+        return self._conn is not None and self._source_open
+
+    def stats(self):
+        snapshot = self.block.read()
+        return {
+            "captured": int(self.ring.header["captured"]) if self.ring.header is not None else 0,
+            "processed": int(snapshot["processed"]),
+            "dropped": int(snapshot["dropped"]),
+        }
+
+    def release(self, timeout: float = 2.0) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+        if self._proc is not None:
+            try:
+                self._proc.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+            self._proc = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self.ring.header is not None:
+            self.ring.close()
+        if self.block.record is not None:
+            self.block.close()
+        self._ended = True
+
+    stop = release
+
+
+# ------------------- Worker process side -------------------
+class _RingCapture:
+    """Capture thread of the worker: decodes frames into the ring. Video
+    files are read at their own frame rate, like a camera. A frame that
+    does not fit the ring ends the capture with `error` set; a source that
+    cannot be opened leaves `opened` False until another one is opened."""
+
+    def __init__(self, ring: FrameRing, source):
+        self.ring = ring
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._seq = 0
+        self.ended = False
+        self.opened = False
+        self.error: Optional[str] = None
+        self.source = source
+        self._cap = None
+        self._thread = None
+        self.open(source)
+
+    def open(self, source) -> None:
+        self.close()
+        self.source = source
+        source = int(source) if str(source).lstrip("-").isdigit() else source
+        self._cap = cv2.VideoCapture(source)
+        self._interval = 0.0
+        if self._cap.isOpened():
+            try:
+                self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            except Exception:
+                pass
+            fps = self._cap.get(cv2.CAP_PROP_FPS) if isinstance(source, str) else 0.0
+            self._interval = 1.0 / fps if fps and fps > 0 else 0.0
+        self._stop.clear()
+        self.error = None
+        self.ended = False
+        self.opened = self._cap.isOpened()
+        if self.opened:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    def _loop(self) -> None:
+        ring = self.ring
+        shape = None
+        due = time.monotonic()
+        while not self._stop.is_set() and not self.ended:
+            if self._interval:
+                due += self._interval
+                self._stop.wait(max(0.0, due - time.monotonic()))
+            seq = self._seq + 1
+            slot = ring.begin_write(seq)
+            try:
+                if shape is None:
+                    ret, frame = self._cap.read()
+                    if ret:
+                        shape = frame.shape
+                        ring.slot_view(slot, shape)[...] = frame
+                else:
+                    view = ring.slot_view(slot, shape)
+                    ret, frame = self._cap.read(view)
+                    if ret and frame is not view:       # size changed: decoded elsewhere
+                        shape = frame.shape
+                        ring.slot_view(slot, shape)[...] = frame
+            except ValueError as e:     # frame larger than max_frame_shape
+                with self._cond:
+                    self.error = f"{e}; raise max_frame_shape"
+                    self.ended = True
+                    self._cond.notify_all()
+                return
+            now = time.monotonic()
+            with self._cond:
+                if not ret:
+                    self.ended = True
+                else:
+                    self._seq = seq
+                    ring.commit(slot, seq, shape, now)
+                self._cond.notify_all()
+
+    def wait_newer(self, seq: int, timeout: float) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self._seq > seq or self.ended, timeout) and self._seq > seq
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+def _sample_frames(capture: _RingCapture, count: int = 30, timeout: float = 5.0):
+    frames, seq = [], 0
+    deadline = time.monotonic() + timeout
+    while capture.opened and len(frames) < count and time.monotonic() < deadline:
+        if not capture.wait_newer(seq, 0.5):
+            if capture.ended:
+                break
+            continue
+        latest = capture.ring.latest()
+        if latest is not None:
+            seq = latest[0]
+            frames.append(latest[2].copy())
+    return frames
+
+
+def serve(address, authkey, ring_name, block_name, source, backend="auto", mirror=True,
+          adaptive_rate=False, face_roi=False, roi_max_size=None, facemesh_only=False) -> None:
+    """Worker main loop: newest ring frame -> engine -> LandmarkBlock."""
+    from backend.services import landmark_backends
+    from backend.services.frame_governor import FrameRateGovernor
+    from backend.services.preprocess import FaceROI
+
+    governor = FrameRateGovernor() if adaptive_rate else None
+    schemes = (landmark_backends.SCHEME_MEDIAPIPE_478,) if facemesh_only else None
+    landmark_backends.preload_backends(backend, schemes)     # overlaps opening the camera
+
+    conn = Client(address, authkey=authkey)
+    ring = FrameRing.attach(ring_name)
+    block = LandmarkBlock.attach(block_name)
+    capture = _RingCapture(ring, source)
+    try:
+        try:
+            samples = _sample_frames(capture) if backend == "auto" else None
+            roi = FaceROI(max_size=roi_max_size) if face_roi else None
+            engine = landmark_backends.create_backend(backend, samples, schemes, mirror=mirror, roi=roi)
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+            return
+        conn.send(("ready", engine.name))
+
+        last_seq = processed = dropped = 0
+        reported_open = True        # the parent assumes the source opened
+        with engine:
+            while True:
+                while conn.poll(0):
+                    msg = conn.recv()
+                    if msg[0] == "stop":
+                        return
+                    if msg[0] == "source":
+                        capture.open(msg[1])
+                    elif msg[0] == "keep_active" and governor:
+                        governor.keep_active = msg[1]
+
+                if capture.opened != reported_open:
+                    reported_open = capture.opened
+                    conn.send(("source_opened",) if capture.opened
+                              else ("source_failed", f"cannot open camera or video {capture.source!r}"))
+                if not capture.opened:
+                    conn.poll(0.1)      # stay alive until set_source picks another one
+                    continue
+
+                if not capture.wait_newer(last_seq, 0.1):
+                    if capture.ended:
+                        conn.send(("error", capture.error) if capture.error else ("ended",))
+                        return
+                    continue
+
+                latest = ring.latest()
+                if latest is None:
+                    continue
+                seq, captured_at, frame = latest
+                if last_seq:
+                    dropped += max(0, seq - last_seq - 1)
+                last_seq = seq
+                if governor and not governor.should_process(frame, captured_at):
+                    continue
+
+                t0 = time.perf_counter()
+                face = engine.process(frame)
+                inference_ms = (time.perf_counter() - t0) * 1000.0
+                if governor:
+                    governor.update(face, captured_at, inference_ms)
+                if not ring.is_current(seq):
+                    # The capture thread lapped the ring while the engine read the frame
+                    dropped += 1
+                    continue
+
+                processed += 1
+                block.write(seq, captured_at, face, inference_ms, processed, dropped)
+                if block.record["reader_waiting"]:
+                    block.record["reader_waiting"] = 0
+                    conn.send(())
+    except (EOFError, OSError, BrokenPipeError):
+        pass        # GUI process went away
+    finally:
+        if governor:
+            print(governor.summary())
+        capture.close()
+        ring.close()
+        block.close()
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EyeOS inference worker (started by InferenceProcess)")
+    parser.add_argument("--address", required=True)
+    parser.add_argument("--ring", required=True)
+    parser.add_argument("--block", required=True)
+    parser.add_argument("--source", default="0")
+    parser.add_argument("--backend", default="auto")
+    parser.add_argument("--no-mirror", action="store_true")
+    parser.add_argument("--adaptive-rate", action="store_true")
+    parser.add_argument("--face-roi", action="store_true")
+    parser.add_argument("--roi-max-size", type=int, default=0)
+    parser.add_argument("--facemesh-only", action="store_true")
+    args = parser.parse_args(argv)
+
+    authkey = bytes.fromhex(sys.stdin.readline().strip())
+    address = args.address
+    if ":" in address and not address.startswith(("/", "\\\\")):
+        host, port = address.rsplit(":", 1)
+        address = (host, int(port))
+    serve(address, authkey, args.ring, args.block, args.source, args.backend, not args.no_mirror,
+          args.adaptive_rate, args.face_roi, args.roi_max_size or None, args.facemesh_only)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Landmark engine comparison over a recorded video.
+
+Runs the same video frames through every landmark engine (mediapipe FaceMesh
+as main.py configures it, and gaze_tracking.GazeTracking through the dlib
+engine) and reports, per engine, throughput, per-frame latency percentiles,
+peak resident memory and face detection rate, then how far apart the
+engines put the iris/pupil centres on the frames where both found them.
+
+Each engine runs alone in a fresh process, one after the other, so peak RSS
+is that engine's own and the engines do not compete for the CPU. Only the
+engine call is timed; video decoding is not.
+
+    python -m benchmarks.bench_backends clip.mp4
+    python -m benchmarks.bench_backends clip.mp4 --frames 600 --json results.json
+    python -m benchmarks.bench_backends clip.mp4 --engines dlib --detect-interval 1
+    python -m benchmarks.bench_backends clip.mp4 --engines mediapipe --face-roi
+
+Run it on the machine you are evaluating, with nothing else busy.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from backend.services import landmark_backends
+from backend.services.preprocess import FaceROI
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+
+# ------------------- Engine run (child process) -------------------
+def read_frames(path, start=0, count=None):
+    """Yields the BGR frames start..start+count-1 of a video"""
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise IOError(f"Cannot open video: {path}")
+    try:
+        if start:
+            capture.set(cv2.CAP_PROP_POS_FRAMES, start)
+        n = 0
+        while count is None or n < count:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            n += 1
+            yield frame
+    finally:
+        capture.release()
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def run_engine(name, video, start=0, frames=None, warmup=10, engine_kwargs=None):
+    """
+    Processes the video with one engine.
+
+    Returns:
+        dict with "latency_ms" (one entry per timed frame), "iris" ((n, 2, 2)
+        pixel centres, NaN where the engine found none), "found" (face per
+        frame), "frame_size", "rss_before_mb" and "rss_peak_mb"
+    """
+    rss_before = peak_rss_mb()
+    backend = landmark_backends.create_backend(name, **(engine_kwargs or {}))
+
+    latency, iris, found = [], [], []
+    size = None
+    with backend:
+        for i, frame in enumerate(read_frames(video, start, frames)):
+            size = frame.shape[1], frame.shape[0]
+            t0 = time.perf_counter()
+            face = backend.process(frame)
+            elapsed = (time.perf_counter() - t0) * 1000.0
+            if i < warmup:
+                continue
+            latency.append(elapsed)
+            found.append(face is not None)
+            if face is not None and face.iris is not None:
+                iris.append(face.iris * np.array(size, dtype=np.float32))
+            else:
+                iris.append(np.full((2, 2), np.nan, np.float32))
+
+    return {
+        "latency_ms": np.array(latency),
+        "iris": np.array(iris).reshape(-1, 2, 2),
+        "found": np.array(found, dtype=bool),
+        "frame_size": size,
+        "rss_before_mb": rss_before,
+        "rss_peak_mb": peak_rss_mb(),
+    }
+
+
+def run_isolated(name, *args, **kwargs):
+    """run_engine() in a fresh process of its own"""
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(run_engine, (name,) + args, kwargs)
+
+
+# ------------------- Report -------------------
+def summarize(run):
+    lat = run["latency_ms"]
+    if lat.size == 0:
+        return {"frames": 0}
+    p50, p95, p99 = np.percentile(lat, (50, 95, 99))
+    return {
+        "frames": int(lat.size),
+        "fps": round(float(lat.size / (lat.sum() / 1000.0)), 2),
+        "latency_ms": {
+            "mean": round(float(lat.mean()), 3),
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3),
+            "max": round(float(lat.max()), 3),
+        },
+        "face_rate": round(float(run["found"].mean()), 4),
+        "iris_rate": round(float(np.isfinite(run["iris"][:, 0, 0]).mean()), 4),
+        "rss_before_mb": None if run["rss_before_mb"] is None else round(run["rss_before_mb"], 1),
+        "rss_peak_mb": None if run["rss_peak_mb"] is None else round(run["rss_peak_mb"], 1),
+    }
+
+
+def agreement(ref, other):
+    """
+    Distance between the iris centres of two engines on the frames where
+    both located them, in pixels and as a fraction of the reference
+    engine's inter-iris distance (so it does not depend on face size).
+    """
+    n = min(len(ref["iris"]), len(other["iris"]))
+    a, b = ref["iris"][:n], other["iris"][:n]
+    both = np.isfinite(a).all(axis=(1, 2)) & np.isfinite(b).all(axis=(1, 2))
+    if not both.any():
+        return {"frames": 0}
+
+    a, b = a[both], b[both]
+    dist = np.linalg.norm(a - b, axis=2).ravel()               # both eyes of every frame
+    gaze = np.linalg.norm(a.mean(axis=1) - b.mean(axis=1), axis=1)
+    inter = np.repeat(np.maximum(np.linalg.norm(a[:, 0] - a[:, 1], axis=1), 1e-6), 2)
+    rel = dist / inter
+    return {
+        "frames": int(both.sum()),
+        "eye_px": {
+            "mean": round(float(dist.mean()), 2),
+            "p50": round(float(np.percentile(dist, 50)), 2),
+            "p95": round(float(np.percentile(dist, 95)), 2),
+        },
+        "gaze_midpoint_px": {
+            "mean": round(float(gaze.mean()), 2),
+            "p95": round(float(np.percentile(gaze, 95)), 2),
+        },
+        "eye_vs_inter_iris": {
+            "mean": round(float(rel.mean()), 4),
+            "p95": round(float(np.percentile(rel, 95)), 4),
+        },
+    }
+
+
+def print_report(report):
+    print(f"video: {report['video']}  frames {report['start']}.. (warmup {report['warmup']} untimed)")
+    print(f"{'engine':<10} {'frames':>6} {'fps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'max ms':>8} {'face':>6} {'iris':>6} {'peak RSS':>9}")
+    for name, s in report["engines"].items():
+        if "error" in s:
+            print(f"{name:<10} unavailable: {s['error']}")
+            continue
+        if not s["frames"]:
+            print(f"{name:<10} no frames")
+            continue
+        lat = s["latency_ms"]
+        rss = f"{s['rss_peak_mb']:.0f} MB" if s["rss_peak_mb"] is not None else "-"
+        print(f"{name:<10} {s['frames']:>6} {s['fps']:>8.1f} {lat['p50']:>8.2f} {lat['p95']:>8.2f} "
+              f"{lat['p99']:>8.2f} {lat['max']:>8.2f} {s['face_rate']:>6.0%} {s['iris_rate']:>6.0%} {rss:>9}")
+
+    for pair, a in report["agreement"].items():
+        if not a["frames"]:
+            print(f"{pair}: no frame where both located the irises")
+            continue
+        print(f"{pair}: {a['frames']} frames, iris distance mean {a['eye_px']['mean']:.1f} px "
+              f"(p95 {a['eye_px']['p95']:.1f} px, {100 * a['eye_vs_inter_iris']['mean']:.1f}% of the "
+              f"inter-iris distance), gaze midpoint mean {a['gaze_midpoint_px']['mean']:.1f} px")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("video")
+    parser.add_argument("--engines", nargs="+", default=list(landmark_backends.PREFERENCE),
+                        choices=landmark_backends.PREFERENCE)
+    parser.add_argument("--start", type=int, default=0, help="first video frame")
+    parser.add_argument("--frames", type=int, help="number of frames (default: to the end)")
+    parser.add_argument("--warmup", type=int, default=10, help="untimed frames at the start")
+    parser.add_argument("--detect-interval", type=int,
+                        help="GazeTracking detect_interval for the dlib engine (default: the engine's)")
+    parser.add_argument("--face-roi", action="store_true",
+                        help="mediapipe engine: FaceMesh on a crop around the previous face")
+    parser.add_argument("--roi-max-size", type=int, help="with --face-roi, downscale larger crops")
+    parser.add_argument("--in-process", action="store_true",
+                        help="run the engines in this process (peak RSS is then cumulative)")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    runs, report = {}, {
+        "video": os.path.abspath(args.video),
+        "start": args.start,
+        "warmup": args.warmup,
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+            "opencv": cv2.__version__,
+        },
+        "engines": {},
+        "agreement": {},
+    }
+    run = run_engine if args.in_process else run_isolated
+    for name in args.engines:
+        kwargs = {}
+        if name == "dlib" and args.detect_interval:
+            kwargs["detect_interval"] = args.detect_interval
+        if name == "mediapipe" and args.face_roi:
+            kwargs["roi"] = FaceROI(max_size=args.roi_max_size)
+        try:
+            runs[name] = run(name, args.video, args.start, args.frames, args.warmup, kwargs)
+        except Exception as e:
+            report["engines"][name] = {"error": f"{type(e).__name__}: {e}"}
+            continue
+        report["engines"][name] = summarize(runs[name])
+
+    names = list(runs)
+    for other in names[1:]:
+        report["agreement"][f"{names[0]} vs {other}"] = agreement(runs[names[0]], runs[other])
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=4)
+            f.write("\n")
+    return 0 if runs else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Per-frame micro-benchmarks for the gesture controllers and their helpers.
+
+Each case replays a landmark stream (synthetic by default, or a recorded
+session) through one per-frame call and reports the median cost per call
+and the transient memory it allocates. Results can be saved as a JSON
+baseline and compared against it; anything slower or hungrier than the
+baseline by more than the tolerance is flagged and the exit code is 1.
+
+    python -m benchmarks.bench_controllers                 # compare with the baseline
+    python -m benchmarks.bench_controllers --save          # write a new baseline
+    python -m benchmarks.bench_controllers --recording recordings/session.eyl
+
+Baselines are machine specific: regenerate one on the machine you compare on.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from backend.services.blink_click import BlinkClicker
+from backend.services.cursor_mapping import gaze_to_screen
+from backend.services.eye_blink_calibrator import EyeBlinkCalibrator
+from backend.services.eyebrow_scroll import EyebrowScroller
+from backend.services.face_features import LEFT_EYE, extract_features
+from backend.services.gaze_click import GazeClickService
+from backend.services.gesture_pipeline import GesturePipeline
+from backend.services.head_pose import HeadPoseEstimator
+from backend.services.input_injection import RecordingBackend
+from backend.services.landmark_frame import LandmarkFrame
+from backend.services.lip_eyebrow_scroll import LipEyebrowScrollController
+from backend.services.lip_scroll import LipScrollController
+from backend.services.mouth_click import MouthClicker
+from benchmarks.streams import recorded_stream, synthetic_stream
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "controllers.json")
+
+# Differences below these are noise, whatever the ratio
+MIN_US_DELTA = 0.5
+MIN_BYTES_DELTA = 1024
+
+
+# ------------------- Cases -------------------
+# Each factory gets the stream and returns step(i), which performs the
+# per-frame work for frame i. Setup (frames, features, controllers) happens
+# in the factory so only the per-frame call is timed.
+
+def _warm_frames(stream):
+    """Frames with features and pose already computed, as controllers see them after the first consumer."""
+    estimator = HeadPoseEstimator()
+    frames = [LandmarkFrame(pts, t, pose_estimator=estimator) for t, pts in stream]
+    for f in frames:
+        f.features
+    return frames
+
+
+def _controller_case(factory):
+    def make(stream):
+        frames = _warm_frames(stream)
+        controller = factory(RecordingBackend())
+
+        def step(i):
+            f = frames[i]
+            controller.update(f, f.timestamp)
+        return step
+    return make
+
+
+def _pipeline_case(stream):
+    # Fresh frames every run: feature extraction and head pose are included
+    estimator = HeadPoseEstimator()
+    pipeline = GesturePipeline(injector=RecordingBackend())
+
+    def step(i):
+        t, pts = stream[i]
+        pipeline.update(LandmarkFrame(pts, t, pose_estimator=estimator), t)
+    return step
+
+
+def _features_case(stream):
+    frames = _warm_frames(stream)
+    poses = [f.pose for f in frames]
+
+    def step(i):
+        extract_features(frames[i].points, poses[i])
+    return step
+
+
+def _head_pose_case(stream):
+    estimator = HeadPoseEstimator()
+    points = [pts for _, pts in stream]
+
+    def step(i):
+        estimator.estimate(points[i])
+    return step
+
+
+def _get_ear_case(stream):
+    calibrator = EyeBlinkCalibrator(cap=None, face_mesh=None)
+    frames = [LandmarkFrame(pts, t) for t, pts in stream]
+
+    def step(i):
+        calibrator.get_ear(frames[i], LEFT_EYE)
+    return step
+
+
+def _cursor_mapping_case(stream):
+    gazes = [(f.features.gaze_x, f.features.gaze_y) for f in _warm_frames(stream)]
+
+    def step(i):
+        gx, gy = gazes[i]
+        gaze_to_screen(gx, gy, 1920, 1080, 1.0)
+    return step
+
+
+def _gaze_click_case(stream):
+    backend = RecordingBackend()
+    service = GazeClickService(injector=backend)
+    targets = [
+        gaze_to_screen(f.features.gaze_x, f.features.gaze_y, 1920, 1080, 1.0)
+        for f in _warm_frames(stream)
+    ]
+
+    def step(i):
+        x, y = targets[i]
+        service.update_and_maybe_click(x, y, i / 30.0)
+    return step
+
+
+CASES = {
+    "MouthClicker.update": _controller_case(lambda inj: MouthClicker(injector=inj)),
+    "EyebrowScroller.update": _controller_case(lambda inj: EyebrowScroller(injector=inj)),
+    "LipScrollController.update": _controller_case(lambda inj: LipScrollController(injector=inj)),
+    "LipEyebrowScrollController.update": _controller_case(lambda inj: LipEyebrowScrollController(injector=inj)),
+    "BlinkClicker.update": _controller_case(lambda inj: BlinkClicker(injector=inj)),
+    "GesturePipeline.update (cold frame)": _pipeline_case,
+    "extract_features": _features_case,
+    "HeadPoseEstimator.estimate": _head_pose_case,
+    "EyeBlinkCalibrator.get_ear": _get_ear_case,
+    "cursor mapping (gaze_to_screen)": _cursor_mapping_case,
+    "GazeClickService.update_and_maybe_click": _gaze_click_case,
+}
+
+
+# ------------------- Measurement -------------------
+def measure(make_step, stream, repeat=5):
+    """Returns {"us_per_call", "us_worst_run", "alloc_peak_bytes", "calls"} for one case."""
+    n = len(stream)
+    runs = []
+    sink = io.StringIO()
+
+    with contextlib.redirect_stdout(sink):     # dwell/debug prints are not part of the cost
+        for _ in range(repeat):
+            step = make_step(stream)
+            gc.collect()
+            gc.disable()
+            try:
+                t0 = time.perf_counter_ns()
+                for i in range(n):
+                    step(i)
+                runs.append((time.perf_counter_ns() - t0) / 1000.0 / n)
+            finally:
+                gc.enable()
+
+        # Allocations in a separate pass: tracing distorts timing
+        step = make_step(stream)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            for i in range(n):
+                step(i)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "us_per_call": round(statistics.median(runs), 3),
+        "us_worst_run": round(max(runs), 3),
+        "alloc_peak_bytes": int(peak - base),
+        "calls": n,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Returns a list of human-readable regressions (empty if none)."""
+    problems = []
+    for name, cur in results.items():
+        ref = baseline.get(name)
+        if ref is None:
+            continue
+        limit = ref["us_per_call"] * (1.0 + tolerance)
+        if cur["us_per_call"] > limit and cur["us_per_call"] - ref["us_per_call"] > MIN_US_DELTA:
+            problems.append(
+                f"{name}: {cur['us_per_call']:.2f} us/call vs baseline {ref['us_per_call']:.2f} "
+                f"(+{100.0 * (cur['us_per_call'] / ref['us_per_call'] - 1.0):.0f}%)"
+            )
+        mem_limit = ref["alloc_peak_bytes"] * (1.0 + tolerance) + MIN_BYTES_DELTA
+        if cur["alloc_peak_bytes"] > mem_limit:
+            problems.append(
+                f"{name}: peak allocation {cur['alloc_peak_bytes']} B vs baseline {ref['alloc_peak_bytes']} B"
+            )
+    return problems
+
+
+def run(names=None, frames=3000, repeat=5, recording=None):
+    stream = recorded_stream(recording, frames) if recording else synthetic_stream(frames)
+    results = {}
+    for name, make_step in CASES.items():
+        if names and name not in names:
+            continue
+        results[name] = measure(make_step, stream, repeat)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--recording", help="SessionRecorder file to use instead of the synthetic stream")
+    parser.add_argument("--only", nargs="+", choices=list(CASES), metavar="CASE")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown ratio (0.25 = +25%%)")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.only, args.frames, args.repeat, args.recording)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("results", {})
+
+    width = max(len(n) for n in results)
+    print(f"{'case':<{width}}  {'us/call':>9}  {'baseline':>9}  {'peak alloc':>10}")
+    for name, r in results.items():
+        ref = baseline.get(name, {}).get("us_per_call")
+        ref_s = f"{ref:9.2f}" if ref is not None else f"{'-':>9}"
+        print(f"{name:<{width}}  {r['us_per_call']:9.2f}  {ref_s}  {r['alloc_peak_bytes']:>9}B")
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "machine": {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "processor": platform.processor() or platform.machine(),
+                },
+                "stream": args.recording or f"synthetic:{args.frames}",
+                "results": results,
+            }, f, indent=4)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    problems = compare(results, baseline, args.tolerance)
+    for p in problems:
+        print(f"REGRESSION {p}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
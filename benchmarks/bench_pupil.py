@@ -0,0 +1,163 @@
+"""
+Pupil detection benchmark: the current Pupil against the original code.
+
+Runs both implementations over the same eye crops at several thresholds,
+checks that every centroid is identical and reports the cost per crop.
+The crops are synthetic by default; --video collects real ones with
+GazeTracking (needs dlib and a face in the video) and --save-crops keeps
+them for later runs with --crops.
+
+    python -m benchmarks.bench_pupil
+    python -m benchmarks.bench_pupil --video clip.mp4 --save-crops crops.npz
+    python -m benchmarks.bench_pupil --crops crops.npz
+
+Exits with code 1 if any centroid differs.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from gaze_tracking.pupil import Pupil
+
+THRESHOLDS = (10, 25, 40, 55, 70, 85)
+
+
+def reference_centroid(eye_frame, threshold):
+    """Pupil.detect_iris as it was before the fast path"""
+    kernel = np.ones((3, 3), np.uint8)
+    new_frame = cv2.bilateralFilter(eye_frame, 10, 15, 15)
+    new_frame = cv2.erode(new_frame, kernel, iterations=3)
+    iris_frame = cv2.threshold(new_frame, threshold, 255, cv2.THRESH_BINARY)[1]
+
+    contours, _ = cv2.findContours(iris_frame, cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE)[-2:]
+    contours = sorted(contours, key=cv2.contourArea)
+    try:
+        moments = cv2.moments(contours[-2])
+        return int(moments['m10'] / moments['m00']), int(moments['m01'] / moments['m00'])
+    except (IndexError, ZeroDivisionError):
+        return None, None
+
+
+def current_centroid(eye_frame, threshold):
+    pupil = Pupil(eye_frame, threshold)
+    return pupil.x, pupil.y
+
+
+# ------------------- Crops -------------------
+def synthetic_crops(n, seed=0):
+    """Eye crops shaped like Eye.frame: an eye-shaped region of skin with a
+    dark iris, white (255) outside the eye polygon, with noise and glints"""
+    rng = np.random.default_rng(seed)
+    crops = []
+    for _ in range(n):
+        h, w = int(rng.integers(18, 40)), int(rng.integers(40, 90))
+        crop = rng.normal(rng.uniform(110, 170), rng.uniform(4, 20), (h, w))
+
+        iris_r = rng.uniform(0.25, 0.45) * h
+        cx, cy = rng.uniform(0.3, 0.7) * w, rng.uniform(0.35, 0.65) * h
+        cv2.circle(crop, (int(cx), int(cy)), max(2, int(iris_r)), float(rng.uniform(15, 60)), -1)
+        cv2.circle(crop, (int(cx), int(cy)), max(1, int(iris_r / 2.5)), float(rng.uniform(0, 25)), -1)
+        for _ in range(int(rng.integers(0, 3))):    # glints
+            g = (int(cx + rng.normal(0, iris_r / 2)), int(cy + rng.normal(0, iris_r / 2)))
+            cv2.circle(crop, g, 1, 230.0, -1)
+        if rng.random() < 0.3:                      # lashes / shadow along the lid
+            cv2.line(crop, (5, int(h * 0.3)), (w - 5, int(h * 0.25)), float(rng.uniform(20, 70)), 2)
+
+        mask = np.zeros((h, w), np.uint8)
+        cv2.ellipse(mask, (w // 2, h // 2), (w // 2 - 5, h // 2 - 5), 0, 0, 360, 255, -1)
+        crop[mask == 0] = 255
+        crops.append(np.clip(crop, 0, 255).astype(np.uint8))
+    return crops
+
+
+def video_crops(path, limit):
+    """Both eye crops of every frame where GazeTracking found a face"""
+    from gaze_tracking import GazeTracking
+
+    gaze = GazeTracking()
+    capture = cv2.VideoCapture(path)
+    crops = []
+    try:
+        while len(crops) < limit:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            gaze.refresh(frame)
+            for eye in (gaze.eye_left, gaze.eye_right):
+                if eye is not None and eye.frame is not None and eye.frame.size:
+                    crops.append(eye.frame.copy())
+    finally:
+        capture.release()
+    return crops[:limit]
+
+
+def load_crops(path):
+    with np.load(path) as data:
+        return [data[key] for key in sorted(data.files, key=lambda k: int(k.split("_")[1]))]
+
+
+def save_crops(path, crops):
+    np.savez_compressed(path, **{"crop_{}".format(i): c for i, c in enumerate(crops)})
+
+
+# ------------------- Run -------------------
+def time_per_crop(fn, crops, repeat):
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for crop in crops:
+            for threshold in THRESHOLDS:
+                fn(crop, threshold)
+        runs.append((time.perf_counter() - t0) / (len(crops) * len(THRESHOLDS)) * 1e6)
+    return statistics.median(runs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--crops", help=".npz of grayscale eye crops (see --save-crops)")
+    parser.add_argument("--video", help="collect eye crops from this video with GazeTracking")
+    parser.add_argument("--count", type=int, default=2000, help="number of crops")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save-crops", help="write the crops used to this .npz")
+    args = parser.parse_args(argv)
+
+    if args.crops:
+        crops, source = load_crops(args.crops)[:args.count], args.crops
+    elif args.video:
+        crops, source = video_crops(args.video, args.count), args.video
+    else:
+        crops, source = synthetic_crops(args.count), "synthetic"
+    if not crops:
+        print("no eye crops found in {}".format(source))
+        return 1
+    if args.save_crops:
+        save_crops(args.save_crops, crops)
+
+    mismatches = 0
+    for i, crop in enumerate(crops):
+        for threshold in THRESHOLDS:
+            expected = reference_centroid(crop, threshold)
+            got = current_centroid(crop, threshold)
+            if got != expected:
+                mismatches += 1
+                if mismatches <= 10:
+                    print("crop {} threshold {}: expected {} got {}".format(i, threshold, expected, got))
+
+    reference = time_per_crop(reference_centroid, crops, args.repeat)
+    current = time_per_crop(current_centroid, crops, args.repeat)
+
+    checks = len(crops) * len(THRESHOLDS)
+    print("crops: {} ({}), thresholds: {}".format(len(crops), source, ", ".join(map(str, THRESHOLDS))))
+    print("{:<10} {:>10}".format("", "us/crop"))
+    print("{:<10} {:>10.1f}".format("reference", reference))
+    print("{:<10} {:>10.1f}   x{:.2f}".format("current", current, reference / current))
+    print("identical centroids: {}/{}".format(checks - mismatches, checks))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Landmark streams for the benchmarks: synthetic gestures or a recorded session."""
+import math
+
+import numpy as np
+
+from backend.services.face_features import LEFT_EYE, RIGHT_EYE
+from backend.services.session_recording import SessionReader
+
+FPS = 30.0
+
+
+def neutral_face(seed=0):
+    """A (478, 3) face with plausible geometry at every index the controllers read."""
+    rng = np.random.default_rng(seed)
+    pts = rng.uniform(0.35, 0.65, size=(478, 3)).astype(np.float32)
+    pts[:, 2] *= 0.1
+
+    # Eyes 0.1 wide, lids 0.03 from the corner line
+    for eye, x0 in ((LEFT_EYE, 0.35), (RIGHT_EYE, 0.55)):
+        p1, p2, p3, p4, p5, p6 = eye
+        pts[[p1, p4], :2] = [[x0, 0.42], [x0 + 0.1, 0.42]]
+        pts[[p2, p3], :2] = [[x0 + 0.03, 0.39], [x0 + 0.07, 0.39]]
+        pts[[p6, p5], :2] = [[x0 + 0.03, 0.45], [x0 + 0.07, 0.45]]
+    pts[[159, 386], :2] = [[0.40, 0.39], [0.60, 0.39]]      # upper lids
+    pts[[145, 374], :2] = [[0.40, 0.45], [0.60, 0.45]]      # lower lids
+    pts[[468, 473], :2] = [[0.40, 0.42], [0.60, 0.42]]      # iris centers
+    pts[[105, 334], :2] = [[0.40, 0.34], [0.60, 0.34]]      # brows
+    pts[1] = [0.5, 0.52, -0.05]                             # nose tip
+    pts[[61, 291, 13, 14], :2] = [[0.45, 0.65], [0.55, 0.65], [0.5, 0.65], [0.5, 0.65]]
+    return pts
+
+
+def synthetic_stream(frames=3000, seed=0):
+    """
+    (timestamp, points) at 30 fps with sensor jitter, slow head sway and a
+    gesture schedule (mouth click, long open, blink, pucker + brow lower), so
+    every controller walks through its state machine, not just its idle path.
+    """
+    rng = np.random.default_rng(seed)
+    base = neutral_face(seed)
+    center = base.mean(axis=0)
+    out = []
+    for i in range(frames):
+        t = i / FPS
+        pts = base.copy()
+        phase = t % 12.0
+
+        if 1.0 <= phase < 1.3:                      # short open -> left click
+            pts[14, 1] += 0.04
+        elif 3.0 <= phase < 4.0:                    # long open -> right click
+            pts[14, 1] += 0.04
+        elif 5.0 <= phase < 5.2:                    # left blink
+            pts[[160, 158, 159], 1] += 0.028
+            pts[[144, 153, 145], 1] -= 0.028
+        elif 7.0 <= phase < 10.0:                   # pucker; brows drop in the second half
+            pts[[61, 291], 0] += [0.02, -0.02]
+            if phase >= 8.5:
+                pts[[105, 334], 1] += 0.01
+                pts[[468, 473], 1] -= 0.02          # look up while puckered
+
+        # head sway (yaw/roll) around the face center, plus jitter
+        a = 0.05 * math.sin(2 * math.pi * t / 6.0)
+        c, s = math.cos(a), math.sin(a)
+        rot = np.array([[c, -0.2 * s, s], [0.2 * s, 1.0, 0.0], [-s, 0.0, c]], dtype=np.float32)
+        pts = (pts - center) @ rot.T + center
+        pts += rng.normal(0.0, 0.0008, size=pts.shape).astype(np.float32)
+        out.append((t, pts.astype(np.float32)))
+    return out
+
+
+def recorded_stream(path, frames=None):
+    """(timestamp, points) copies from a SessionRecorder file (at most `frames`)."""
+    out = []
+    with SessionReader(path) as reader:
+        for t, pts in reader:
+            out.append((t, np.array(pts)))
+            if frames is not None and len(out) >= frames:
+                break
+    return out
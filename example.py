@@ -6,7 +6,8 @@ Check the README.md for complete documentation.
 import cv2
 from gaze_tracking import GazeTracking
 
-gaze = GazeTracking()
+# Full face detection every 10th frame, the face box is tracked in between
+gaze = GazeTracking(detect_interval=10)
 webcam = cv2.VideoCapture(0)
 
 while True:
@@ -1 +1,11 @@
-from .gaze_tracking import GazeTracking
+from .gaze_result import GazeResult
+from .batch import analyze_video, analyze_iter
+
+
+def __getattr__(name):
+    # GazeTracking needs dlib: import it on first use, so the dlib-free
+    # submodules (pupil, calibration, batch) load without it
+    if name == "GazeTracking":
+        from .gaze_tracking import GazeTracking
+        return GazeTracking
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -0,0 +1,191 @@
+"""
+Stand-in for dlib in the gaze_tracking tests, with synthetic face frames.
+
+The detector returns the bounding box of the bright face area of a frame
+and the predictor places 68 landmarks on a fixed template inside the box,
+so the whole pipeline (calibration, eye isolation, pupil detection,
+tracking between detections) runs on deterministic input without dlib or
+its model file.
+
+    _fake_dlib.install()        # before GazeTracking is created
+    frame = _fake_dlib.face_frame(0)
+"""
+import math
+import sys
+import types
+
+import numpy as np
+import cv2
+
+FRAME_SHAPE = (240, 320)
+FACE_SIZE = (160, 180)          # width, height
+EYE_CENTERS = ((0.28, 0.34), (0.72, 0.34))      # left, right, relative to the face box
+EYE_HALF_WIDTH, EYE_HALF_HEIGHT = 0.11, 0.05
+
+
+class point(object):
+    def __init__(self, x, y):
+        self.x = int(x)
+        self.y = int(y)
+
+
+class rectangle(object):
+    def __init__(self, left, top, right, bottom):
+        self._edges = (int(left), int(top), int(right), int(bottom))
+
+    def left(self):
+        return self._edges[0]
+
+    def top(self):
+        return self._edges[1]
+
+    def right(self):
+        return self._edges[2]
+
+    def bottom(self):
+        return self._edges[3]
+
+    def __eq__(self, other):
+        return isinstance(other, rectangle) and self._edges == other._edges
+
+    def __repr__(self):
+        return "rectangle{}".format(self._edges)
+
+
+class full_object_detection(object):
+    def __init__(self, points, rect):
+        self._points = [point(x, y) for x, y in points]
+        self.num_parts = len(self._points)
+        self.rect = rect
+
+    def part(self, i):
+        return self._points[i]
+
+    def parts(self):
+        return list(self._points)
+
+
+def _template():
+    """68 landmark positions relative to the face box (0..1)"""
+    points = np.zeros((68, 2))
+    jaw = np.linspace(0, math.pi, 17)
+    points[:17] = np.stack([0.5 - 0.48 * np.cos(jaw), 0.3 + 0.68 * np.sin(jaw)], axis=1)
+    points[17:27] = np.stack([np.linspace(0.15, 0.85, 10), np.full(10, 0.22)], axis=1)  # brows
+    points[27:36] = np.stack([np.full(9, 0.5), np.linspace(0.35, 0.65, 9)], axis=1)     # nose
+    for start, (cx, cy) in zip((36, 42), EYE_CENTERS):
+        w, h = EYE_HALF_WIDTH, EYE_HALF_HEIGHT
+        points[start:start + 6] = [
+            (cx - w, cy), (cx - w / 3, cy - h), (cx + w / 3, cy - h),
+            (cx + w, cy), (cx + w / 3, cy + h), (cx - w / 3, cy + h),
+        ]
+    mouth = np.linspace(0, 2 * math.pi, 20, endpoint=False)
+    points[48:68] = np.stack([0.5 + 0.18 * np.cos(mouth), 0.8 + 0.06 * np.sin(mouth)], axis=1)
+    return points
+
+
+TEMPLATE = _template()
+
+
+def _face_box(gray, left=0, top=0):
+    """Bounding box (left, top, right, bottom) of the bright face pixels"""
+    ys, xs = np.nonzero(gray >= 150)
+    if not len(xs):
+        return None
+    return left + xs.min(), top + ys.min(), left + xs.max(), top + ys.max()
+
+
+def get_frontal_face_detector():
+    def detect(gray, upsample=0):
+        box = _face_box(gray)
+        return [rectangle(*box)] if box is not None else []
+    return detect
+
+
+def shape_predictor(path):
+    def predict(gray, rect):
+        # Like dlib, fits the face seen inside rect: a stale box gives
+        # landmarks that no longer line up with it
+        left, top = max(0, rect.left()), max(0, rect.top())
+        box = _face_box(gray[top:rect.bottom() + 1, left:rect.right() + 1], left, top)
+        if box is None:
+            box = (rect.left(), rect.top(), rect.right(), rect.bottom())
+        size = np.array([box[2] - box[0], box[3] - box[1]], float)
+        points = np.array(box[:2]) + TEMPLATE * size
+        return full_object_detection(np.round(points), rect)
+    return predict
+
+
+def landmarks(gray):
+    """Landmarks of the face in a grayscale frame, as the fake predictor
+    gives them to GazeTracking (None without a face)"""
+    faces = get_frontal_face_detector()(gray)
+    return shape_predictor(None)(gray, faces[0]) if faces else None
+
+
+def face_frame(i, shift=0, seed=None):
+    """BGR frame i of a synthetic clip: a face whose irises move with i and
+    whose lighting changes, so calibration and pupils differ between frames
+
+    Arguments:
+        i (int): Frame number
+        shift (int): Horizontal offset of the face, in pixels
+        seed (int): Noise seed (default: i)
+    """
+    rng = np.random.default_rng(i if seed is None else seed)
+    h, w = FRAME_SHAPE
+    frame = np.full((h, w), 40, np.float64)
+    fw, fh = FACE_SIZE
+    x0, y0 = (w - fw) // 2 + shift, (h - fh) // 2
+    frame[y0:y0 + fh, x0:x0 + fw] = 180 + 15 * math.sin(i / 7.0)
+
+    gaze = (6 * math.sin(i / 5.0), 2 * math.cos(i / 4.0))
+    for cx, cy in EYE_CENTERS:
+        center = (int(x0 + cx * fw), int(y0 + cy * fh))
+        axes = (int(EYE_HALF_WIDTH * fw), int(EYE_HALF_HEIGHT * fh) + 2)
+        cv2.ellipse(frame, center, axes, 0, 0, 360, 215.0, -1)
+        iris = (int(center[0] + gaze[0]), int(center[1] + gaze[1]))
+        cv2.circle(frame, iris, 7, 70.0 + 20 * math.cos(i / 3.0), -1)
+        cv2.circle(frame, iris, 3, 25.0, -1)
+
+    frame += rng.normal(0, 4, frame.shape)
+    gray = np.clip(frame, 0, 255).astype(np.uint8)
+    return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+
+
+# ------------------- Installation -------------------
+_saved = {}
+
+
+def _module():
+    module = types.ModuleType("dlib")
+    module.__file__ = __file__
+    for name in ("point", "rectangle", "full_object_detection", "get_frontal_face_detector", "shape_predictor"):
+        setattr(module, name, globals()[name])
+    return module
+
+
+def install():
+    """Replaces dlib with this stand-in for the gaze_tracking modules
+    (also when the real dlib is installed and already imported)"""
+    fake = _module()
+    _saved.setdefault("dlib", sys.modules.get("dlib"))
+    sys.modules["dlib"] = fake
+
+    from . import models, gaze_tracking
+    for module in (models, gaze_tracking):
+        _saved.setdefault(module, module.dlib)
+        module.dlib = fake
+    models.clear()
+
+
+def uninstall():
+    """Puts the real dlib (or nothing) back"""
+    from . import models
+    real = _saved.pop("dlib", None)
+    if real is None:
+        sys.modules.pop("dlib", None)
+    else:
+        sys.modules["dlib"] = real
+    for module in list(_saved):
+        module.dlib = _saved.pop(module)
+    models.clear()
@@ -0,0 +1,194 @@
+from __future__ import division
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import numpy as np
+import cv2
+
+
+# One row per frame; missing values (no face, pupils not located) are NaN
+RESULT_DTYPE = np.dtype([
+    ("frame", np.int64),
+    ("time", np.float64),               # seconds from the start of the video (NaN for iterators)
+    ("located", np.bool_),
+    ("pupil_left_x", np.float32),
+    ("pupil_left_y", np.float32),
+    ("pupil_right_x", np.float32),
+    ("pupil_right_y", np.float32),
+    ("horizontal_ratio", np.float32),
+    ("vertical_ratio", np.float32),
+    ("blinking_left", np.float32),
+    ("blinking_right", np.float32),
+])
+
+
+def _to_array(results, first_index=0, fps=None):
+    """Packs a list of GazeResult into a RESULT_DTYPE array"""
+    out = _empty(len(results))
+    out["frame"] = np.arange(first_index, first_index + len(results))
+    if fps:
+        out["time"] = out["frame"] / fps
+    for row, result in zip(out, results):
+        if not result.located:
+            continue
+        row["located"] = True
+        row["pupil_left_x"], row["pupil_left_y"] = result.pupil_left
+        row["pupil_right_x"], row["pupil_right_y"] = result.pupil_right
+        for name in ("horizontal_ratio", "vertical_ratio", "blinking_left", "blinking_right"):
+            value = getattr(result, name)
+            if value is not None:
+                row[name] = value
+    return out
+
+
+def _empty(n):
+    out = np.zeros(n, dtype=RESULT_DTYPE)
+    for name in RESULT_DTYPE.names[3:]:
+        out[name] = np.nan
+    out["time"] = np.nan
+    return out
+
+
+def analyze_frames(frames, tracker=None, first_index=0, fps=None, **tracker_kwargs):
+    """Runs GazeTracking over an iterable of BGR frames in this process.
+
+    Arguments:
+        frames (iterable): BGR frames (numpy.ndarray)
+        tracker (GazeTracking): Tracker to use (a new one is created otherwise,
+            with tracker_kwargs)
+        first_index (int): Frame number of the first frame
+        fps (float): Frame rate, to fill the time column
+
+    Returns:
+        numpy structured array with RESULT_DTYPE, one row per frame
+    """
+    if tracker is None:
+        from .gaze_tracking import GazeTracking
+        tracker = GazeTracking(**tracker_kwargs)
+
+    results = []
+    for frame in frames:
+        tracker.refresh(frame)
+        results.append(tracker.result)
+    return _to_array(results, first_index, fps)
+
+
+def _read_video(path, start, stop):
+    """Yields frames start..stop-1 of a video file"""
+    capture = cv2.VideoCapture(path)
+    try:
+        if start:
+            capture.set(cv2.CAP_PROP_POS_FRAMES, start)
+        for _ in range(stop - start):
+            ret, frame = capture.read()
+            if not ret:
+                break
+            yield frame
+    finally:
+        capture.release()
+
+
+def _analyze_shard(path, start, stop, warmup, fps, tracker_kwargs):
+    """Worker: analyzes frames start..stop-1 with its own tracker and predictor.
+
+    The `warmup` frames before the shard are analyzed first and discarded,
+    so calibration and face tracking are settled when the shard begins.
+    """
+    from .gaze_tracking import GazeTracking
+    tracker = GazeTracking(**tracker_kwargs)
+
+    begin = max(0, start - warmup)
+    frames = _read_video(path, begin, stop)
+    for frame in islice(frames, start - begin):
+        tracker.refresh(frame)
+    return analyze_frames(frames, tracker, first_index=start, fps=fps)
+
+
+def _analyze_chunk(first_index, frames, tracker_kwargs):
+    """Analyzes one chunk with a new tracker (the dlib models are shared per
+    process), so its rows do not depend on which chunks ran before it"""
+    return analyze_frames(frames, first_index=first_index, **tracker_kwargs)
+
+
+def analyze_video(path, workers=None, start=0, stop=None, warmup=30, **tracker_kwargs):
+    """Analyzes a video file on several processes and returns one row per frame.
+
+    The frame range is split into one contiguous shard per worker. Every
+    worker opens the video itself, seeks to its shard and runs its own
+    GazeTracking (and so loads its own dlib predictor); rows come back in
+    frame order.
+
+    Arguments:
+        path (str): Video file
+        workers (int): Worker processes (default: CPU count)
+        start, stop (int): Frame range to analyze (stop=None: to the end)
+        warmup (int): Frames before each shard used to settle calibration
+            and tracking, not included in the output
+        tracker_kwargs: Passed to GazeTracking (e.g. detect_interval=10)
+
+    Returns:
+        numpy structured array with RESULT_DTYPE
+    """
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise IOError("Cannot open video: {}".format(path))
+    total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = capture.get(cv2.CAP_PROP_FPS) or None
+    capture.release()
+
+    stop = total if stop is None else min(stop, total)
+    if stop <= start:
+        return _empty(0)
+
+    workers = max(1, min(workers or os.cpu_count() or 1, stop - start))
+    bounds = np.linspace(start, stop, workers + 1).astype(int)
+    shards = [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    if workers == 1:
+        return _analyze_shard(path, start, stop, 0, fps, tracker_kwargs)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_analyze_shard, path, a, b, warmup if a > start else 0, fps, tracker_kwargs)
+            for a, b in shards
+        ]
+        return np.concatenate([f.result() for f in futures])
+
+
+def analyze_iter(frames, workers=None, chunk_frames=256, **tracker_kwargs):
+    """Analyzes an iterable of BGR frames on several processes.
+
+    Frames are sent to the workers in chunks of chunk_frames. Every chunk
+    starts a new GazeTracking (calibration and face tracking start over at
+    each chunk), so the rows are the same whatever the number of workers
+    and however the chunks are scheduled. Rows come back in input order.
+
+    Returns:
+        numpy structured array with RESULT_DTYPE
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    frames = iter(frames)
+
+    def chunks():
+        index = 0
+        while True:
+            chunk = list(islice(frames, chunk_frames))
+            if not chunk:
+                return
+            yield index, chunk
+            index += len(chunk)
+
+    if workers == 1:
+        results = [_analyze_chunk(index, chunk, tracker_kwargs) for index, chunk in chunks()]
+        return np.concatenate(results) if results else _empty(0)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # keep a bounded number of chunks in flight so long streams don't pile up in memory
+        pending, results = [], []
+        for index, chunk in chunks():
+            pending.append(pool.submit(_analyze_chunk, index, chunk, tracker_kwargs))
+            if len(pending) >= 2 * workers:
+                results.append(pending.pop(0).result())
+        results.extend(f.result() for f in pending)
+
+    return np.concatenate(results) if results else _empty(0)
@@ -1,5 +1,6 @@
 from __future__ import division
 import cv2
+import numpy as np
 from .pupil import Pupil
 
 
@@ -18,6 +19,17 @@ class Calibration(object):
         """Returns true if the calibration is completed"""
         return len(self.thresholds_left) >= self.nb_frames and len(self.thresholds_right) >= self.nb_frames
 
+    def evaluation_plan(self):
+        """Returns (left, right): whether each eye of the current frame should
+        be evaluated, exactly as a serial left-then-right pass would decide.
+        Lets both eyes be processed concurrently without racing on
+        is_complete().
+        """
+        left = not self.is_complete()
+        right = not (len(self.thresholds_left) + left >= self.nb_frames
+                     and len(self.thresholds_right) >= self.nb_frames)
+        return left, right
+
     def threshold(self, side):
         """Returns the threshold value for the given eye.
 
@@ -48,15 +60,22 @@ class Calibration(object):
         """Calculates the optimal threshold to binarize the
         frame for the given eye.
 
+        The eye is filtered once; the iris size for every candidate
+        threshold is then read off the cumulative histogram of the filtered
+        pixels (binarizing at t turns every pixel <= t black), which gives
+        the same sizes as binarizing once per threshold.
+
         Argument:
             eye_frame (numpy.ndarray): Frame of the eye to be analyzed
         """
         average_iris_size = 0.48
-        trials = {}
+        thresholds = range(5, 100, 5)
+
+        filtered = Pupil.filter(eye_frame)[5:-5, 5:-5]
+        nb_pixels = filtered.shape[0] * filtered.shape[1]
+        blacks = np.cumsum(np.bincount(filtered.ravel(), minlength=256))
 
-        for threshold in range(5, 100, 5):
-            iris_frame = Pupil.image_processing(eye_frame, threshold)
-            trials[threshold] = Calibration.iris_size(iris_frame)
+        trials = {threshold: int(blacks[threshold]) / nb_pixels for threshold in thresholds}
 
         best_threshold, iris_size = min(trials.items(), key=(lambda p: abs(p[1] - average_iris_size)))
         return best_threshold
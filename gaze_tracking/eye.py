@@ -1,9 +1,24 @@
 import math
+import threading
 import numpy as np
 import cv2
 from .pupil import Pupil
 
 
+# Per-thread scratch mask, grown as needed and reused for every eye
+_scratch = threading.local()
+
+
+def _mask_buffer(height, width):
+    """Returns a reusable (height, width) uint8 view for eye masking"""
+    buffer = getattr(_scratch, "mask", None)
+    if buffer is None or buffer.shape[0] < height or buffer.shape[1] < width:
+        rows, cols = (64, 64) if buffer is None else buffer.shape
+        buffer = np.empty((max(height, rows), max(width, cols)), np.uint8)
+        _scratch.mask = buffer
+    return buffer[:height, :width]
+
+
 class Eye(object):
     """
     This class creates a new frame to isolate the eye and
@@ -13,14 +28,14 @@ class Eye(object):
     LEFT_EYE_POINTS = [36, 37, 38, 39, 40, 41]
     RIGHT_EYE_POINTS = [42, 43, 44, 45, 46, 47]
 
-    def __init__(self, original_frame, landmarks, side, calibration):
+    def __init__(self, original_frame, landmarks, side, calibration, calibrate=None):
         self.frame = None
         self.origin = None
         self.center = None
         self.pupil = None
         self.landmark_points = None
 
-        self._analyze(original_frame, landmarks, side, calibration)
+        self._analyze(original_frame, landmarks, side, calibration, calibrate)
 
     @staticmethod
     def _middle_point(p1, p2):
@@ -46,13 +61,6 @@ class Eye(object):
         region = region.astype(np.int32)
         self.landmark_points = region
 
-        # Applying a mask to get only the eye
-        height, width = frame.shape[:2]
-        black_frame = np.zeros((height, width), np.uint8)
-        mask = np.full((height, width), 255, np.uint8)
-        cv2.fillPoly(mask, [region], (0, 0, 0))
-        eye = cv2.bitwise_not(black_frame, frame.copy(), mask=mask)
-
         # Cropping on the eye
         margin = 5
         min_x = np.min(region[:, 0]) - margin
@@ -60,7 +68,19 @@ class Eye(object):
         min_y = np.min(region[:, 1]) - margin
         max_y = np.max(region[:, 1]) + margin
 
-        self.frame = eye[min_y:max_y, min_x:max_x]
+        # Applying a mask to get only the eye, inside the crop only: pixels
+        # outside the eye polygon become white
+        rows, cols = slice(min_y, max_y), slice(min_x, max_x)
+        roi = frame[rows, cols]
+        if roi.size == 0:
+            self.frame = roi.copy()
+        else:
+            top = rows.indices(frame.shape[0])[0]
+            left = cols.indices(frame.shape[1])[0]
+            mask = _mask_buffer(roi.shape[0], roi.shape[1])
+            mask.fill(255)
+            cv2.fillPoly(mask, [region], (0, 0, 0), offset=(-left, -top))
+            self.frame = cv2.bitwise_or(roi, mask)
         self.origin = (min_x, min_y)
 
         height, width = self.frame.shape[:2]
@@ -92,7 +112,7 @@ class Eye(object):
 
         return ratio
 
-    def _analyze(self, original_frame, landmarks, side, calibration):
+    def _analyze(self, original_frame, landmarks, side, calibration, calibrate=None):
         """Detects and isolates the eye in a new frame, sends data to the calibration
         and initializes Pupil object.
 
@@ -101,6 +121,8 @@ class Eye(object):
             landmarks (dlib.full_object_detection): Facial landmarks for the face region
             side: Indicates whether it's the left eye (0) or the right eye (1)
             calibration (calibration.Calibration): Manages the binarization threshold value
+            calibrate (bool): Whether to feed this eye to the calibration
+                (None: if the calibration is not complete yet)
         """
         if side == 0:
             points = self.LEFT_EYE_POINTS
@@ -112,7 +134,9 @@ class Eye(object):
         self.blinking = self._blinking_ratio(landmarks, points)
         self._isolate(original_frame, landmarks, points)
 
-        if not calibration.is_complete():
+        if calibrate is None:
+            calibrate = not calibration.is_complete()
+        if calibrate:
             calibration.evaluate(self.frame, side)
 
         threshold = calibration.threshold(side)
@@ -0,0 +1,75 @@
+from __future__ import division
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class GazeResult(object):
+    """
+    Everything GazeTracking knows about one frame, computed once in
+    refresh(). When the pupils are not located every other field is None,
+    which is what the GazeTracking accessors have always returned then.
+    """
+
+    located: bool = False
+    pupil_left: Optional[Tuple[int, int]] = None
+    pupil_right: Optional[Tuple[int, int]] = None
+    horizontal_ratio: Optional[float] = None
+    vertical_ratio: Optional[float] = None
+    blinking_left: Optional[float] = None       # eye width / height, larger when closed
+    blinking_right: Optional[float] = None
+    is_right: Optional[bool] = None
+    is_left: Optional[bool] = None
+    is_center: Optional[bool] = None
+    is_blinking: Optional[bool] = None
+    is_left_blinking: Optional[bool] = None
+    is_right_blinking: Optional[bool] = None
+
+    @staticmethod
+    def pupils_located(eye_left, eye_right):
+        """Check that the pupils of both Eye objects have been located"""
+        try:
+            int(eye_left.pupil.x)
+            int(eye_left.pupil.y)
+            int(eye_right.pupil.x)
+            int(eye_right.pupil.y)
+            return True
+        except Exception:
+            return False
+
+    @classmethod
+    def from_eyes(cls, eye_left, eye_right):
+        """Builds the result for one frame from its two Eye objects"""
+        if not cls.pupils_located(eye_left, eye_right):
+            return cls()
+
+        def ratio(axis):
+            try:
+                pupil_left = (eye_left.pupil.x, eye_left.pupil.y)[axis] / (eye_left.center[axis] * 2 - 10)
+                pupil_right = (eye_right.pupil.x, eye_right.pupil.y)[axis] / (eye_right.center[axis] * 2 - 10)
+            except ZeroDivisionError:
+                return None
+            return (pupil_left + pupil_right) / 2
+
+        horizontal = ratio(0)
+        is_right = horizontal <= 0.35 if horizontal is not None else None
+        is_left = horizontal >= 0.65 if horizontal is not None else None
+
+        left_b, right_b = eye_left.blinking, eye_right.blinking
+        both_b = left_b is not None and right_b is not None
+
+        return cls(
+            located=True,
+            pupil_left=(eye_left.origin[0] + eye_left.pupil.x, eye_left.origin[1] + eye_left.pupil.y),
+            pupil_right=(eye_right.origin[0] + eye_right.pupil.x, eye_right.origin[1] + eye_right.pupil.y),
+            horizontal_ratio=horizontal,
+            vertical_ratio=ratio(1),
+            blinking_left=left_b,
+            blinking_right=right_b,
+            is_right=is_right,
+            is_left=is_left,
+            is_center=is_right is not True and is_left is not True,
+            is_blinking=(left_b + right_b) / 2 > 3.8 if both_b else None,
+            is_left_blinking=left_b > 6 and right_b <= 6 if both_b else None,
+            is_right_blinking=right_b > 6 and left_b <= 6 if both_b else None,
+        )
@@ -1,9 +1,25 @@
 from __future__ import division
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import dlib
 from .eye import Eye
 from .calibration import Calibration
+from .gaze_result import GazeResult
+from . import models
+
+
+_eye_pool = None
+_eye_pool_lock = threading.Lock()
+
+
+def _get_eye_pool():
+    """Returns the process-wide worker used for parallel eye processing"""
+    global _eye_pool
+    with _eye_pool_lock:
+        if _eye_pool is None:
+            _eye_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gaze-eye")
+        return _eye_pool
 
 
 class GazeTracking(object):
@@ -13,45 +29,144 @@ class GazeTracking(object):
     and pupils and allows to know if the eyes are open or closed
     """
 
-    def __init__(self):
+    def __init__(self, detect_interval=1, detect_scale=1.0, track_tolerance=0.15, parallel_eyes=False):
+        """
+        Arguments:
+            detect_interval (int): Run the face detector every N frames and
+                track the face box from the landmarks in between (1 = detect
+                on every frame)
+            detect_scale (float): Downscale factor for the frame given to the
+                face detector (1.0 = full resolution)
+            track_tolerance (float): Landmark drift, as a fraction of the face
+                size, above which the tracked box is dropped and the detector
+                runs again on the next frame
+            parallel_eyes (bool): Process the right eye on a persistent worker
+                thread while the left eye runs on the caller's thread (the
+                OpenCV filtering releases the GIL); results are identical
+                to the serial path
+        """
         self.frame = None
+        self.landmarks = None           # dlib full_object_detection of the last frame's face
         self.eye_left = None
         self.eye_right = None
         self.calibration = Calibration()
+        self.result = GazeResult()
+
+        self.detect_interval = max(1, int(detect_interval))
+        self.detect_scale = float(detect_scale)
+        self.track_tolerance = float(track_tolerance)
+        self.parallel_eyes = bool(parallel_eyes)
+        self._face_box = None           # face rectangle reused until the next detection
+        self._box_offsets = None        # detector box edges relative to the landmark extents
+        self._frames_since_detect = 0
 
         # _face_detector is used to detect faces
-        self._face_detector = dlib.get_frontal_face_detector()
+        # (dlib models are loaded once per process and shared, see models.py)
+        self._face_detector = models.face_detector()
 
         # _predictor is used to get facial landmarks of a given face
-        cwd = os.path.abspath(os.path.dirname(__file__))
-        model_path = os.path.abspath(os.path.join(cwd, "trained_models/shape_predictor_68_face_landmarks.dat"))
-        self._predictor = dlib.shape_predictor(model_path)
+        self._predictor = models.shape_predictor()
 
     @property
     def pupils_located(self):
         """Check that the pupils have been located"""
-        try:
-            int(self.eye_left.pupil.x)
-            int(self.eye_left.pupil.y)
-            int(self.eye_right.pupil.x)
-            int(self.eye_right.pupil.y)
-            return True
-        except Exception:
-            return False
+        return self.result.located
+
+    def _detect_face(self, frame):
+        """Runs the face detector, on a downscaled copy if detect_scale < 1,
+        and returns the first face in full-frame coordinates (or None)
+
+        Arguments:
+            frame (numpy.ndarray): Grayscale frame
+        """
+        scale = self.detect_scale
+        if scale == 1.0:
+            faces = self._face_detector(frame)
+            return faces[0] if len(faces) else None
+
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        faces = self._face_detector(small)
+        if not len(faces):
+            return None
+        face = faces[0]
+        return dlib.rectangle(
+            int(face.left() / scale), int(face.top() / scale),
+            int(face.right() / scale), int(face.bottom() / scale),
+        )
+
+    def _face_for_frame(self, frame):
+        """Returns (face rectangle or None, whether it comes from the detector)"""
+        if self._face_box is not None and self._frames_since_detect < self.detect_interval:
+            self._frames_since_detect += 1
+            return self._face_box, False
+
+        self._frames_since_detect = 1
+        return self._detect_face(frame), True
+
+    def _track(self, landmarks, face, detected, frame_shape):
+        """Derives the face box for the next frame from these landmarks.
+
+        On detection frames it learns where the detector puts the box
+        relative to the landmark extents; on tracked frames it checks that
+        the landmarks stayed where that box expected them, and drops the
+        box (forcing a detection) if they drifted more than track_tolerance.
+        """
+        xs = [landmarks.part(i).x for i in range(landmarks.num_parts)]
+        ys = [landmarks.part(i).y for i in range(landmarks.num_parts)]
+        box = (min(xs), min(ys), max(xs), max(ys))
+        width = max(1, box[2] - box[0])
+        height = max(1, box[3] - box[1])
+        edges = (face.left(), face.top(), face.right(), face.bottom())
+        sizes = (width, height, width, height)
+
+        offsets = tuple((e - b) / d for e, b, d in zip(edges, box, sizes))
+        if detected:
+            self._box_offsets = offsets
+        else:
+            drift = max(abs(o - r) for o, r in zip(offsets, self._box_offsets))
+            if drift > self.track_tolerance:
+                self._face_box = None
+                return
+
+        frame_h, frame_w = frame_shape[:2]
+        left, top, right, bottom = (int(round(b + o * d)) for b, o, d in zip(box, self._box_offsets, sizes))
+        left, top = max(0, left), max(0, top)
+        right, bottom = min(frame_w - 1, right), min(frame_h - 1, bottom)
+        if right - left < 20 or bottom - top < 20:
+            self._face_box = None
+            return
+        self._face_box = dlib.rectangle(left, top, right, bottom)
 
     def _analyze(self):
-        """Detects the face and initialize Eye objects"""
+        """Detects (or tracks) the face and initialize Eye objects"""
         frame = cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY)
-        faces = self._face_detector(frame)
+        face, detected = self._face_for_frame(frame)
 
-        try:
-            landmarks = self._predictor(frame, faces[0])
+        if face is None:
+            self.landmarks = None
+            self.eye_left = None
+            self.eye_right = None
+            self._face_box = None
+            return
+
+        landmarks = self._predictor(frame, face)
+        self.landmarks = landmarks
+        if self.parallel_eyes:
+            # Calibration decisions are taken up front, as the serial order
+            # would take them, so each eye only touches its own thresholds
+            calibrate_left, calibrate_right = self.calibration.evaluation_plan()
+            right = _get_eye_pool().submit(Eye, frame, landmarks, 1, self.calibration, calibrate_right)
+            self.eye_left = Eye(frame, landmarks, 0, self.calibration, calibrate_left)
+            self.eye_right = right.result()
+        else:
             self.eye_left = Eye(frame, landmarks, 0, self.calibration)
             self.eye_right = Eye(frame, landmarks, 1, self.calibration)
 
-        except IndexError:
-            self.eye_left = None
-            self.eye_right = None
+        if self.detect_interval > 1:
+            if GazeResult.pupils_located(self.eye_left, self.eye_right):
+                self._track(landmarks, face, detected, frame.shape)
+            else:
+                self._face_box = None
 
     def refresh(self, frame):
         """Refreshes the frame and analyzes it.
@@ -61,82 +176,63 @@ class GazeTracking(object):
         """
         self.frame = frame
         self._analyze()
+        self.result = GazeResult.from_eyes(self.eye_left, self.eye_right)
 
     def pupil_left_coords(self):
         """Returns the coordinates of the left pupil"""
-        if self.pupils_located:
-            x = self.eye_left.origin[0] + self.eye_left.pupil.x
-            y = self.eye_left.origin[1] + self.eye_left.pupil.y
-            return (x, y)
+        return self.result.pupil_left
 
     def pupil_right_coords(self):
         """Returns the coordinates of the right pupil"""
-        if self.pupils_located:
-            x = self.eye_right.origin[0] + self.eye_right.pupil.x
-            y = self.eye_right.origin[1] + self.eye_right.pupil.y
-            return (x, y)
+        return self.result.pupil_right
 
     def horizontal_ratio(self):
         """Returns a number between 0.0 and 1.0 that indicates the
         horizontal direction of the gaze. The extreme right is 0.0,
         the center is 0.5 and the extreme left is 1.0
         """
-        if self.pupils_located:
-            pupil_left = self.eye_left.pupil.x / (self.eye_left.center[0] * 2 - 10)
-            pupil_right = self.eye_right.pupil.x / (self.eye_right.center[0] * 2 - 10)
-            return (pupil_left + pupil_right) / 2
+        return self.result.horizontal_ratio
 
     def vertical_ratio(self):
         """Returns a number between 0.0 and 1.0 that indicates the
         vertical direction of the gaze. The extreme top is 0.0,
         the center is 0.5 and the extreme bottom is 1.0
         """
-        if self.pupils_located:
-            pupil_left = self.eye_left.pupil.y / (self.eye_left.center[1] * 2 - 10)
-            pupil_right = self.eye_right.pupil.y / (self.eye_right.center[1] * 2 - 10)
-            return (pupil_left + pupil_right) / 2
+        return self.result.vertical_ratio
 
     def is_right(self):
         """Returns true if the user is looking to the right"""
-        if self.pupils_located:
-            return self.horizontal_ratio() <= 0.35
+        return self.result.is_right
 
     def is_left(self):
         """Returns true if the user is looking to the left"""
-        if self.pupils_located:
-            return self.horizontal_ratio() >= 0.65
+        return self.result.is_left
 
     def is_center(self):
         """Returns true if the user is looking to the center"""
-        if self.pupils_located:
-            return self.is_right() is not True and self.is_left() is not True
+        return self.result.is_center
 
     def is_blinking(self):
         """Returns true if the user closes his eyes"""
-        if self.pupils_located:
-            blinking_ratio = (self.eye_left.blinking + self.eye_right.blinking) / 2
-            return blinking_ratio > 3.8
+        return self.result.is_blinking
 
     def is_left_blinking(self):
         """Returns true if the user closes his eyes"""
-        if self.pupils_located:
-            blinking_ratio = self.eye_left.blinking
-            return self.eye_left.blinking > 6 and self.eye_right.blinking <= 6
+        return self.result.is_left_blinking
 
     def is_right_blinking(self):
         """Returns true if the user closes his eyes"""
-        if self.pupils_located:
-            blinking_ratio = self.eye_left.blinking
-            return self.eye_right.blinking > 6 and self.eye_left.blinking <= 6
-        
+        return self.result.is_right_blinking
+
     def annotated_frame(self):
         """Returns the main frame with pupils highlighted"""
         frame = self.frame.copy()
+        result = self.result
 
-        if self.pupils_located:
+        if result.located:
             color = (0, 255, 0)
-            x_left, y_left = self.pupil_left_coords()
-            x_right, y_right = self.pupil_right_coords()
+            x_left, y_left = result.pupil_left
+            x_right, y_right = result.pupil_right
             cv2.line(frame, (x_left - 5, y_left), (x_left + 5, y_left), color)
             cv2.line(frame, (x_left, y_left - 5), (x_left, y_left + 5), color)
             cv2.line(frame, (x_right - 5, y_right), (x_right + 5, y_right), color)
@@ -0,0 +1,82 @@
+import os
+import threading
+import dlib
+
+
+MODEL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "trained_models"))
+PREDICTOR_68 = os.path.join(MODEL_DIR, "shape_predictor_68_face_landmarks.dat")
+
+_models = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _get(key, factory):
+    """Returns the model stored under key, building it with factory() once
+    per process. Concurrent callers for the same key wait for the first
+    load instead of loading again; different keys load in parallel.
+    """
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _registry_lock:
+        lock = _locks.setdefault(key, threading.Lock())
+    with lock:
+        model = _models.get(key)
+        if model is None:
+            model = factory()
+            _models[key] = model
+    return model
+
+
+def face_detector():
+    """Returns the shared dlib HOG frontal face detector"""
+    return _get("frontal_face_detector", dlib.get_frontal_face_detector)
+
+
+def shape_predictor(path=PREDICTOR_68):
+    """Returns the shared dlib shape predictor for the given model file
+
+    Argument:
+        path (str): Path to the .dat model (defaults to the 68 landmarks model)
+    """
+    path = os.path.abspath(path)
+    return _get(("shape_predictor", path), lambda: dlib.shape_predictor(path))
+
+
+def preload(background=True, predictor_path=PREDICTOR_68):
+    """Loads the face detector and the shape predictor ahead of time.
+
+    Arguments:
+        background (bool): Load on a daemon thread and return it right away;
+            a GazeTracking created meanwhile waits for the load to finish
+            instead of starting a second one
+        predictor_path (str): Shape predictor model to load
+
+    Returns:
+        The loading thread, or None when loading in the foreground
+    """
+    def load():
+        face_detector()
+        shape_predictor(predictor_path)
+
+    if not background:
+        load()
+        return None
+
+    thread = threading.Thread(target=load, name="dlib-model-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_loaded(path=PREDICTOR_68):
+    """Returns true if the detector and the given predictor are in memory"""
+    return "frontal_face_detector" in _models and ("shape_predictor", os.path.abspath(path)) in _models
+
+
+def clear():
+    """Forgets every loaded model (they are freed once no tracker uses them)"""
+    with _registry_lock:
+        _models.clear()
+        _locks.clear()
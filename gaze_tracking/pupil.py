@@ -1,7 +1,57 @@
+import threading
 import numpy as np
 import cv2
 
 
+# Structuring element of the erosion, shared by every Pupil
+_KERNEL = np.ones((3, 3), np.uint8)
+_KERNEL.setflags(write=False)
+
+_scratch = threading.local()
+
+
+def _scratch_buffer(name, shape):
+    """Returns a uint8 array of the given shape backed by the per-thread
+    buffer called name, reused between calls (the right eye may be processed
+    on another thread, see Eye). Its content is only valid until the next
+    call with the same name on this thread.
+    """
+    size = shape[0] * shape[1]
+    buf = getattr(_scratch, name, None)
+    if buf is None or buf.size < size:
+        buf = np.empty(max(size, 64 * 64), np.uint8)
+        setattr(_scratch, name, buf)
+    return buf[:size].reshape(shape)
+
+
+def _second_largest(contours):
+    """Picks the contour sorted(contours, key=cv2.contourArea)[-2] would
+    return, in one pass instead of a full sort.
+
+    sorted() is stable, so it orders contours by (area, position in the
+    list) and the iris is the second best of that key.
+
+    Returns:
+        (contour, ambiguous): ambiguous is true when another contour has the
+        same area as one of the two largest, i.e. when the pick depends on
+        the order in which findContours listed the contours
+    """
+    areas = [cv2.contourArea(contour) for contour in contours]
+    best = second = -1
+    for i, area in enumerate(areas):
+        # >= : on ties the later contour ranks higher, as with a stable sort
+        if best < 0 or area >= areas[best]:
+            best, second = i, best
+        elif second < 0 or area >= areas[second]:
+            second = i
+
+    if second < 0:
+        raise IndexError("fewer than two contours")
+
+    ambiguous = areas.count(areas[best]) > 1 or areas.count(areas[second]) > 1
+    return contours[second], ambiguous
+
+
 class Pupil(object):
     """
     This class detects the iris of an eye and estimates
@@ -9,30 +59,50 @@ class Pupil(object):
     """
 
     def __init__(self, eye_frame, threshold):
-        self.iris_frame = None
+        self._eye_frame = eye_frame
         self.threshold = threshold
         self.x = None
         self.y = None
 
         self.detect_iris(eye_frame)
 
+    @property
+    def iris_frame(self):
+        """The binarized eye frame the iris was searched in. detect_iris works
+        in scratch buffers, so it is rebuilt on access."""
+        return self.image_processing(self._eye_frame, self.threshold)
+
     @staticmethod
-    def image_processing(eye_frame, threshold):
+    def image_processing(eye_frame, threshold, dst=None):
         """Performs operations on the eye frame to isolate the iris
 
         Arguments:
             eye_frame (numpy.ndarray): Frame containing an eye and nothing else
             threshold (int): Threshold value used to binarize the eye frame
+            dst (numpy.ndarray): Array to write the result to (a new one
+                is allocated when None)
 
         Returns:
             A frame with a single element representing the iris
         """
-        kernel = np.ones((3, 3), np.uint8)
-        new_frame = cv2.bilateralFilter(eye_frame, 10, 15, 15)
-        new_frame = cv2.erode(new_frame, kernel, iterations=3)
-        new_frame = cv2.threshold(new_frame, threshold, 255, cv2.THRESH_BINARY)[1]
+        new_frame = Pupil.filter(eye_frame)
+        return cv2.threshold(new_frame, threshold, 255, cv2.THRESH_BINARY, dst=dst)[1]
+
+    @staticmethod
+    def filter(eye_frame):
+        """Smooths and erodes the eye frame, the threshold-independent part
+        of image_processing()
 
-        return new_frame
+        Arguments:
+            eye_frame (numpy.ndarray): Frame containing an eye and nothing else
+
+        Returns:
+            The filtered grayscale frame, ready to be binarized. It is a
+            per-thread scratch buffer, overwritten by the next call
+        """
+        shape = eye_frame.shape[:2]
+        smooth = cv2.bilateralFilter(eye_frame, 10, 15, 15, dst=_scratch_buffer("smooth", shape))
+        return cv2.erode(smooth, _KERNEL, dst=_scratch_buffer("eroded", shape), iterations=3)
 
     def detect_iris(self, eye_frame):
         """Detects the iris and estimates the position of the iris by
@@ -41,13 +111,21 @@ class Pupil(object):
         Arguments:
             eye_frame (numpy.ndarray): Frame containing an eye and nothing else
         """
-        self.iris_frame = self.image_processing(eye_frame, self.threshold)
+        iris_frame = self.image_processing(
+            eye_frame, self.threshold, dst=_scratch_buffer("binary", eye_frame.shape[:2])
+        )
 
-        contours, _ = cv2.findContours(self.iris_frame, cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE)[-2:]
-        contours = sorted(contours, key=cv2.contourArea)
+        # RETR_LIST finds the same contours as RETR_TREE without building the
+        # hierarchy, but may list them in another order. That order only
+        # matters when areas tie, so then fall back to the original pick.
+        contours = cv2.findContours(iris_frame, cv2.RETR_LIST, cv2.CHAIN_APPROX_NONE)[-2]
 
         try:
-            moments = cv2.moments(contours[-2])
+            iris, ambiguous = _second_largest(contours)
+            if ambiguous:
+                contours = cv2.findContours(iris_frame, cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE)[-2]
+                iris = sorted(contours, key=cv2.contourArea)[-2]
+            moments = cv2.moments(iris)
             self.x = int(moments['m10'] / moments['m00'])
             self.y = int(moments['m01'] / moments['m00'])
         except (IndexError, ZeroDivisionError):
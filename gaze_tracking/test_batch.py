@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from gaze_tracking import _fake_dlib
+from gaze_tracking.batch import RESULT_DTYPE, analyze_frames, analyze_iter
+
+
+def assert_rows_equal(a, b):
+    for name in RESULT_DTYPE.names:      # field by field: NaN == NaN there
+        np.testing.assert_array_equal(a[name], b[name], err_msg=name)
+
+
+def setUpModule():
+    _fake_dlib.install()
+
+
+def tearDownModule():
+    _fake_dlib.uninstall()
+
+
+class TestAnalyzeIter(unittest.TestCase):
+    def test_rows_do_not_depend_on_the_number_of_workers(self):
+        # The face jumps at frame 50: a tracker carried over from another
+        # chunk would start that chunk with a stale face box and calibration
+        frames = [_fake_dlib.face_frame(i, shift=0 if i < 50 else 40) for i in range(100)]
+        kwargs = dict(chunk_frames=25, detect_interval=5)
+
+        serial = analyze_iter(frames, workers=1, **kwargs)
+        parallel = analyze_iter(frames, workers=2, **kwargs)
+
+        self.assertEqual(serial.dtype, RESULT_DTYPE)
+        np.testing.assert_array_equal(serial["frame"], np.arange(100))
+        self.assertTrue(serial["located"].all())
+        assert_rows_equal(serial, parallel)
+
+        # Each chunk is what analyze_frames gives for it alone
+        assert_rows_equal(serial[50:75], analyze_frames(frames[50:75], first_index=50, detect_interval=5))
+
+
+if __name__ == '__main__':
+    unittest.main()
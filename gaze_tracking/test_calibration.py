@@ -0,0 +1,55 @@
+import unittest
+
+import cv2
+import numpy as np
+
+from gaze_tracking import _fake_dlib
+from gaze_tracking.calibration import Calibration
+from gaze_tracking.eye import Eye
+
+
+def reference_threshold(eye_frame):
+    """Calibration.find_best_threshold as it was: binarize once per threshold"""
+    trials = {}
+    for threshold in range(5, 100, 5):
+        new_frame = cv2.bilateralFilter(eye_frame, 10, 15, 15)
+        new_frame = cv2.erode(new_frame, np.ones((3, 3), np.uint8), iterations=3)
+        iris_frame = cv2.threshold(new_frame, threshold, 255, cv2.THRESH_BINARY)[1]
+        trials[threshold] = Calibration.iris_size(iris_frame)
+    return min(trials.items(), key=(lambda p: abs(p[1] - 0.48)))[0]
+
+
+def eye_crops(count):
+    """Isolated eye frames of the synthetic clip, both eyes per frame"""
+    crops = []
+    for i in range(count):
+        gray = cv2.cvtColor(_fake_dlib.face_frame(i), cv2.COLOR_BGR2GRAY)
+        landmarks = _fake_dlib.landmarks(gray)
+        for side, points in enumerate((Eye.LEFT_EYE_POINTS, Eye.RIGHT_EYE_POINTS)):
+            eye = Eye.__new__(Eye)
+            eye._isolate(gray, landmarks, points)
+            crops.append(eye.frame)
+    return crops
+
+
+class TestCalibration(unittest.TestCase):
+    def test_threshold_matches_one_binarization_per_candidate(self):
+        rng = np.random.default_rng(0)
+        noise = [rng.integers(0, 256, (int(rng.integers(15, 40)), int(rng.integers(30, 80))), dtype=np.uint8)
+                 for _ in range(20)]
+        for crop in eye_crops(30) + noise:
+            self.assertEqual(Calibration.find_best_threshold(crop), reference_threshold(crop))
+
+    def test_calibration_completes_with_the_reference_thresholds(self):
+        calibration = Calibration()
+        crops = eye_crops(calibration.nb_frames)
+        for i, crop in enumerate(crops):
+            calibration.evaluate(crop, i % 2)
+        self.assertTrue(calibration.is_complete())
+        expected = [reference_threshold(crop) for crop in crops[0::2]]
+        self.assertEqual(calibration.thresholds_left, expected)
+        self.assertEqual(calibration.threshold(0), int(sum(expected) / len(expected)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import cv2
+import numpy as np
+
+from gaze_tracking import _fake_dlib
+from gaze_tracking.eye import Eye
+
+
+def reference_isolate(frame, landmarks, points):
+    """Eye._isolate as it was: mask the whole frame, then crop"""
+    region = np.array([(landmarks.part(p).x, landmarks.part(p).y) for p in points]).astype(np.int32)
+    height, width = frame.shape[:2]
+    black_frame = np.zeros((height, width), np.uint8)
+    mask = np.full((height, width), 255, np.uint8)
+    cv2.fillPoly(mask, [region], (0, 0, 0))
+    eye = cv2.bitwise_not(black_frame, frame.copy(), mask=mask)
+
+    margin = 5
+    min_x, max_x = np.min(region[:, 0]) - margin, np.max(region[:, 0]) + margin
+    min_y, max_y = np.min(region[:, 1]) - margin, np.max(region[:, 1]) + margin
+    return eye[min_y:max_y, min_x:max_x], (min_x, min_y)
+
+
+def isolate(frame, landmarks, points):
+    eye = Eye.__new__(Eye)
+    eye._isolate(frame, landmarks, points)
+    return eye
+
+
+class TestEyeIsolation(unittest.TestCase):
+    def check(self, frame, landmarks):
+        for points in (Eye.LEFT_EYE_POINTS, Eye.RIGHT_EYE_POINTS):
+            expected, origin = reference_isolate(frame, landmarks, points)
+            eye = isolate(frame, landmarks, points)
+            np.testing.assert_array_equal(eye.frame, expected)
+            self.assertEqual(eye.origin, origin)
+            self.assertEqual(eye.center, (expected.shape[1] / 2, expected.shape[0] / 2))
+
+    def test_isolated_eye_matches_the_whole_frame_mask(self):
+        for i in range(10):
+            gray = cv2.cvtColor(_fake_dlib.face_frame(i), cv2.COLOR_BGR2GRAY)
+            self.check(gray, _fake_dlib.landmarks(gray))
+
+    def test_eye_cut_by_the_frame_edge(self):
+        # The right eye crosses the right edge of the frame: its crop is clipped
+        gray = cv2.cvtColor(_fake_dlib.face_frame(0, shift=120), cv2.COLOR_BGR2GRAY)
+        landmarks = _fake_dlib.landmarks(cv2.cvtColor(_fake_dlib.face_frame(0), cv2.COLOR_BGR2GRAY))
+        shifted = _fake_dlib.full_object_detection(
+            [(p.x + 120, p.y) for p in landmarks.parts()], landmarks.rect)
+        self.assertGreater(shifted.part(45).x + 5, gray.shape[1])
+        self.check(gray, shifted)
+
+    def test_reused_mask_is_reset_between_eyes(self):
+        # A large eye first grows the scratch mask, a smaller one reuses it
+        big = cv2.cvtColor(_fake_dlib.face_frame(3), cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(big, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+        self.check(big, _fake_dlib.landmarks(big))
+        self.check(small, _fake_dlib.landmarks(small))
+        self.check(big, _fake_dlib.landmarks(big))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+
+import numpy as np
+
+from gaze_tracking import _fake_dlib
+
+
+def setUpModule():
+    _fake_dlib.install()
+
+
+def tearDownModule():
+    _fake_dlib.uninstall()
+
+
+def clip(count, jump_at=None, shift=40):
+    return [_fake_dlib.face_frame(i, shift=shift if jump_at is not None and i >= jump_at else 0)
+            for i in range(count)]
+
+
+def run(frames, **kwargs):
+    from gaze_tracking import GazeTracking
+    gaze = GazeTracking(**kwargs)
+    detections = []
+    detector = gaze._face_detector
+    gaze._face_detector = lambda frame: detections.append(len(results)) or detector(frame)
+    results = []
+    for frame in frames:
+        gaze.refresh(frame)
+        results.append(gaze.result)
+    return results, detections
+
+
+class TestFaceTracking(unittest.TestCase):
+    def test_tracked_box_gives_the_detector_results(self):
+        frames = clip(40)
+        detected, detections = run(frames)
+        tracked, tracked_detections = run(frames, detect_interval=5)
+
+        self.assertTrue(all(r.located for r in detected))
+        self.assertEqual(tracked, detected)
+        self.assertEqual(len(detections), 40)
+        self.assertEqual(tracked_detections, [0, 5, 10, 15, 20, 25, 30, 35])
+
+    def test_face_that_moves_is_detected_again(self):
+        frames = clip(40, jump_at=25)
+        detected, _ = run(frames)
+        tracked, detections = run(frames, detect_interval=10)
+
+        self.assertEqual(tracked[:25], detected[:25])
+        # The landmarks drift off the stale box on the jump frame, so the
+        # next frame goes to the detector instead of waiting for frame 30
+        self.assertEqual(detections, [0, 10, 20, 26, 36])
+        self.assertEqual(tracked[26:], detected[26:])
+
+
+class TestParallelEyes(unittest.TestCase):
+    def test_threaded_right_eye_gives_the_serial_results(self):
+        # Covers the calibration frames, where both eyes feed the thresholds
+        frames = clip(40, jump_at=30)
+        for kwargs in ({}, {"detect_interval": 5}):
+            serial, _ = run(frames, **kwargs)
+            threaded, _ = run(frames, parallel_eyes=True, **kwargs)
+            self.assertEqual(threaded, serial)
+
+    def test_threaded_calibration_takes_the_same_thresholds(self):
+        from gaze_tracking import GazeTracking
+        serial, threaded = GazeTracking(), GazeTracking(parallel_eyes=True)
+        for frame in clip(25):
+            serial.refresh(frame)
+            threaded.refresh(frame)
+        self.assertEqual(threaded.calibration.thresholds_left, serial.calibration.thresholds_left)
+        self.assertEqual(threaded.calibration.thresholds_right, serial.calibration.thresholds_right)
+        self.assertEqual(len(serial.calibration.thresholds_left), serial.calibration.nb_frames)
+
+
+def reference_result(gaze):
+    """The GazeTracking accessors as they were, computed from the eyes"""
+    left, right = gaze.eye_left, gaze.eye_right
+    horizontal = (left.pupil.x / (left.center[0] * 2 - 10) + right.pupil.x / (right.center[0] * 2 - 10)) / 2
+    vertical = (left.pupil.y / (left.center[1] * 2 - 10) + right.pupil.y / (right.center[1] * 2 - 10)) / 2
+    return {
+        "pupil_left_coords": (left.origin[0] + left.pupil.x, left.origin[1] + left.pupil.y),
+        "pupil_right_coords": (right.origin[0] + right.pupil.x, right.origin[1] + right.pupil.y),
+        "horizontal_ratio": horizontal,
+        "vertical_ratio": vertical,
+        "is_right": horizontal <= 0.35,
+        "is_left": horizontal >= 0.65,
+        "is_center": horizontal > 0.35 and horizontal < 0.65,
+        "is_blinking": (left.blinking + right.blinking) / 2 > 3.8,
+        "is_left_blinking": left.blinking > 6 and right.blinking <= 6,
+        "is_right_blinking": right.blinking > 6 and left.blinking <= 6,
+    }
+
+
+class TestGazeResult(unittest.TestCase):
+    def test_accessors_match_the_original_formulas(self):
+        from gaze_tracking import GazeTracking
+        gaze = GazeTracking()
+        for frame in clip(30):
+            gaze.refresh(frame)
+            self.assertTrue(gaze.pupils_located)
+            for name, expected in reference_result(gaze).items():
+                self.assertEqual(getattr(gaze, name)(), expected, name)
+
+    def test_no_face_gives_none_everywhere(self):
+        from gaze_tracking import GazeTracking
+        gaze = GazeTracking()
+        gaze.refresh(np.zeros((240, 320, 3), np.uint8))
+        self.assertFalse(gaze.pupils_located)
+        for name in ("pupil_left_coords", "horizontal_ratio", "vertical_ratio", "is_center", "is_blinking"):
+            self.assertIsNone(getattr(gaze, name)(), name)
+        self.assertEqual(gaze.annotated_frame().shape, gaze.frame.shape)
+
+
+if __name__ == '__main__':
+    unittest.main()
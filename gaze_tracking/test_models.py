@@ -0,0 +1,58 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from gaze_tracking import _fake_dlib
+
+
+def setUpModule():
+    _fake_dlib.install()
+
+
+def tearDownModule():
+    _fake_dlib.uninstall()
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        from gaze_tracking import models
+        self.models = models
+        models.clear()
+
+    def test_models_are_loaded_once_and_shared(self):
+        from gaze_tracking import GazeTracking
+        first, second = GazeTracking(), GazeTracking()
+        self.assertIs(first._face_detector, second._face_detector)
+        self.assertIs(first._predictor, second._predictor)
+        self.assertIsNot(self.models.shape_predictor("other.dat"), first._predictor)
+
+    def test_concurrent_loads_build_the_model_once(self):
+        loads = []
+
+        def slow_predictor(path):
+            loads.append(path)
+            time.sleep(0.05)
+            return _fake_dlib.shape_predictor(path)
+
+        with mock.patch.object(self.models.dlib, "shape_predictor", slow_predictor):
+            got = []
+            threads = [threading.Thread(target=lambda: got.append(self.models.shape_predictor()))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(loads), 1)
+        self.assertTrue(all(p is got[0] for p in got))
+
+    def test_preload_in_the_background(self):
+        self.assertFalse(self.models.is_loaded())
+        thread = self.models.preload(background=True)
+        thread.join(timeout=2.0)
+        self.assertTrue(self.models.is_loaded())
+        self.assertIsNone(self.models.preload(background=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import cv2
+import numpy as np
+
+from gaze_tracking import _fake_dlib
+from gaze_tracking.eye import Eye
+from gaze_tracking.pupil import Pupil, _second_largest
+
+THRESHOLDS = (10, 25, 40, 55, 70, 85)
+
+
+def reference_binarized(eye_frame, threshold):
+    new_frame = cv2.bilateralFilter(eye_frame, 10, 15, 15)
+    new_frame = cv2.erode(new_frame, np.ones((3, 3), np.uint8), iterations=3)
+    return cv2.threshold(new_frame, threshold, 255, cv2.THRESH_BINARY)[1]
+
+
+def reference_centroid(eye_frame, threshold):
+    """Pupil.detect_iris as it was: RETR_TREE and a full sort"""
+    contours, _ = cv2.findContours(reference_binarized(eye_frame, threshold), cv2.RETR_TREE,
+                                   cv2.CHAIN_APPROX_NONE)[-2:]
+    contours = sorted(contours, key=cv2.contourArea)
+    try:
+        moments = cv2.moments(contours[-2])
+        return int(moments['m10'] / moments['m00']), int(moments['m01'] / moments['m00'])
+    except (IndexError, ZeroDivisionError):
+        return None, None
+
+
+def eye_crops():
+    crops = []
+    for i in range(15):
+        gray = cv2.cvtColor(_fake_dlib.face_frame(i), cv2.COLOR_BGR2GRAY)
+        landmarks = _fake_dlib.landmarks(gray)
+        for points in (Eye.LEFT_EYE_POINTS, Eye.RIGHT_EYE_POINTS):
+            eye = Eye.__new__(Eye)
+            eye._isolate(gray, landmarks, points)
+            crops.append(eye.frame)
+    rng = np.random.default_rng(1)
+    for _ in range(15):     # blobs of equal size: ties between contour areas
+        crop = np.full((30, 60), 200, np.uint8)
+        for _ in range(int(rng.integers(1, 5))):
+            x, y = int(rng.integers(8, 52)), int(rng.integers(8, 22))
+            cv2.rectangle(crop, (x - 4, y - 4), (x + 4, y + 4), 20, -1)
+        crops.append(crop)
+    return crops
+
+
+class TestPupil(unittest.TestCase):
+    def test_centroids_match_the_original_code(self):
+        for crop in eye_crops():
+            for threshold in THRESHOLDS:
+                pupil = Pupil(crop, threshold)
+                self.assertEqual((pupil.x, pupil.y), reference_centroid(crop, threshold))
+
+    def test_iris_frame_is_the_binarized_eye(self):
+        crops = eye_crops()
+        pupil = Pupil(crops[0], 40)
+        Pupil(crops[1], 70)     # reuses the scratch buffers
+        np.testing.assert_array_equal(pupil.iris_frame, reference_binarized(crops[0], 40))
+
+    def test_second_largest_follows_the_stable_sort(self):
+        squares = [np.array([[0, 0], [0, s], [s, s], [s, 0]], np.int32).reshape(-1, 1, 2) for s in (4, 9, 9, 2)]
+        contour, ambiguous = _second_largest(squares)
+        self.assertIs(contour, sorted(squares, key=cv2.contourArea)[-2])
+        self.assertTrue(ambiguous)
+
+        contour, ambiguous = _second_largest(squares[:2] + squares[3:])
+        self.assertIs(contour, squares[0])
+        self.assertFalse(ambiguous)
+        with self.assertRaises(IndexError):
+            _second_largest(squares[:1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,12 @@
 import os
+import sys
+import signal
+import argparse
 import tkinter
 import cv2
-import mediapipe as mp
 import pyautogui
 import time
-import math
 import threading
-from collections import deque
 import customtkinter as ctk
 from PIL import Image
 import tkinter.filedialog as fd
@@ -14,24 +14,66 @@ from pynput import keyboard
 from pynput.mouse import Button, Controller
 from backend.services import settings
 from backend.services.gaze_click import GazeClickService
+from backend.services.frame_source import LatestFrameSource, next_frame
+from backend.services.frame_governor import FrameRateGovernor
+from backend.services.vision_process import InferenceProcess
+from backend.services.gaze_stream import GazeStreamServer, default_socket_path
+from backend.services import input_injection
+from backend.services.actuation import ActuationWorker
+from backend.services import latency
+from backend.services import landmark_backends
+from backend.services.preprocess import FaceROI
+from backend.services.cursor_mapping import gaze_to_screen
+from backend.services import head_pose
+from backend.services.session_recording import SessionRecorder, default_recording_path
 from backend.services.pedal import PedalHandler
-from backend.services.mouth_click import MouthClicker
-from backend.services.eyebrow_scroll import EyebrowScroller
-from backend.services.lip_scroll import LipScrollController
-from backend.services.lip_eyebrow_scroll import LipEyebrowScrollController
+from backend.services import gesture_pipeline
+from backend.services.gesture_pipeline import GesturePipeline
 
 import global_var
 import utilities
 
 # ------------------- GLOBALS -------------------
 pyautogui.FAILSAFE = False
-screen_width, screen_height = pyautogui.size()
 isSettingsOpen = False
 settings_file = "./backend/services/settings.json"
 
+# python main.py --headless: tracking without the control bar, with landmarks,
+# gaze and gesture events streamed to local apps (backend/services/gaze_stream.py)
+parser = argparse.ArgumentParser(description="EyeOS")
+parser.add_argument("--headless", action="store_true", help="run tracking without the control bar")
+parser.add_argument("--socket", help="Unix-domain socket for the gaze stream")
+parser.add_argument("--no-input", action="store_true", help="stream only, never move the cursor or click")
+args = parser.parse_args()
+
+# Cursor/click injection (no pyautogui PAUSE on the hot path)
+injector = input_injection.create_backend(
+    settings.read_settings("input_backend", settings_file, default="auto") or "auto"
+)
+if args.no_input:
+    injector = input_injection.NullBackend(injector.size())
+input_injection.set_backend(injector)
+screen_width, screen_height = injector.size()
+
+# Per-stage latency histograms (no-op unless "latency_stats" is enabled)
+if settings.read_settings("latency_stats", settings_file, default=False):
+    latency.set_monitor(latency.LatencyMonitor())
+    latency.get_monitor().start_dumping(
+        settings.read_settings("latency_dump_path", settings_file, default="latency_stats.json")
+        or "latency_stats.json"
+    )
+lat = latency.get_monitor()
+
+# All clicks/scrolls/moves are queued to the actuation thread so face tracking
+# never waits on OS input injection (or on a double-click interval)
+actuator = ActuationWorker(injector, latency=lat)
+actuator.start()
+
 mouse = Controller()
 
 cap = None
+gaze = None
+tracker = None
 tracking_active = threading.Event()
 stop_event = threading.Event()
 
@@ -42,95 +84,53 @@ press_time = 0
 dragging = False
 hold_timer = None
 
-# ------------------- MEDIAPIPE -------------------
-mp_face_mesh = mp.solutions.face_mesh  # pyright: ignore
-face_mesh = mp_face_mesh.FaceMesh(refine_landmarks=True, max_num_faces=1)
+# ------------------- LANDMARKS -------------------
+# "mediapipe", "dlib", or "auto" to benchmark the installed engines on the
+# first camera frames and keep the fastest. dlib drives the cursor only, so
+# "auto" only considers it when every gesture is off.
+LANDMARK_BACKEND = settings.read_settings("landmark_backend", settings_file, default="mediapipe") or "mediapipe"
+landmarks_engine = None
+
+# mediapipe engine: run FaceMesh on a crop around the previous face instead of
+# the whole frame; face_roi_max_size > 0 also downscales large crops
+FACE_ROI = settings.read_settings("face_roi", settings_file, default=False)
+FACE_ROI_MAX_SIZE = settings.read_settings("face_roi_max_size", settings_file, default=0) or None
+
+# Capture + landmark inference in a worker process (shared-memory frames and
+# landmarks), so UI redraws and the other GUI threads cannot delay tracking
+INFERENCE_PROCESS = settings.read_settings("inference_process", settings_file, default=False)
 
-# Eye indices
-LEFT_EYE = [33, 160, 158, 133, 153, 144]
-RIGHT_EYE = [362, 385, 387, 263, 373, 380]
+# Drop to a low probe rate while no face is seen or the user sits still, back
+# to full rate on the first frame that changes (battery life on laptops)
+ADAPTIVE_FRAME_RATE = settings.read_settings("adaptive_frame_rate", settings_file, default=False)
 
 # ------------------- SETTINGS -------------------
 EAR_THRESHOLD_LEFT = settings.read_settings("ear_left", settings_file, default=0.22)
 EAR_THRESHOLD_RIGHT = settings.read_settings("ear_right", settings_file, default=0.22)
 MOVEMENT_GAIN = settings.read_settings("movement_gain", settings_file, default=1.0)
 
-blink_mode = settings.read_settings("blink_mode", settings_file, default=0)
-scroll_mode = settings.read_settings("scroll_mode", settings_file, default=0)
-
-MIN_CONSEC_FRAMES = 2
-CLICK_COOLDOWN = 0.5
-
-# Mouth click settings (tune these)
-MOUTH_ARM_RATIO = 0.25
-MOUTH_CLOSE_RATIO = 0.015
-MOUTH_COOLDOWN = 0.35
-MOUTH_DOUBLE_WINDOW = 1.8
-MOUTH_RIGHT_HOLD = 0.7
-
-# Blink counters
-left_counter = 0
-right_counter = 0
-last_left_click = 0
-last_right_click = 0
-
-# EAR smoothing
-ear_queue_left = deque(maxlen=5)
-ear_queue_right = deque(maxlen=5)
-
-# Mouth clicker state machine (per-frame)
-mouth_clicker = MouthClicker(
-    arm_mouth_open_ratio=MOUTH_ARM_RATIO,
-    close_ratio=MOUTH_CLOSE_RATIO,
-    cooldown_sec=MOUTH_COOLDOWN,
-    double_click_window=MOUTH_DOUBLE_WINDOW,
-    right_click_hold_sec=MOUTH_RIGHT_HOLD,
-    show_debug=False,
-)
-# Eyebrow scroller state machine (per-frame)
-eyebrow_scroller = EyebrowScroller(
-    up_threshold=0.03,
-    down_threshold=0.012,
-    scroll_amount=90,
-    repeat_interval=0.14,
-    smooth_window=9,
-    baseline_alpha=0.005,
-    show_debug=False
-)
-# Lip scroll controller state machine (per-frame)
-lip_scroll = LipScrollController(
-    pucker_threshold=0.62,
-    lips_closed_ratio=0.020,
-    toggle_hold_sec=0.55,
-    scroll_amount=90,
-    repeat_interval=0.10,
-    gaze_up_thresh=0.45,
-    gaze_down_thresh=0.55,
-    gaze_deadband=(0.47, 0.52),
-    show_debug=False
-)
-# Lip + Eyebrow combined scroll controller (per-frame)
-lip_brow_scroll = LipEyebrowScrollController(
-    pucker_threshold=0.62,
-    lips_closed_ratio=0.020,
-    toggle_hold_sec=0.55,
-
-    brow_down_threshold=0.002,   # easier
-    brow_hold_frames=1,          # easier
+RECORD_SESSIONS = settings.read_settings("record_sessions", settings_file, default=False)
 
-    scroll_amount=90,
-    repeat_interval=0.12,
+# Per-frame landmarks, gaze and gesture events for other local apps (always on headless)
+gaze_stream = None
+if args.headless or settings.read_settings("gaze_stream", settings_file, default=False):
+    gaze_stream = GazeStreamServer(
+        args.socket or settings.read_settings("gaze_stream_socket", settings_file, default="") or default_socket_path(),
+        screen=(screen_width, screen_height),
+    )
+    gaze_stream.start()
 
-    smooth_window=5,
-    baseline_alpha=0.003,
-    baseline_update_band=0.001,
+blink_mode = settings.read_settings("blink_mode", settings_file, default=0)
+scroll_mode = settings.read_settings("scroll_mode", settings_file, default=0)
 
-    show_debug=False,
+# Every gesture controller (mouth, eyebrow, lip, lip+eyebrow, blink), per-frame
+gestures = GesturePipeline(
+    injector=actuator,
+    ear_threshold_left=EAR_THRESHOLD_LEFT,
+    ear_threshold_right=EAR_THRESHOLD_RIGHT,
 )
 
 
-
-
 # ------------------- PEDAL CALLBACKS -------------------
 listener = None
 
@@ -196,139 +196,179 @@ def on_key_release(key):
         mouse.click(Button.left, 2)
         print("Pedal → DOUBLE CLICK")
 
-# ------------------- HELPERS -------------------
-def euclidean(p1, p2):
-    return math.hypot(p1.x - p2.x, p1.y - p2.y)
+# ------------------- TRACKING LOOP -------------------
+def enabled_gestures():
+    enabled = set()
+    if global_var.mouth_click_enabled:
+        enabled.add(gesture_pipeline.MOUTH)
+    if global_var.eyebrow_scroll_enabled:
+        enabled.add(gesture_pipeline.EYEBROW)
+    if global_var.lip_scroll_enabled:
+        enabled.add(gesture_pipeline.LIP)
+    if global_var.lip_brow_scroll_enabled:
+        enabled.add(gesture_pipeline.LIP_BROW)
+    if global_var.blink_enabled:
+        enabled.add(gesture_pipeline.BLINK)
+    return enabled
+
+def needs_full_rate():
+    # Blinks and mouth clicks last a few frames: the adaptive frame rate must
+    # not drop to its still rate while they are on
+    return bool(enabled_gestures() & {gesture_pipeline.BLINK, gesture_pipeline.MOUTH})
+
+def sample_frames(source, count=30):
+    """First frames of the camera, to time the landmark engines on."""
+    frames = []
+    for _ in range(count * 2):
+        ret, frame = source.read()
+        if ret:
+            frames.append(frame)
+        if len(frames) >= count:
+            break
+    return frames
 
+def warn_without_gestures(engine_name):
+    if landmark_backends.backend_scheme(engine_name) != landmark_backends.SCHEME_MEDIAPIPE_478:
+        print(f"[LANDMARKS] {engine_name} has no FaceMesh layout: mouth, blink, eyebrow "
+              "and lip gestures are unavailable, only the cursor follows the eyes")
 
-def get_ear(landmarks, indices):
-    p1, p2, p3, p4, p5, p6 = [landmarks[i] for i in indices]
-    vertical1 = euclidean(p2, p6)
-    vertical2 = euclidean(p3, p5)
-    horizontal = euclidean(p1, p4)
-    return (vertical1 + vertical2) / (2.0 * horizontal)
+def tracking_loop():
+    global cap, landmarks_engine
 
+    # The gestures need the FaceMesh layout, "auto" must not trade them for speed
+    facemesh_only = bool(enabled_gestures())
 
-# ------------------- TRACKING LOOP -------------------
-def tracking_loop():
-    global left_counter, right_counter
-    global last_left_click, last_right_click
-    global cap
+    if INFERENCE_PROCESS:
+        cap = InferenceProcess(
+            utilities.get_camera_input(), backend=LANDMARK_BACKEND, adaptive_rate=ADAPTIVE_FRAME_RATE,
+            face_roi=FACE_ROI, roi_max_size=FACE_ROI_MAX_SIZE, facemesh_only=facemesh_only,
+        )
+        print(f"[LANDMARKS] using {cap.engine_name} in a worker process")
+        warn_without_gestures(cap.engine_name)
+    else:
+        schemes = (landmark_backends.SCHEME_MEDIAPIPE_478,) if facemesh_only else None
+        if landmarks_engine is None:
+            landmark_backends.preload_backends(LANDMARK_BACKEND, schemes)
+        cap = LatestFrameSource(utilities.get_camera_input())
+
+    if landmarks_engine is None and not INFERENCE_PROCESS:
+        samples = sample_frames(cap) if LANDMARK_BACKEND == "auto" else None
+        # Selfie view: the engine mirrors the landmarks, frames are never flipped
+        roi = FaceROI(max_size=FACE_ROI_MAX_SIZE) if FACE_ROI else None
+        landmarks_engine = landmark_backends.create_backend(
+            LANDMARK_BACKEND, samples, schemes, mirror=True, roi=roi
+        )
+        print(f"[LANDMARKS] using {landmarks_engine.name}")
+        warn_without_gestures(landmarks_engine.name)
+
+    # In the worker process when INFERENCE_PROCESS is on
+    governor = FrameRateGovernor() if ADAPTIVE_FRAME_RATE and not INFERENCE_PROCESS else None
 
-    cap = cv2.VideoCapture(utilities.get_camera_input())
+    # Optional landmark/action recording for offline tuning
+    recorder = SessionRecorder(default_recording_path()) if RECORD_SESSIONS else None
 
     while not stop_event.is_set():
 
-        if global_var.gaze_hold_enabled:
-            gaze.set_tracking(True)
-        else:
-            gaze.set_tracking(False)
+        if gaze is not None:
+            gaze.set_tracking(global_var.gaze_hold_enabled)
 
         if global_var.camera_input_changed:
             global_var.camera_input_changed = False
-            if cap:
-                cap.release()
-            cap = cv2.VideoCapture(utilities.get_camera_input())
-
-        if cap is None or not cap.isOpened():
-            continue
+            if INFERENCE_PROCESS:
+                cap.set_source(utilities.get_camera_input())
+            else:
+                if cap:
+                    cap.release()
+                cap = LatestFrameSource(utilities.get_camera_input())
 
         if not tracking_active.is_set():
             # prevent a "resume click" if you paused while mouth was open
-            mouth_clicker.reset()
-            eyebrow_scroller.reset()
-            lip_scroll.reset()
-            lip_brow_scroll.reset()
+            gestures.reset()
+            head_pose.get_estimator().reset()
             time.sleep(0.05)
             continue
 
-        ret, frame = cap.read()
-        if not ret:
+        if INFERENCE_PROCESS:
+            if ADAPTIVE_FRAME_RATE:
+                cap.set_keep_active(needs_full_rate())
+        elif governor:
+            governor.keep_active = needs_full_rate()
+
+        # Always the newest frame; anything older was dropped by the capture thread
+        try:
+            if INFERENCE_PROCESS:
+                ret, landmarks = next_frame(cap)    # already through the engine in the worker
+            else:
+                ret, frame = next_frame(cap)
+        except EOFError:
             break
+        if not ret:
+            continue
+        captured_at = cap.frame_time
+        if governor and not governor.should_process(frame, captured_at):
+            continue
+        lat.frame_start()
+        lat.record_since(latency.CAPTURE_AGE, captured_at)
 
-        frame = cv2.flip(frame, 1)
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = face_mesh.process(rgb)
-
-        if results.multi_face_landmarks:
-            landmarks = results.multi_face_landmarks[0].landmark
-
-            # Cursor movement
-            left_center = landmarks[473]
-            right_center = landmarks[468]
-            eye_x = (left_center.x + right_center.x) / 2
-            eye_y = (left_center.y + right_center.y) / 2
-
-            x_range = (0.375, 0.625)
-            y_range = (0.375, 0.625)
-            eye_x = max(min(eye_x, x_range[1]), x_range[0])
-            eye_y = max(min(eye_y, y_range[1]), y_range[0])
-            norm_x = (eye_x - x_range[0]) / (x_range[1] - x_range[0])
-            norm_y = (eye_y - y_range[0]) / (y_range[1] - y_range[0])
-
-            gain = max(0.1, min(2.0, MOVEMENT_GAIN))
-            target_x = int(norm_x * screen_width * gain)
-            target_y = int(norm_y * screen_height * gain)
-
-            pyautogui.moveTo(target_x, target_y)
-
-            now = time.time()
-
-            # ---- Mouth clicks ----
-            if global_var.mouth_click_enabled:
-                mouth_action = mouth_clicker.update(landmarks, now)
-                if mouth_action:
-                    print(f"Mouth → {mouth_action}")
-
-            # ---- Eyebrow scroll ----
-            if global_var.eyebrow_scroll_enabled:
-                scroll_action = eyebrow_scroller.update(landmarks, now)
-                if scroll_action:
-                    print(f"Eyebrow → {scroll_action}")
-
-            # ---- Lip scroll ----
-            if global_var.lip_scroll_enabled:
-                lip_action = lip_scroll.update(landmarks, now)
-                if lip_action:
-                    print(f"LipScroll → {lip_action}")
-
-            # ---- Lip + Eyebrow scroll ----
-            if global_var.lip_brow_scroll_enabled:
-                sb_action = lip_brow_scroll.update(landmarks, now)
-                if sb_action:
-                    print(f"LipBrowScroll → {sb_action}")
-
-            # EAR blink detection
-            if global_var.blink_enabled:
-                ear_left = get_ear(landmarks, LEFT_EYE)
-                ear_right = get_ear(landmarks, RIGHT_EYE)
-                ear_queue_left.append(ear_left)
-                ear_queue_right.append(ear_right)
-                avg_ear_left = sum(ear_queue_left) / len(ear_queue_left)
-                avg_ear_right = sum(ear_queue_right) / len(ear_queue_right)
-
-                # Left blink
-                if avg_ear_left < EAR_THRESHOLD_LEFT:
-                    left_counter += 1
-                else:
-                    if left_counter >= MIN_CONSEC_FRAMES and now - last_left_click > CLICK_COOLDOWN:
-                        pyautogui.click(button="left")
-                        print("Left blink → LEFT CLICK")
-                        last_left_click = now
-                    left_counter = 0
-
-                # Right blink
-                if avg_ear_right < EAR_THRESHOLD_RIGHT:
-                    right_counter += 1
-                else:
-                    if right_counter >= MIN_CONSEC_FRAMES and now - last_right_click > CLICK_COOLDOWN:
-                        pyautogui.click(button="right")
-                        print("Right blink → RIGHT CLICK")
-                        last_right_click = now
-                    right_counter = 0
+        if INFERENCE_PROCESS:
+            lat.record(latency.FACE_MESH, cap.inference_ms)
+        else:
+            t0 = time.perf_counter()
+            landmarks = landmarks_engine.process(frame)
+            lat.lap(latency.FACE_MESH)
+            if governor:
+                governor.update(landmarks, captured_at, (time.perf_counter() - t0) * 1000.0)
+
+        screen_point = None
+        if landmarks is not None:
+            now = landmarks.timestamp
+            # FaceMesh layout only (None with the dlib engine)
+            face = landmarks.landmark_frame()
+            enabled = enabled_gestures()
+            if face is not None:
+                if enabled:
+                    # Paid here, in the LANDMARKS lap, then shared by every controller
+                    face.compute_features()
+                if recorder:
+                    recorder.add_frame(face.points, now)
+            gaze_point = landmarks.gaze
+            lat.lap(latency.LANDMARKS)
+
+            # Cursor movement (iris midpoint)
+            if gaze_point is not None:
+                target_x, target_y = gaze_to_screen(
+                    gaze_point[0], gaze_point[1], screen_width, screen_height, MOVEMENT_GAIN
+                )
+                screen_point = (target_x, target_y)
+                actuator.move_to_from(target_x, target_y, captured_at)
+            lat.lap(latency.CURSOR)
+
+            if gaze_stream:
+                gaze_stream.publish_frame(captured_at, landmarks, screen_point)
+
+            # ---- Mouth clicks, scrolls and EAR blinks ----
+            if face is not None:
+                for source, action in gestures.update(face, now, enabled):
+                    if recorder:
+                        recorder.add_action(source, action, now)
+                    if gaze_stream:
+                        gaze_stream.publish_event(source, action, now)
+                    print(f"{gesture_pipeline.LABELS[source]} → {action}")
+            lat.lap(latency.CONTROLLERS)
+        elif gaze_stream:
+            gaze_stream.publish_frame(captured_at)
+
+        lat.frame_end()
 
     if cap:
         cap.release()
+    if landmarks_engine:
+        landmarks_engine.close()
+        landmarks_engine = None
+    if recorder:
+        recorder.close()
+    if governor:
+        print(governor.summary())
     cv2.destroyAllWindows()
 
 # ------------------- UI -------------------
@@ -340,9 +380,23 @@ def start_pause():
         tracking_active.set()
         toggle_btn.configure(text="Pause", image=pause_icon)
 
-def quit_app():
+def start_tracking():
+    global tracker
+    tracker = threading.Thread(target=tracking_loop, daemon=True)
+    tracker.start()
+
+def shutdown():
     stop_event.set()
     tracking_active.set()
+    if tracker:
+        tracker.join(timeout=5.0)   # lets tracking_loop release the camera and close the recording
+    actuator.stop()
+    lat.stop_dumping()
+    if gaze_stream:
+        gaze_stream.stop()
+
+def quit_app():
+    shutdown()
     root.destroy()
 
 def change_blink():
@@ -481,6 +535,7 @@ def open_settings():
     def update_left(v):
         global EAR_THRESHOLD_LEFT
         EAR_THRESHOLD_LEFT = float(v)
+        gestures.blink_clicker.ear_threshold_left = EAR_THRESHOLD_LEFT
         settings.write_settings("ear_left", EAR_THRESHOLD_LEFT, settings_file)
         left_val_lbl.configure(text=f"{EAR_THRESHOLD_LEFT:.2f}")
 
@@ -499,6 +554,7 @@ def open_settings():
     def update_right(v):
         global EAR_THRESHOLD_RIGHT
         EAR_THRESHOLD_RIGHT = float(v)
+        gestures.blink_clicker.ear_threshold_right = EAR_THRESHOLD_RIGHT
         settings.write_settings("ear_right", EAR_THRESHOLD_RIGHT, settings_file)
         right_val_lbl.configure(text=f"{EAR_THRESHOLD_RIGHT:.2f}")
 
@@ -592,6 +648,30 @@ def open_settings():
     ctk.CTkButton(io_frame, text="Export Settings", command=export_settings).pack(side="right", expand=True, fill="x", padx=5, pady=10)
     
 
+# ------------------- HEADLESS -------------------
+def run_headless():
+    """Track until Ctrl+C or SIGTERM, without building the control bar."""
+    global gaze
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    start_keyboard_listener()
+    gaze = GazeClickService(injector=actuator)
+    gaze.start()
+
+    start_tracking()
+    tracking_active.set()
+    print(f"[STREAM] publishing on {gaze_stream.path}")
+    try:
+        while tracker.is_alive() and not stop_event.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        pass
+    shutdown()
+    gaze.stop()
+
+if args.headless:
+    run_headless()
+    sys.exit(0)
+
 # ------------------- MAIN -------------------
 appearance_mode = settings.read_settings("appearance", settings_file, default="dark")
 ctk.set_appearance_mode(appearance_mode)
@@ -661,10 +741,10 @@ quit_btn = ctk.CTkButton(bar, text="Quit", image=quit_icon, fg_color="#c9302c",
 quit_btn.pack(side="right", padx=4)
 
 # Start tracking thread
-threading.Thread(target=tracking_loop, daemon=True).start()
+start_tracking()
 root.after(100, start_keyboard_listener)
 
-gaze = GazeClickService()
+gaze = GazeClickService(injector=actuator)
 
 def start_gaze():
     gaze.start()